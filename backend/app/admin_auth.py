@@ -0,0 +1,22 @@
+# backend/app/admin_auth.py
+
+import hmac
+import os
+from typing import Optional
+
+from fastapi import Header, HTTPException
+
+# One token guards every /admin/* route and token-triggered request profiling;
+# with it unset those routes always answer 403
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+ADMIN_TOKEN_HEADER = "x-admin-token"
+
+
+def token_matches(token) -> bool:
+    return bool(ADMIN_TOKEN) and token is not None and hmac.compare_digest(token, ADMIN_TOKEN)
+
+
+def require_admin_token(x_admin_token: Optional[str] = Header(None)):
+    """Dependency for /admin/* routes."""
+    if not token_matches(x_admin_token):
+        raise HTTPException(status_code=403, detail="Invalid or missing admin token.")
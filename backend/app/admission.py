@@ -0,0 +1,154 @@
+# backend/app/admission.py
+
+import asyncio
+import os
+import re
+import time
+
+from fastapi.responses import JSONResponse
+
+ADMISSION_CONTROL = os.getenv("ADMISSION_CONTROL", "true").lower() in ("1", "true", "yes")
+# Threads kept free for the priority lane on top of the per-lane limits
+ADMISSION_RESERVED_THREADS = int(os.getenv("ADMISSION_RESERVED_THREADS", "8"))
+
+# Upper bounds (seconds) of the queue-time histogram buckets
+QUEUE_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, float("inf"))
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.getenv(name, str(default)))
+
+
+def _env_float(name: str, default: float) -> float:
+    return float(os.getenv(name, str(default)))
+
+
+class Lane:
+    """
+    A class of requests sharing one concurrency limit. Requests wait at most
+    max_wait seconds for a slot (and at most max_queue may wait at once);
+    anything beyond that is shed with a 503 instead of piling up behind get_db().
+    """
+
+    def __init__(self, name: str, limit: int, max_wait: float, max_queue: int):
+        self.name = name
+        self.limit = limit
+        self.max_wait = max_wait
+        self.max_queue = max_queue
+        self.semaphore = asyncio.Semaphore(limit)
+        self.in_flight = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.shed = 0
+        self.queue_seconds_total = 0.0
+        self.queue_buckets = [0] * len(QUEUE_BUCKETS)
+
+    def record_wait(self, waited: float):
+        self.queue_seconds_total += waited
+        for i, bound in enumerate(QUEUE_BUCKETS):
+            if waited <= bound:
+                self.queue_buckets[i] += 1
+                break
+
+    def snapshot(self) -> dict:
+        return {
+            "limit": self.limit,
+            "max_wait_seconds": self.max_wait,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "admitted": self.admitted,
+            "shed": self.shed,
+            "queue_seconds_total": round(self.queue_seconds_total, 6),
+            "queue_histogram": {
+                ("+Inf" if bound == float("inf") else f"le_{bound * 1000:g}ms"): count
+                for bound, count in zip(QUEUE_BUCKETS, self.queue_buckets)
+            },
+        }
+
+
+# Signup is CPU-heavy (bcrypt), reads are cheap. Limits are per worker process.
+lanes = {
+    "signup": Lane("signup",
+                   limit=_env_int("ADMISSION_SIGNUP_LIMIT", 8),
+                   max_wait=_env_float("ADMISSION_SIGNUP_MAX_WAIT", 1.0),
+                   max_queue=_env_int("ADMISSION_SIGNUP_MAX_QUEUE", 32)),
+    "read": Lane("read",
+                 limit=_env_int("ADMISSION_READ_LIMIT", 32),
+                 max_wait=_env_float("ADMISSION_READ_MAX_WAIT", 0.5),
+                 max_queue=_env_int("ADMISSION_READ_MAX_QUEUE", 128)),
+    "write": Lane("write",
+                  limit=_env_int("ADMISSION_WRITE_LIMIT", 16),
+                  max_wait=_env_float("ADMISSION_WRITE_MAX_WAIT", 1.0),
+                  max_queue=_env_int("ADMISSION_WRITE_MAX_QUEUE", 64)),
+}
+
+# Priority lane: never queued or shed
+PRIORITY_PATHS = ("/health", "/ready", "/metrics")
+# Single-entity verification is cheap and latency-sensitive, so it's prioritized too.
+# The bulk PATCH /users/verify and /businesses/verify (up to 10k ids) are not.
+PRIORITY_VERIFY_PATH = re.compile(r"^/(users|businesses)/\d+/verify$")
+
+
+def classify(method: str, path: str):
+    """Returns the Lane for a request, or None for the priority lane."""
+    if path.startswith(PRIORITY_PATHS) or PRIORITY_VERIFY_PATH.match(path):
+        return None
+    if method == "POST" and path in ("/users", "/businesses"):
+        return lanes["signup"]
+    if method in ("GET", "HEAD"):
+        return lanes["read"]
+    return lanes["write"]
+
+
+def required_threads() -> int:
+    """Threadpool size needed so limited lanes can never take the priority lane's threads."""
+    return sum(lane.limit for lane in lanes.values()) + ADMISSION_RESERVED_THREADS
+
+
+def stats() -> dict:
+    return {name: lane.snapshot() for name, lane in lanes.items()}
+
+
+class AdmissionControlMiddleware:
+    """ASGI middleware applying the lane limits above."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        lane = classify(scope["method"], scope["path"])
+        if lane is None:
+            return await self.app(scope, receive, send)
+
+        if lane.waiting >= lane.max_queue and lane.semaphore.locked():
+            return await self._shed(lane, scope, receive, send)
+
+        start = time.perf_counter()
+        lane.waiting += 1
+        try:
+            await asyncio.wait_for(lane.semaphore.acquire(), timeout=lane.max_wait)
+        except asyncio.TimeoutError:
+            lane.record_wait(time.perf_counter() - start)
+            return await self._shed(lane, scope, receive, send)
+        finally:
+            lane.waiting -= 1
+
+        lane.record_wait(time.perf_counter() - start)
+        lane.admitted += 1
+        lane.in_flight += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            lane.in_flight -= 1
+            lane.semaphore.release()
+
+    async def _shed(self, lane: Lane, scope, receive, send):
+        lane.shed += 1
+        response = JSONResponse(
+            status_code=503,
+            content={"detail": "Server is overloaded, please retry."},
+            headers={"Retry-After": str(max(1, round(lane.max_wait)))},
+        )
+        await response(scope, receive, send)
@@ -1,10 +1,13 @@
 # backend/app/crud.py
 
+from typing import List
+
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 from passlib.context import CryptContext
 
 from . import models, schemas
-from .kafka_producer import publish_event  # <-- New import for Phase 3
+from .kafka_producer import publish_event, publish_events  # <-- New import for Phase 3
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -67,6 +70,40 @@ def update_user_verification(db: Session, user_id: int, verified: bool):
     return user
 
 
+def bulk_update_user_verification(db: Session, user_ids: List[int], verified: bool):
+    """
+    Sets is_verified on many users with a single UPDATE ... RETURNING, then publishes
+    all resulting 'user_verified' events in one flushed batch.
+    Returns the updated rows; IDs that don't exist are simply absent.
+    """
+    if not user_ids:
+        return []
+
+    stmt = (
+        update(models.User)
+        .where(models.User.id.in_(set(user_ids)))
+        .values(is_verified=verified, version=models.User.version + 1)
+        .returning(models.User.id, models.User.email, models.User.is_verified)
+        .execution_options(synchronize_session=False)
+    )
+    users = db.execute(stmt).all()
+    db.commit()
+
+    event_name = "UserVerified" if verified else "UserUnverified"
+    events = [
+        {
+            "action": event_name,
+            "user_id": user.id,
+            "email": user.email,
+            "is_verified": user.is_verified
+        }
+        for user in users
+    ]
+    publish_events(topic="user_verified", events=events)
+
+    return users
+
+
 # --------------------
 #  Business CRUD
 # --------------------
@@ -123,3 +160,36 @@ def update_business_verification(db: Session, business_id: int, verified: bool):
         publish_event(topic="business_verified", data=event_data)
 
     return business
+
+
+def bulk_update_business_verification(db: Session, business_ids: List[int], verified: bool):
+    """
+    Sets is_verified on many businesses with a single UPDATE ... RETURNING, then publishes
+    all resulting 'business_verified' events in one flushed batch.
+    """
+    if not business_ids:
+        return []
+
+    stmt = (
+        update(models.Business)
+        .where(models.Business.id.in_(set(business_ids)))
+        .values(is_verified=verified, version=models.Business.version + 1)
+        .returning(models.Business.id, models.Business.name, models.Business.is_verified)
+        .execution_options(synchronize_session=False)
+    )
+    businesses = db.execute(stmt).all()
+    db.commit()
+
+    event_name = "BusinessVerified" if verified else "BusinessUnverified"
+    events = [
+        {
+            "action": event_name,
+            "business_id": business.id,
+            "name": business.name,
+            "is_verified": business.is_verified
+        }
+        for business in businesses
+    ]
+    publish_events(topic="business_verified", events=events)
+
+    return businesses
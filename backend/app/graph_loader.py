@@ -0,0 +1,142 @@
+# backend/app/graph_loader.py
+
+import os
+import time
+
+NEO4J_BATCH_SIZE = int(os.getenv("NEO4J_BATCH_SIZE", "5000"))
+
+# Uniqueness constraints also create the indexes that MERGE/MATCH on these keys use.
+# Without them every edge write is a label scan and seeding is quadratic.
+CONSTRAINTS = (
+    "CREATE CONSTRAINT user_id_unique IF NOT EXISTS FOR (u:User) REQUIRE u.userId IS UNIQUE",
+    "CREATE CONSTRAINT business_id_unique IF NOT EXISTS FOR (b:Business) REQUIRE b.bizId IS UNIQUE",
+    "CREATE CONSTRAINT ip_id_unique IF NOT EXISTS FOR (i:IP) REQUIRE i.ipId IS UNIQUE",
+)
+
+MERGE_USERS = """
+UNWIND $rows AS row
+MERGE (u:User {userId: row.userId})
+SET u.email = row.email, u.isVerified = row.isVerified
+"""
+
+MERGE_BUSINESSES = """
+UNWIND $rows AS row
+MERGE (b:Business {bizId: row.bizId})
+SET b.name = row.name, b.isVerified = row.isVerified
+"""
+
+MERGE_IPS = """
+UNWIND $rows AS row
+MERGE (i:IP {ipId: row.ipId})
+SET i.address = row.address
+"""
+
+MERGE_OWNS = """
+UNWIND $rows AS row
+MATCH (u:User {userId: row.ownerId})
+MATCH (b:Business {bizId: row.bizId})
+MERGE (u)-[:OWNS]->(b)
+"""
+
+MERGE_USES_IP = """
+UNWIND $rows AS row
+MATCH (u:User {userId: row.userId})
+MATCH (i:IP {ipId: row.ipId})
+MERGE (u)-[:USES_IP]->(i)
+"""
+
+MERGE_LINKED_TO = """
+UNWIND $rows AS row
+MATCH (a:User {userId: row.userId})
+MATCH (b:User {userId: row.linkedUserId})
+MERGE (a)-[:LINKED_TO]->(b)
+"""
+
+# Projection upserts for live events. Topics are consumed independently, so a
+# verification can arrive before its creation event: missing fields (null) keep
+# whatever the node already has instead of overwriting it.
+PROJECT_USERS = """
+UNWIND $rows AS row
+MERGE (u:User {userId: row.userId})
+SET u.email = coalesce(row.email, u.email),
+    u.isVerified = coalesce(row.isVerified, u.isVerified, false)
+"""
+
+PROJECT_BUSINESSES = """
+UNWIND $rows AS row
+MERGE (b:Business {bizId: row.bizId})
+SET b.name = coalesce(row.name, b.name),
+    b.isVerified = coalesce(row.isVerified, b.isVerified, false)
+"""
+
+# MERGE rather than MATCH on the owner, for the same ordering reason
+PROJECT_OWNS = """
+UNWIND $rows AS row
+MERGE (u:User {userId: row.ownerId})
+MERGE (b:Business {bizId: row.bizId})
+MERGE (u)-[:OWNS]->(b)
+"""
+
+_DELETE_BATCH = "MATCH (n) WITH n LIMIT $limit DETACH DELETE n RETURN count(*) AS deleted"
+
+
+def ensure_schema(session):
+    """Creates the uniqueness constraints (idempotent)."""
+    for statement in CONSTRAINTS:
+        session.run(statement).consume()
+
+
+def clear_graph(session, batch_size: int = NEO4J_BATCH_SIZE):
+    """Deletes all nodes in batches, so large graphs don't need one huge transaction. Dev only!"""
+    total = 0
+    while True:
+        deleted = session.execute_write(lambda tx: tx.run(_DELETE_BATCH, limit=batch_size).single()["deleted"])
+        total += deleted
+        if deleted == 0:
+            return total
+
+
+def _chunks(rows, size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def write_batches(session, query: str, rows, batch_size: int = NEO4J_BATCH_SIZE, label: str = "rows") -> int:
+    """
+    Writes `rows` (an iterable of dicts) through an UNWIND query, one explicit
+    write transaction per batch, and prints the throughput when done.
+    """
+    start = time.perf_counter()
+    written = 0
+    for batch in _chunks(rows, batch_size):
+        session.execute_write(lambda tx: tx.run(query, rows=batch).consume())
+        written += len(batch)
+    elapsed = time.perf_counter() - start
+    rate = written / elapsed if elapsed > 0 else 0.0
+    print(f"Neo4j: wrote {written} {label} in {elapsed:.2f}s ({rate:,.0f}/s)")
+    return written
+
+
+def load_graph(driver, users=(), businesses=(), ips=(), owns=(), uses_ip=(), linked_to=(),
+               batch_size: int = NEO4J_BATCH_SIZE, clear: bool = False):
+    """
+    Loads nodes first and then edges, so every edge batch MATCHes against indexed nodes.
+    Each argument is an iterable of row dicts in the shape the matching MERGE_* query expects.
+    """
+    with driver.session() as session:
+        if clear:
+            deleted = clear_graph(session, batch_size)
+            print(f"Neo4j: cleared {deleted} nodes. (Dev only)")
+        ensure_schema(session)
+        write_batches(session, MERGE_USERS, users, batch_size, "users")
+        write_batches(session, MERGE_BUSINESSES, businesses, batch_size, "businesses")
+        write_batches(session, MERGE_IPS, ips, batch_size, "ips")
+        write_batches(session, MERGE_OWNS, owns, batch_size, "OWNS edges")
+        write_batches(session, MERGE_USES_IP, uses_ip, batch_size, "USES_IP edges")
+        write_batches(session, MERGE_LINKED_TO, linked_to, batch_size, "LINKED_TO edges")
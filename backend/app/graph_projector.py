@@ -0,0 +1,267 @@
+# backend/app/graph_projector.py
+
+import argparse
+import json
+import math
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from kafka import KafkaConsumer, TopicPartition
+from kafka.errors import KafkaError
+from kafka.structs import OffsetAndMetadata
+
+from . import graph_loader
+from .database import get_driver
+from .kafka_producer import DLQ_TOPIC, get_producer, publish_event
+from .metrics import GRAPH_PROJECTION_BATCH_LATENCY, GRAPH_PROJECTION_EVENTS, render_prometheus
+from .resources import registry
+
+KAFKA_BOOTSTRAP_SERVERS = os.getenv("KAFKA_BOOTSTRAP_SERVERS", "kafka:9092")
+PROJECTOR_GROUP_ID = os.getenv("GRAPH_PROJECTOR_GROUP_ID", "verishield-graph-projector")
+PROJECTOR_TOPICS = [
+    t.strip()
+    for t in os.getenv("GRAPH_PROJECTOR_TOPICS", "user_created,business_created,user_verified,business_verified").split(",")
+    if t.strip()
+]
+# A micro-batch is flushed when it reaches BATCH_SIZE events or is MAX_WAIT_MS old, whichever comes first
+PROJECTOR_BATCH_SIZE = int(os.getenv("GRAPH_PROJECTOR_BATCH_SIZE", "500"))
+PROJECTOR_MAX_WAIT_MS = int(os.getenv("GRAPH_PROJECTOR_MAX_WAIT_MS", "1000"))
+# Lists the nodes each applied batch touched, so API workers can drop cached neighbourhoods
+GRAPH_PROJECTED_TOPIC = os.getenv("KAFKA_GRAPH_PROJECTED_TOPIC", "graph_projected")
+# Serves /metrics for this process when set (the projector has no API of its own)
+PROJECTOR_METRICS_PORT = int(os.getenv("GRAPH_PROJECTOR_METRICS_PORT", "0"))
+
+
+class ProjectionBatch:
+    """
+    Coalesces events into one row per node (and one per OWNS edge), so a burst of
+    updates to the same user becomes a single MERGE. Later events win per field;
+    fields an event doesn't carry are left as None and don't overwrite the graph.
+    """
+
+    def __init__(self):
+        self.users = {}
+        self.businesses = {}
+        self.owns = set()
+        self.events = 0
+        self.topics = {}
+        self.started = None
+
+    def __len__(self):
+        return self.events
+
+    def add(self, topic: str, event: dict):
+        """Adds one event. Raises ValueError for events the projector can't apply."""
+        action = event.get("action")
+        if action in ("UserCreated", "UserVerified", "UserUnverified"):
+            self._merge(self.users, "userId", _require_id(event, "user_id"), {
+                "email": event.get("email"),
+                "isVerified": event.get("is_verified"),
+            })
+        elif action in ("BusinessCreated", "BusinessVerified", "BusinessUnverified"):
+            biz_id = _require_id(event, "business_id")
+            owner_id = event.get("owner_id")
+            owner_id = None if owner_id is None else int(owner_id)
+            self._merge(self.businesses, "bizId", biz_id, {
+                "name": event.get("name"),
+                "isVerified": event.get("is_verified"),
+            })
+            if owner_id is not None:
+                self.owns.add((owner_id, biz_id))
+        else:
+            raise ValueError(f"unsupported action {action!r}")
+
+        if self.started is None:
+            self.started = time.monotonic()
+        self.events += 1
+        self.topics[topic] = self.topics.get(topic, 0) + 1
+
+    @staticmethod
+    def _merge(rows: dict, key: str, node_id: int, fields: dict):
+        row = rows.setdefault(node_id, {key: node_id, **{name: None for name in fields}})
+        for name, value in fields.items():
+            if value is not None:
+                row[name] = value
+
+    def age_ms(self) -> float:
+        return 0.0 if self.started is None else (time.monotonic() - self.started) * 1000
+
+    def touched(self) -> dict:
+        """Node ids changed by this batch, including both ends of new OWNS edges."""
+        return {
+            "users": sorted(set(self.users) | {owner for owner, _ in self.owns}),
+            "businesses": sorted(set(self.businesses) | {biz for _, biz in self.owns}),
+        }
+
+    def apply(self, session):
+        """Writes the batch, nodes before edges, one write transaction per statement."""
+        statements = (
+            (graph_loader.PROJECT_USERS, list(self.users.values())),
+            (graph_loader.PROJECT_BUSINESSES, list(self.businesses.values())),
+            (graph_loader.PROJECT_OWNS, [{"ownerId": o, "bizId": b} for o, b in sorted(self.owns)]),
+        )
+        for query, rows in statements:
+            if rows:
+                session.execute_write(lambda tx: tx.run(query, rows=rows).consume())
+
+
+def _require_id(event: dict, field: str) -> int:
+    value = event.get(field)
+    if value is None:
+        raise ValueError(f"missing {field}")
+    return int(value)
+
+
+def _create_consumer():
+    # Offsets are committed only after a batch is in Neo4j (at-least-once; the MERGEs are idempotent)
+    return KafkaConsumer(
+        bootstrap_servers=KAFKA_BOOTSTRAP_SERVERS,
+        group_id=PROJECTOR_GROUP_ID,
+        enable_auto_commit=False,
+        auto_offset_reset="earliest",
+        value_deserializer=lambda v: json.loads(v.decode("utf-8")),
+    )
+
+
+registry.register("graph_projector_consumer", _create_consumer, close=lambda c: c.close())
+
+
+def rewind(consumer, from_offset=None, from_timestamp_ms=None):
+    """
+    Assigns all partitions of the projector topics explicitly and seeks them for a
+    rebuild: to `from_offset` (0 = beginning), or to the first offset at or after
+    `from_timestamp_ms`. Committed offsets move forward again as batches are applied.
+    """
+    partitions = [
+        TopicPartition(topic, p)
+        for topic in PROJECTOR_TOPICS
+        for p in sorted(consumer.partitions_for_topic(topic) or ())
+    ]
+    consumer.assign(partitions)
+    if from_timestamp_ms is not None:
+        found = consumer.offsets_for_times({tp: from_timestamp_ms for tp in partitions})
+        ends = consumer.end_offsets(partitions)
+        for tp in partitions:
+            consumer.seek(tp, found[tp].offset if found.get(tp) else ends[tp])
+    else:
+        for tp in partitions:
+            consumer.seek(tp, from_offset)
+    print(f"[Projector] Rewound {len(partitions)} partitions "
+          f"({'timestamp ' + str(from_timestamp_ms) if from_timestamp_ms is not None else 'offset ' + str(from_offset)}).")
+
+
+def send_to_dlq(topic: str, event, error):
+    """Parks an event the projector can't apply, so it doesn't block the partition."""
+    try:
+        get_producer().send(DLQ_TOPIC, {
+            "original_topic": topic,
+            "failed_event": event,
+            "error": str(error),
+            "timestamp": time.time()
+        })
+    except KafkaError as e:
+        print(f"[Projector] DLQ publish failed: {e}")
+
+
+def flush(batch: ProjectionBatch, session, max_backoff: float = 30.0):
+    """
+    Applies one batch, retrying until Neo4j accepts it. Giving up would mean either
+    dropping events or committing past them, so an outage simply pauses projection.
+    """
+    attempt = 0
+    while True:
+        start = time.perf_counter()
+        try:
+            batch.apply(session)
+            break
+        except Exception as e:
+            attempt += 1
+            delay = min(max_backoff, 0.5 * 2 ** attempt)
+            print(f"[Projector] Batch of {len(batch)} events failed (attempt {attempt}): {e}; retrying in {delay:.1f}s")
+            time.sleep(delay)
+    elapsed = time.perf_counter() - start
+    GRAPH_PROJECTION_BATCH_LATENCY.observe(elapsed)
+    for topic, count in batch.topics.items():
+        GRAPH_PROJECTION_EVENTS.inc((topic,), count)
+    print(f"[Projector] Applied {len(batch)} events as {len(batch.users)} users, {len(batch.businesses)} businesses, "
+          f"{len(batch.owns)} OWNS in {elapsed * 1000:.1f}ms")
+    publish_event(topic=GRAPH_PROJECTED_TOPIC, data=batch.touched())
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path != "/metrics":
+            self.send_error(404)
+            return
+        body = render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_metrics(port: int):
+    server = ThreadingHTTPServer(("0.0.0.0", port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="projector-metrics", daemon=True).start()
+    print(f"[Projector] Metrics on :{port}/metrics")
+    return server
+
+
+def run_projector(from_offset=None, from_timestamp_ms=None, clear=False):
+    consumer = registry.get("graph_projector_consumer")
+    if PROJECTOR_METRICS_PORT:
+        serve_metrics(PROJECTOR_METRICS_PORT)
+    try:
+        with get_driver().session() as session:
+            if clear:
+                deleted = graph_loader.clear_graph(session)
+                print(f"[Projector] Cleared {deleted} nodes before rebuild. (Dev only)")
+            graph_loader.ensure_schema(session)
+
+            if from_offset is not None or from_timestamp_ms is not None:
+                rewind(consumer, from_offset, from_timestamp_ms)
+            else:
+                consumer.subscribe(PROJECTOR_TOPICS)
+            print(f"[Projector] Projecting {', '.join(PROJECTOR_TOPICS)} into Neo4j "
+                  f"(batch {PROJECTOR_BATCH_SIZE} events / {PROJECTOR_MAX_WAIT_MS}ms).")
+
+            batch = ProjectionBatch()
+            offsets = {}
+            while True:
+                timeout = PROJECTOR_MAX_WAIT_MS if not batch else max(0, PROJECTOR_MAX_WAIT_MS - batch.age_ms())
+                records = consumer.poll(timeout_ms=math.ceil(timeout), max_records=PROJECTOR_BATCH_SIZE - len(batch))
+                for tp, messages in records.items():
+                    for msg in messages:
+                        try:
+                            batch.add(msg.topic, msg.value)
+                        except (ValueError, TypeError, AttributeError) as e:
+                            print(f"[Projector] Skipping event {msg.value}: {e}")
+                            send_to_dlq(msg.topic, msg.value, e)
+                        offsets[tp] = OffsetAndMetadata(msg.offset + 1, None)
+
+                if batch and (len(batch) >= PROJECTOR_BATCH_SIZE or batch.age_ms() >= PROJECTOR_MAX_WAIT_MS):
+                    flush(batch, session)
+                    batch = ProjectionBatch()
+                if offsets and not batch:
+                    consumer.commit(offsets)
+                    offsets = {}
+    finally:
+        registry.close_all()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Project user/business events from Kafka into Neo4j.")
+    parser.add_argument("--from-offset", type=int, default=None,
+                        help="Rebuild: replay every partition from this offset (0 = beginning).")
+    parser.add_argument("--from-timestamp", type=int, default=None,
+                        help="Rebuild: replay from this epoch-millisecond timestamp.")
+    parser.add_argument("--clear", action="store_true",
+                        help="Delete the whole graph before replaying. (Dev only!)")
+    args = parser.parse_args()
+    run_projector(args.from_offset, args.from_timestamp, args.clear)
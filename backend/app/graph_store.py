@@ -0,0 +1,185 @@
+# backend/app/graph_store.py
+
+import os
+import time
+
+import numpy as np
+
+# Edge type codes stored per adjacency slot
+EDGE_TYPES = ("OWNS", "USES_IP", "LINKED_TO")
+LABELS = ("User", "Business", "IP")
+KEYS = {"User": "userId", "Business": "bizId", "IP": "ipId"}
+
+
+class CSRGraph:
+    """
+    Read-only, in-memory stand-in for the Neo4j graph. Users, businesses and IPs share
+    one index space ([users | businesses | ips], each block sorted by external id), and
+    all edges live in a single compressed sparse row adjacency: both directions of every
+    relationship, with its type code and whether it points away from the indexed node.
+    A neighbour lookup is one slice, so lookups take microseconds and capped k-hop
+    expansions a few milliseconds over millions of edges, without a database.
+
+    Implements the reader interface `network.expand` uses (`root` / `hop`), so it can
+    replace Neo4j for the network endpoint via GRAPH_BACKEND=memory.
+    """
+
+    def __init__(self, user_ids, business_ids, ip_ids, owns=(), uses_ip=(), linked_to=(),
+                 emails=None, business_names=None, ip_addresses=None):
+        self.ids = [np.asarray(ids, dtype=np.int64) for ids in (user_ids, business_ids, ip_ids)]
+        orders = [np.argsort(ids, kind="stable") for ids in self.ids]
+        self.ids = [ids[order] for ids, order in zip(self.ids, orders)]
+        self.offsets = np.cumsum([0] + [len(ids) for ids in self.ids])
+        self.num_nodes = int(self.offsets[-1])
+        self.properties = [
+            {"email": _reorder(emails, orders[0])},
+            {"name": _reorder(business_names, orders[1])},
+            {"address": _reorder(ip_addresses, orders[2])},
+        ]
+
+        src, dst, kinds = [], [], []
+        for code, (start_label, end_label, pairs) in enumerate((
+            (0, 1, owns), (0, 2, uses_ip), (0, 0, linked_to),
+        )):
+            pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+            s, s_ok = self._lookup(start_label, pairs[:, 0])
+            d, d_ok = self._lookup(end_label, pairs[:, 1])
+            keep = s_ok & d_ok  # edges to nodes we don't have are dropped, like a MATCH would
+            src.append(s[keep])
+            dst.append(d[keep])
+            kinds.append(np.full(int(keep.sum()), code, dtype=np.int8))
+        src, dst, kinds = np.concatenate(src), np.concatenate(dst), np.concatenate(kinds)
+        self.num_edges = len(src)
+
+        # Both directions; `outgoing` is False for the reverse copy
+        rows = np.concatenate([src, dst])
+        cols = np.concatenate([dst, src])
+        order = np.argsort(rows, kind="stable")
+        self.indices = cols[order].astype(np.int32 if self.num_nodes < 2 ** 31 else np.int64)
+        self.edge_types = np.concatenate([kinds, kinds])[order]
+        self.outgoing = np.concatenate([np.ones(len(src), bool), np.zeros(len(src), bool)])[order]
+        self.indptr = np.zeros(self.num_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=self.num_nodes), out=self.indptr[1:])
+
+    @classmethod
+    def from_scenario_dir(cls, path: str):
+        """
+        Loads a generator scenario directory (synthetic_users.csv, ip_nodes.csv, ...).
+        synthetic_users.csv is required, so a wrong path fails loudly instead of
+        serving an empty graph; the other files are optional and reported if absent.
+        """
+        import pandas as pd
+
+        start = time.perf_counter()
+        users_file = os.path.join(path, "synthetic_users.csv")
+        if not os.path.isfile(users_file):
+            raise FileNotFoundError(f"{users_file} not found; is this a generator scenario directory?")
+        missing = []
+
+        def read(name, columns):
+            file = os.path.join(path, name)
+            if not os.path.exists(file):
+                missing.append(name)
+                return pd.DataFrame({c: pd.Series(dtype="object") for c in columns})
+            return pd.read_csv(file, usecols=lambda c: c in columns)
+
+        users = read("synthetic_users.csv", ("user_id", "email"))
+        businesses = read("synthetic_businesses.csv", ("business_id", "business_name"))
+        ips = read("ip_nodes.csv", ("ip_id", "ip_addr"))
+        owns = read("user_business_relationships.csv", ("user_id", "business_id"))
+        uses_ip = read("user_ip_relationships.csv", ("user_id", "ip_id"))
+        linked_to = read("user_user_relationships.csv", ("from_user_id", "to_user_id"))
+
+        graph = cls(
+            users["user_id"].to_numpy(), businesses["business_id"].to_numpy(), ips["ip_id"].to_numpy(),
+            owns=owns[["user_id", "business_id"]].to_numpy(),
+            uses_ip=uses_ip[["user_id", "ip_id"]].to_numpy(),
+            linked_to=linked_to[["from_user_id", "to_user_id"]].to_numpy(),
+            emails=users.get("email"), business_names=businesses.get("business_name"),
+            ip_addresses=ips.get("ip_addr"),
+        )
+        if missing:
+            print(f"[GraphStore] Not in {path}, loaded without: {', '.join(missing)}")
+        print(f"[GraphStore] Loaded {graph.num_nodes:,d} nodes and {graph.num_edges:,d} edges from {path} "
+              f"in {time.perf_counter() - start:.2f}s")
+        return graph
+
+    def _lookup(self, label: int, external_ids):
+        """Maps external ids of one label to global indices; returns (indices, found mask)."""
+        ids = self.ids[label]
+        pos = np.searchsorted(ids, external_ids)
+        pos = np.minimum(pos, max(len(ids) - 1, 0))
+        found = (ids[pos] == external_ids) if len(ids) else np.zeros(len(external_ids), bool)
+        return pos + self.offsets[label], found
+
+    def index_of(self, label: str, external_id: int):
+        idx, found = self._lookup(LABELS.index(label), np.asarray([external_id], dtype=np.int64))
+        return int(idx[0]) if found[0] else None
+
+    def node(self, idx: int):
+        """(label, external id, properties) for a global index."""
+        label = int(np.searchsorted(self.offsets, idx, side="right")) - 1
+        local = idx - self.offsets[label]
+        props = {}
+        for key, values in self.properties[label].items():
+            if values is not None and values[local] is not None and values[local] == values[local]:  # skip NaN
+                props[key] = values[local]
+        return LABELS[label], int(self.ids[label][local]), props
+
+    def neighbors(self, label: str, external_id: int, types=None):
+        """[(label, id, type, outgoing), ...] for one node, optionally filtered by edge type."""
+        idx = self.index_of(label, external_id)
+        if idx is None:
+            return []
+        start, end = self.indptr[idx], self.indptr[idx + 1]
+        result = []
+        for other, code, out in zip(self.indices[start:end], self.edge_types[start:end], self.outgoing[start:end]):
+            kind = EDGE_TYPES[code]
+            if types is None or kind in types:
+                other_label, other_id, _ = self.node(int(other))
+                result.append((other_label, other_id, kind, bool(out)))
+        return result
+
+    def shared(self, user_id: int, via: str = "USES_IP"):
+        """
+        Users sharing an attribute node with `user_id`: the same IP (USES_IP) or a
+        co-owned business (OWNS). Returns {user_id: number of shared nodes}.
+        """
+        idx = self.index_of("User", user_id)
+        if idx is None:
+            return {}
+        code = EDGE_TYPES.index(via)
+        start, end = self.indptr[idx], self.indptr[idx + 1]
+        hubs = self.indices[start:end][(self.edge_types[start:end] == code) & self.outgoing[start:end]]
+        counts = {}
+        for hub in hubs:
+            h_start, h_end = self.indptr[hub], self.indptr[hub + 1]
+            mask = (self.edge_types[h_start:h_end] == code) & ~self.outgoing[h_start:h_end]
+            for other in self.indices[h_start:h_end][mask]:
+                if other != idx:
+                    other_id = int(self.ids[0][other - self.offsets[0]])
+                    counts[other_id] = counts.get(other_id, 0) + 1
+        return counts
+
+    # network.expand reader interface: handles are global indices
+    def root(self, user_id: int):
+        idx = self.index_of("User", user_id)
+        if idx is None:
+            return None
+        label, node_id, props = self.node(idx)
+        return idx, [label], {"userId": node_id, **props}
+
+    def hop(self, frontier, limit: int):
+        for idx in frontier:
+            start = self.indptr[idx]
+            end = min(self.indptr[idx + 1], start + limit)
+            for other, code, out in zip(self.indices[start:end], self.edge_types[start:end], self.outgoing[start:end]):
+                label, node_id, props = self.node(int(other))
+                yield idx, EDGE_TYPES[code], bool(out), int(other), [label], {KEYS[label]: node_id, **props}
+
+
+def _reorder(values, order):
+    if values is None:
+        return None
+    values = np.asarray(values, dtype=object)
+    return values[order] if len(values) == len(order) else None
@@ -0,0 +1,130 @@
+# backend/app/idempotency.py
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from fastapi import HTTPException
+from fastapi.responses import Response
+
+from .serializers import dumps
+
+IDEMPOTENCY_TTL_SECONDS = float(os.getenv("IDEMPOTENCY_TTL_SECONDS", "3600"))
+IDEMPOTENCY_MAX_ENTRIES = int(os.getenv("IDEMPOTENCY_MAX_ENTRIES", "10000"))
+# How long a duplicate waits for the in-flight original before giving up with 409
+IDEMPOTENCY_WAIT_SECONDS = float(os.getenv("IDEMPOTENCY_WAIT_SECONDS", "30"))
+MAX_KEY_LENGTH = 255
+
+
+class _Entry:
+    __slots__ = ("fingerprint", "done", "status_code", "body", "expires_at")
+
+    def __init__(self, fingerprint: str):
+        self.fingerprint = fingerprint
+        self.done = threading.Event()
+        self.status_code = None
+        self.body = None
+        self.expires_at = float("inf")  # in-flight entries never expire
+
+    def response(self, replayed: bool) -> Response:
+        headers = {"Idempotent-Replayed": "true"} if replayed else None
+        return Response(content=self.body, status_code=self.status_code,
+                        headers=headers, media_type="application/json")
+
+
+class IdempotencyStore:
+    """
+    In-memory, per-process store of responses keyed by (route, Idempotency-Key).
+
+    The first request with a key executes; retries within the TTL get the stored
+    response back without re-running the handler (no second bcrypt hash or insert).
+    Concurrent duplicates block on the in-flight execution instead of racing it.
+    Client errors (4xx) are stored like successes; server errors are not, so the
+    client can retry them.
+    """
+
+    def __init__(self, ttl: float = IDEMPOTENCY_TTL_SECONDS, max_entries: int = IDEMPOTENCY_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _evict(self, now: float):
+        # Completed entries are moved to the end as they finish, so among them the ones that
+        # expire first come first. In-flight entries keep their insertion slot and are
+        # skipped rather than stopping the scan, so a slow request can't pin everything after it.
+        excess = len(self._entries) - self.max_entries
+        evictable = []
+        for key, entry in self._entries.items():
+            if not entry.done.is_set():
+                continue
+            if entry.expires_at > now and excess <= 0:
+                break
+            evictable.append(key)
+            excess -= 1
+        for key in evictable:
+            del self._entries[key]
+
+    def execute(self, key, fingerprint: str, handler, wait_timeout: float = IDEMPOTENCY_WAIT_SECONDS) -> Response:
+        """
+        handler() returns (status_code, content). HTTPExceptions it raises with a
+        4xx status are stored and replayed as {"detail": ...} responses.
+        """
+        while True:
+            with self._lock:
+                self._evict(time.monotonic())
+                entry = self._entries.get(key)
+                owner = entry is None
+                if owner:
+                    entry = self._entries[key] = _Entry(fingerprint)
+
+            if owner:
+                return self._run(key, entry, handler)
+
+            if entry.fingerprint != fingerprint:
+                raise HTTPException(status_code=422, detail="Idempotency-Key was used with a different request.")
+            if not entry.done.wait(wait_timeout):
+                raise HTTPException(status_code=409, detail="A request with this Idempotency-Key is in progress.")
+            if entry.status_code is None:
+                # The original failed with a server error and was discarded; run it ourselves
+                continue
+            return entry.response(replayed=True)
+
+    def _run(self, key, entry: _Entry, handler) -> Response:
+        try:
+            try:
+                status_code, content = handler()
+            except HTTPException as e:
+                if e.status_code >= 500:
+                    raise
+                status_code, content = e.status_code, {"detail": e.detail}
+        except BaseException:
+            with self._lock:
+                self._entries.pop(key, None)
+            entry.done.set()
+            raise
+
+        entry.status_code = status_code
+        entry.body = dumps(content)
+        with self._lock:
+            entry.expires_at = time.monotonic() + self.ttl
+            self._entries.move_to_end(key)
+        entry.done.set()
+        return entry.response(replayed=False)
+
+
+def fingerprint(request_model, *extra) -> str:
+    """Hash of the request body (plus any query params), so a reused key with a different payload is rejected."""
+    payload = request_model.json() + "".join(f"|{value!r}" for value in extra)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def validate_key(idempotency_key: str) -> str:
+    if not idempotency_key or len(idempotency_key) > MAX_KEY_LENGTH:
+        raise HTTPException(status_code=400, detail=f"Idempotency-Key must be 1-{MAX_KEY_LENGTH} characters.")
+    return idempotency_key
+
+
+store = IdempotencyStore()
@@ -8,36 +8,52 @@ from kafka.errors import KafkaError
 from sqlalchemy.orm import Session
 from app.database import SessionLocal
 from app.models import User
+from app.resources import registry
 
 KAFKA_BOOTSTRAP_SERVERS = os.getenv("KAFKA_BOOTSTRAP_SERVERS", "kafka:9092")
 USER_CREATED_TOPIC = os.getenv("KAFKA_USER_CREATED_TOPIC", "user_created")
 DLQ_TOPIC = os.getenv("KAFKA_DLQ_TOPIC", "verishield_dlq")
 
-consumer = KafkaConsumer(
-    USER_CREATED_TOPIC,
-    bootstrap_servers=KAFKA_BOOTSTRAP_SERVERS,
-    auto_offset_reset='earliest',
-    enable_auto_commit=True,
-    group_id='verishield-consumer-group',
-    value_deserializer=lambda v: json.loads(v.decode('utf-8'))
-)
+def _create_consumer():
+    return KafkaConsumer(
+        USER_CREATED_TOPIC,
+        bootstrap_servers=KAFKA_BOOTSTRAP_SERVERS,
+        auto_offset_reset='earliest',
+        enable_auto_commit=True,
+        group_id='verishield-consumer-group',
+        value_deserializer=lambda v: json.loads(v.decode('utf-8'))
+    )
 
 # Producer for posting to DLQ if needed
-dlq_producer = KafkaProducer(
-    bootstrap_servers=KAFKA_BOOTSTRAP_SERVERS,
-    value_serializer=lambda v: json.dumps(v).encode("utf-8")
-)
+def _create_dlq_producer():
+    return KafkaProducer(
+        bootstrap_servers=KAFKA_BOOTSTRAP_SERVERS,
+        value_serializer=lambda v: json.dumps(v).encode("utf-8")
+    )
+
+# Both clients are created on first use rather than at import time
+registry.register("kafka_consumer", _create_consumer, close=lambda c: c.close())
+registry.register("kafka_dlq_producer", _create_dlq_producer, close=lambda p: p.close(timeout=10))
+
+def get_consumer():
+    return registry.get("kafka_consumer")
+
+def get_dlq_producer():
+    return registry.get("kafka_dlq_producer")
 
 def run_consumer():
     print(f"[Consumer] Subscribed to {USER_CREATED_TOPIC}. Waiting for messages...")
-    for msg in consumer:
-        event = msg.value
-        print(f"[Consumer] Received event: {event}")
-        try:
-            process_event(event)
-        except Exception as e:
-            print(f"[Consumer] Error processing event {event}: {e}")
-            send_to_dlq(event, e)
+    try:
+        for msg in get_consumer():
+            event = msg.value
+            print(f"[Consumer] Received event: {event}")
+            try:
+                process_event(event)
+            except Exception as e:
+                print(f"[Consumer] Error processing event {event}: {e}")
+                send_to_dlq(event, e)
+    finally:
+        registry.close_all()
 
 def process_event(event_data, max_retries=3):
     """
@@ -73,7 +89,7 @@ def send_to_dlq(event_data, exception):
         "timestamp": time.time()
     }
     try:
-        dlq_producer.send(DLQ_TOPIC, dlq_message)
+        get_dlq_producer().send(DLQ_TOPIC, dlq_message)
         print(f"[Consumer] Sent event to DLQ: {dlq_message}")
     except KafkaError as e:
         print(f"[Consumer] DLQ publish failed: {e}")
@@ -6,33 +6,45 @@ import time
 from kafka import KafkaProducer
 from kafka.errors import KafkaError
 
+from .metrics import KAFKA_PUBLISH_LATENCY
+from .resources import registry
+
 KAFKA_BOOTSTRAP_SERVERS = os.getenv("KAFKA_BOOTSTRAP_SERVERS", "kafka:9092")
 DLQ_TOPIC = os.getenv("KAFKA_DLQ_TOPIC", "verishield_dlq")
 
-# Global reference, but not created until first use
-_producer = None
+
+def _create_producer():
+    return KafkaProducer(
+        bootstrap_servers=KAFKA_BOOTSTRAP_SERVERS,
+        value_serializer=lambda v: json.dumps(v).encode("utf-8"),
+        # optional: handle larger message sizes, timeouts, etc.
+    )
+
+
+# Not created until first use; closed (and flushed) by the app's shutdown hook
+registry.register("kafka_producer", _create_producer, close=lambda p: p.close(timeout=10))
+
 
 def get_producer():
     """
     Lazily create the KafkaProducer the first time it’s needed,
     avoiding connection attempts before Kafka is ready.
     """
-    global _producer
-    if _producer is not None:
-        return _producer
-
-    _producer = KafkaProducer(
-        bootstrap_servers=KAFKA_BOOTSTRAP_SERVERS,
-        value_serializer=lambda v: json.dumps(v).encode("utf-8"),
-        # optional: handle larger message sizes, timeouts, etc.
-    )
-    return _producer
+    return registry.get("kafka_producer")
 
 
 def publish_event(topic: str, data: dict, max_retries: int = 3):
     """
     Publish an event with basic retry logic. On repeated failure, push to DLQ.
     """
+    start = time.perf_counter()
+    try:
+        _publish_event(topic, data, max_retries)
+    finally:
+        KAFKA_PUBLISH_LATENCY.observe(time.perf_counter() - start, (topic, "single"))
+
+
+def _publish_event(topic: str, data: dict, max_retries: int):
     for attempt in range(1, max_retries + 1):
         try:
             producer = get_producer()  # Acquire or create the KafkaProducer
@@ -54,3 +66,63 @@ def publish_event(topic: str, data: dict, max_retries: int = 3):
         })
     except KafkaError as e:
         print(f"[Producer] Even DLQ publish failed: {e}")
+
+
+def publish_events(topic: str, events: list, max_retries: int = 3):
+    """
+    Publish a batch of events with a single flush instead of one blocking
+    round trip per event. Events that still fail after retries go to the DLQ.
+    """
+    start = time.perf_counter()
+    try:
+        _publish_events(topic, events, max_retries)
+    finally:
+        KAFKA_PUBLISH_LATENCY.observe(time.perf_counter() - start, (topic, "batch"))
+
+
+def _publish_events(topic: str, events: list, max_retries: int):
+    pending = list(events)
+    for attempt in range(1, max_retries + 1):
+        if not pending:
+            return
+        futures = []
+        unsent = []
+        try:
+            producer = get_producer()
+            for data in pending:
+                futures.append((data, producer.send(topic, data)))
+            producer.flush(timeout=10)
+        except KafkaError as e:
+            print(f"[Producer] Attempt {attempt} failed to publish batch: {e}")
+            # Events that never got as far as send() are retried as well
+            unsent = pending[len(futures):]
+
+        # Even after a failed flush, only retry events whose send failed or is still
+        # unresolved; resending the ones that got through would duplicate them downstream
+        failed = []
+        for data, future in futures:
+            try:
+                future.get(timeout=0)
+            except KafkaError:
+                failed.append(data)
+        failed.extend(unsent)
+        if failed:
+            print(f"[Producer] Attempt {attempt}: {len(failed)} of {len(pending)} events failed.")
+            time.sleep(1)
+        pending = failed
+
+    if not pending:
+        return
+
+    # If all attempts fail, send the remaining events to DLQ topic
+    print(f"[Producer] {len(pending)} events failed, sending to DLQ.")
+    try:
+        producer = get_producer()
+        for data in pending:
+            producer.send(DLQ_TOPIC, {
+                "original_topic": topic,
+                "failed_data": data
+            })
+        producer.flush(timeout=10)
+    except KafkaError as e:
+        print(f"[Producer] Even DLQ publish failed: {e}")
@@ -1,17 +1,56 @@
 # backend/app/main.py
 
-from fastapi import FastAPI, Depends, HTTPException, status
+import time
+from typing import List, Optional
+
+from fastapi import FastAPI, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.responses import JSONResponse, PlainTextResponse
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
+from anyio import to_thread
 
 from .database import SessionLocal, engine, Base
-from . import crud, schemas, models
+from .pool_metrics import pool_status
+from .replicas import router as replica_router, is_pinned_to_primary, pin_to_primary
+from .resources import registry
+from .readiness import prober
+from . import admin_auth, admission, crud, idempotency, metrics, network, profiler, schemas, models, schema_upgrades, serializers, slow_queries
+
+app = FastAPI(title="VeriShield Phase 2", default_response_class=serializers.default_response_class())
+
+# Per-lane concurrency limits with load shedding; health and single-entity verification bypass them
+if admission.ADMISSION_CONTROL:
+    app.add_middleware(admission.AdmissionControlMiddleware)
+
+# Opt-in request profiling; not installed at all unless a token or sample rate is configured
+if profiler.PROFILER_ENABLED:
+    app.add_middleware(profiler.ProfilerMiddleware)
 
-app = FastAPI(title="VeriShield Phase 2")
+# Outermost, so shed requests are counted too
+app.add_middleware(metrics.MetricsMiddleware, routes=app.routes)
 
 # Create tables on startup (Dev only!). In production, use migrations (Alembic).
 @app.on_event("startup")
 def on_startup():
+    start = time.perf_counter()
+    if admission.ADMISSION_CONTROL:
+        # Make sure the limited lanes can't exhaust the threadpool that sync handlers run in
+        limiter = to_thread.current_default_thread_limiter()
+        limiter.total_tokens = max(limiter.total_tokens, admission.required_threads())
     Base.metadata.create_all(bind=engine)
+    # create_all never adds columns to existing tables (e.g. users.version)
+    schema_upgrades.upgrade_schema(engine)
+    prober.start()
+    replica_router.start()
+    print(f"[Startup] Ready in {(time.perf_counter() - start) * 1000:.1f} ms (Neo4j/Kafka clients connect lazily)")
+
+# Close the Neo4j driver and flush/close Kafka clients created by this worker
+@app.on_event("shutdown")
+def on_shutdown():
+    prober.stop()
+    replica_router.stop()
+    network.listener.stop()
+    registry.close_all()
 
 # DB Dependency
 def get_db():
@@ -21,56 +60,264 @@ def get_db():
     finally:
         db.close()
 
+# Read-only DB Dependency: routed to a replica unless this client just wrote
+def get_read_db(request: Request):
+    db = replica_router.read_session(pin_to_primary=is_pinned_to_primary(request.cookies))
+    try:
+        yield db
+    finally:
+        db.close()
+
+# Read-your-writes: after a successful write, pin the client's reads to the primary
+@app.middleware("http")
+async def read_your_writes(request: Request, call_next):
+    response = await call_next(request)
+    if replica_router.has_replicas and request.method not in ("GET", "HEAD", "OPTIONS") \
+            and response.status_code < 400:
+        pin_to_primary(response)
+    return response
+
+# Conditional request helpers
+def _etag(entity) -> str:
+    return f'"{entity.version}"'
+
+def _etag_matches(header: Optional[str], etag: str, weak: bool = False) -> bool:
+    """
+    Checks an If-Match / If-None-Match header against an ETag.
+    If-None-Match uses weak comparison (W/ prefixes ignored), If-Match uses strong.
+    """
+    if not header:
+        return False
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if weak and candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == "*" or candidate == etag:
+            return True
+    return False
+
 @app.get("/health")
 def health_check():
     return {"status": "OK"}
 
+# Answers from the background prober's cached results; never touches the dependencies itself
+@app.get("/ready")
+def readiness_check():
+    ready, dependencies = prober.snapshot()
+    return JSONResponse(
+        status_code=status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"status": "ready" if ready else "not_ready", "dependencies": dependencies},
+    )
+
+# Prometheus scrape endpoint
+@app.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics():
+    pool = pool_status(engine)
+    lanes = admission.stats()
+    cache = network.cache.stats()
+    # Current levels are gauges; running totals are counters so rate()/increase() work on them
+    gauges = [
+        (f"db_pool_{key}", f"Connection pool {key.replace('_', ' ')}.", [({}, pool[key])])
+        for key in ("checked_out", "overflow", "wait_ms_max")
+        if key in pool
+    ]
+    gauges += [
+        (f"admission_{key}", f"Admission control {key.replace('_', ' ')} per lane.",
+         [({"lane": name}, lane[key]) for name, lane in lanes.items()])
+        for key in ("in_flight", "waiting")
+    ]
+    gauges.append(("network_cache_entries", "User network cache entries.", [({}, cache["entries"])]))
+    counters = [
+        (f"db_pool_{key}_total", f"Connection pool {key.replace('_', ' ')}.", [({}, pool[key])])
+        for key in ("checkouts", "overflow_checkouts", "timeouts")
+    ]
+    counters += [
+        (f"admission_{key}_total", f"Admission control {key.replace('_', ' ')} per lane.",
+         [({"lane": name}, lane[key]) for name, lane in lanes.items()])
+        for key in ("admitted", "shed")
+    ]
+    counters.append(("admission_queue_seconds_total", "Admission control time spent queued per lane.",
+                     [({"lane": name}, lane["queue_seconds_total"]) for name, lane in lanes.items()]))
+    counters += [
+        (f"network_cache_{key}_total", f"User network cache {key}.", [({}, cache[key])])
+        for key in ("hits", "misses", "invalidations")
+    ]
+    return PlainTextResponse(metrics.render_prometheus(gauges, counters), media_type="text/plain; version=0.0.4")
+
+@app.get("/metrics/db-pool")
+def db_pool_metrics():
+    metrics = pool_status(engine)
+    metrics["replicas"] = replica_router.status()
+    return metrics
+
+@app.get("/metrics/admission")
+def admission_metrics():
+    return admission.stats()
+
+# Samples this worker for a fixed window and returns flamegraph-compatible collapsed stacks
+@app.post("/admin/profile", response_class=PlainTextResponse, dependencies=[Depends(admin_auth.require_admin_token)])
+def profile_worker(
+    seconds: float = Query(10, gt=0, le=profiler.PROFILER_MAX_WINDOW_SECONDS),
+    all_threads: bool = False,
+):
+    return PlainTextResponse(profiler.profile_window(seconds, app_only=not all_threads))
+
+# Slow statements aggregated per fingerprint, with captured plans (parameters redacted)
+@app.get("/admin/slow-queries", dependencies=[Depends(admin_auth.require_admin_token)])
+def slow_query_report(reset: bool = False):
+    report = slow_queries.slow_query_log.report()
+    if reset:
+        slow_queries.slow_query_log.reset()
+    return {"threshold_ms": slow_queries.slow_query_log.threshold * 1000, "statements": report}
+
 # ----------------------------
 #       User Endpoints
 # ----------------------------
 @app.post("/users", response_model=schemas.UserRead, status_code=status.HTTP_201_CREATED)
-def create_user(user_in: schemas.UserCreate, db: Session = Depends(get_db)):
+def create_user(
+    user_in: schemas.UserCreate,
+    idempotency_key: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+):
+    if idempotency_key is None:
+        return _create_user(user_in, db)
+    # Retries with the same key replay the stored response instead of hashing and inserting again
+    return idempotency.store.execute(
+        ("POST /users", idempotency.validate_key(idempotency_key)),
+        idempotency.fingerprint(user_in),
+        lambda: (status.HTTP_201_CREATED, serializers.user_read.to_dict(_create_user(user_in, db))),
+    )
+
+def _create_user(user_in: schemas.UserCreate, db: Session):
     existing = crud.get_user_by_email(db, user_in.email)
     if existing:
         raise HTTPException(status_code=400, detail="Email already registered.")
     user = crud.create_user(db, user_in)
     return user
 
+@app.patch("/users/verify", response_model=List[schemas.UserRead])
+def bulk_verify_users(request: schemas.BulkVerificationRequest, db: Session = Depends(get_db)):
+    users = crud.bulk_update_user_verification(db, request.ids, request.verified)
+    if serializers.FAST_JSON:
+        return serializers.user_read.response_many(users)
+    return users
+
 @app.get("/users/{user_id}", response_model=schemas.UserRead)
-def get_user(user_id: int, db: Session = Depends(get_db)):
+def get_user(
+    user_id: int,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_read_db),
+):
     user = crud.get_user(db, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found.")
+    etag = _etag(user)
+    if _etag_matches(if_none_match, etag, weak=True):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    if serializers.FAST_JSON:
+        return serializers.user_read.response(user, headers={"ETag": etag})
+    response.headers["ETag"] = etag
     return user
 
+# k-hop neighbourhood over OWNS, USES_IP and LINKED_TO, served from an LRU that graph projection invalidates
+@app.get("/users/{user_id}/network")
+def get_user_network(user_id: int, depth: int = Query(1, ge=1, le=network.NETWORK_MAX_DEPTH)):
+    body, cache_status = network.get_network(user_id, depth)
+    return Response(content=body, media_type="application/json", headers={"X-Cache": cache_status})
+
 @app.patch("/users/{user_id}/verify", response_model=schemas.UserRead)
-def verify_user(user_id: int, db: Session = Depends(get_db)):
-    user = crud.update_user_verification(db, user_id, True)
+def verify_user(
+    user_id: int,
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+):
+    if if_match is not None:
+        user = crud.get_user(db, user_id)
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found.")
+        if not _etag_matches(if_match, _etag(user)):
+            raise HTTPException(status_code=412, detail="User has been modified.")
+    try:
+        user = crud.update_user_verification(db, user_id, True)
+    except StaleDataError:
+        db.rollback()
+        raise HTTPException(status_code=412, detail="User has been modified.")
     if not user:
         raise HTTPException(status_code=404, detail="User not found.")
+    response.headers["ETag"] = _etag(user)
     return user
 
 # ----------------------------
 #     Business Endpoints
 # ----------------------------
 @app.post("/businesses", response_model=schemas.BusinessRead, status_code=status.HTTP_201_CREATED)
-def create_business(business_in: schemas.BusinessCreate, owner_id: int = None, db: Session = Depends(get_db)):
+def create_business(
+    business_in: schemas.BusinessCreate,
+    owner_id: int = None,
+    idempotency_key: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+):
+    if idempotency_key is None:
+        return _create_business(business_in, owner_id, db)
+    return idempotency.store.execute(
+        ("POST /businesses", idempotency.validate_key(idempotency_key)),
+        idempotency.fingerprint(business_in, owner_id),
+        lambda: (status.HTTP_201_CREATED, serializers.business_read.to_dict(_create_business(business_in, owner_id, db))),
+    )
+
+def _create_business(business_in: schemas.BusinessCreate, owner_id: int, db: Session):
     existing = crud.get_business_by_name(db, business_in.name)
     if existing:
         raise HTTPException(status_code=400, detail="Business name already taken.")
     business = crud.create_business(db, business_in, owner_id)
     return business
 
+@app.patch("/businesses/verify", response_model=List[schemas.BusinessRead])
+def bulk_verify_businesses(request: schemas.BulkVerificationRequest, db: Session = Depends(get_db)):
+    businesses = crud.bulk_update_business_verification(db, request.ids, request.verified)
+    if serializers.FAST_JSON:
+        return serializers.business_read.response_many(businesses)
+    return businesses
+
 @app.get("/businesses/{business_id}", response_model=schemas.BusinessRead)
-def get_business(business_id: int, db: Session = Depends(get_db)):
+def get_business(
+    business_id: int,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_read_db),
+):
     biz = crud.get_business(db, business_id)
     if not biz:
         raise HTTPException(status_code=404, detail="Business not found.")
+    etag = _etag(biz)
+    if _etag_matches(if_none_match, etag, weak=True):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    if serializers.FAST_JSON:
+        return serializers.business_read.response(biz, headers={"ETag": etag})
+    response.headers["ETag"] = etag
     return biz
 
 @app.patch("/businesses/{business_id}/verify", response_model=schemas.BusinessRead)
-def verify_business(business_id: int, db: Session = Depends(get_db)):
-    biz = crud.update_business_verification(db, business_id, True)
+def verify_business(
+    business_id: int,
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+):
+    if if_match is not None:
+        biz = crud.get_business(db, business_id)
+        if not biz:
+            raise HTTPException(status_code=404, detail="Business not found.")
+        if not _etag_matches(if_match, _etag(biz)):
+            raise HTTPException(status_code=412, detail="Business has been modified.")
+    try:
+        biz = crud.update_business_verification(db, business_id, True)
+    except StaleDataError:
+        db.rollback()
+        raise HTTPException(status_code=412, detail="Business has been modified.")
     if not biz:
         raise HTTPException(status_code=404, detail="Business not found.")
+    response.headers["ETag"] = _etag(biz)
     return biz
@@ -0,0 +1,207 @@
+# backend/app/metrics.py
+
+import contextvars
+import threading
+import time
+from bisect import bisect_left
+
+from sqlalchemy import event
+
+# Latency buckets (seconds) shared by all histograms
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# The ASGI scope of the request being handled. Context variables are copied into
+# the threadpool that runs sync handlers, so DB hooks can attribute queries to a route.
+_current_scope = contextvars.ContextVar("verishield_request_scope", default=None)
+
+
+class _Shards:
+    """
+    One dict of metric values per thread. Each thread only ever writes to its own
+    dict, so the hot path takes no locks; a scrape sums the shards of all threads.
+    The lock below is only taken the first time a thread records anything.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._all = []
+        self._lock = threading.Lock()
+
+    def get(self) -> dict:
+        try:
+            return self._local.values
+        except AttributeError:
+            values = self._local.values = {}
+            with self._lock:
+                self._all.append(values)
+            return values
+
+    def collect(self) -> list:
+        with self._lock:
+            shards = list(self._all)
+        # list(dict.items()) is a single atomic copy under the GIL
+        return [list(values.items()) for values in shards]
+
+
+_shards = _Shards()
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def inc(self, labels=(), amount: float = 1):
+        values = _shards.get()
+        key = (self, labels)
+        values[key] = values.get(key, 0) + amount
+
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, labels=()):
+        values = _shards.get()
+        key = (self, labels)
+        cells = values.get(key)
+        if cells is None:
+            # per-bucket counts (+Inf last), then sum
+            cells = values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+        cells[bisect_left(self.buckets, value)] += 1
+        cells[-1] += value
+
+
+REQUESTS = Counter("http_requests_total", "HTTP requests by route and status.", ("method", "route", "status"))
+REQUEST_LATENCY = Histogram("http_request_duration_seconds", "HTTP request latency by route.", ("method", "route"))
+DB_QUERY_LATENCY = Histogram("db_query_duration_seconds", "SQL statement latency by route.", ("route",))
+KAFKA_PUBLISH_LATENCY = Histogram("kafka_publish_duration_seconds", "Time spent publishing to Kafka.", ("topic", "mode"))
+GRAPH_PROJECTION_BATCH_LATENCY = Histogram(
+    "graph_projection_batch_duration_seconds", "Time to apply one projection micro-batch to Neo4j."
+)
+GRAPH_PROJECTION_EVENTS = Counter("graph_projection_events_total", "Events projected into Neo4j by topic.", ("topic",))
+
+_METRICS = (
+    REQUESTS, REQUEST_LATENCY, DB_QUERY_LATENCY, KAFKA_PUBLISH_LATENCY,
+    GRAPH_PROJECTION_BATCH_LATENCY, GRAPH_PROJECTION_EVENTS,
+)
+
+# endpoint function -> route template, filled in by MetricsMiddleware
+_route_templates = {}
+
+
+def route_label(scope) -> str:
+    if scope is None:
+        return "background"
+    endpoint = scope.get("endpoint")
+    if endpoint is None:
+        return "unmatched"
+    return _route_templates.get(endpoint, "unmatched")
+
+
+def current_route() -> str:
+    return route_label(_current_scope.get())
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording per-route latency and status counts."""
+
+    def __init__(self, app, routes):
+        self.app = app
+        self.routes = routes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        if not _route_templates:
+            # Templates (e.g. /users/{user_id}) keep label cardinality bounded
+            _route_templates.update({route.endpoint: route.path for route in self.routes if hasattr(route, "endpoint")})
+
+        status_code = 500
+        start = time.perf_counter()
+        token = _current_scope.set(scope)
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            _current_scope.reset(token)
+            route = route_label(scope)
+            REQUEST_LATENCY.observe(elapsed, (scope["method"], route))
+            REQUESTS.inc((scope["method"], route, str(status_code)))
+
+
+def instrument_queries(engine):
+    """Time every statement on this engine and attribute it to the active route."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        DB_QUERY_LATENCY.observe(elapsed, (current_route(),))
+
+
+def _format_labels(labelnames, labels, extra=()) -> str:
+    pairs = list(zip(labelnames, labels)) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"') for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+def render_prometheus(gauges=(), counters=()) -> str:
+    """
+    Prometheus text exposition of all metrics. `gauges` and `counters` are iterables
+    of (name, documentation, [(labels_dict, value), ...]) supplied by the caller
+    (pool and admission state): gauges for point-in-time values, counters for
+    totals that only ever increase (their names should end in _total).
+    """
+    merged = {}
+    for shard in _shards.collect():
+        for (metric, labels), value in shard:
+            key = (metric, labels)
+            if isinstance(value, list):
+                acc = merged.get(key)
+                merged[key] = list(value) if acc is None else [a + b for a, b in zip(acc, value)]
+            else:
+                merged[key] = merged.get(key, 0) + value
+
+    lines = []
+    for metric in _METRICS:
+        kind = "histogram" if isinstance(metric, Histogram) else "counter"
+        lines.append(f"# HELP {metric.name} {metric.documentation}")
+        lines.append(f"# TYPE {metric.name} {kind}")
+        for (m, labels), value in sorted(
+            ((k, v) for k, v in merged.items() if k[0] is metric), key=lambda item: item[0][1]
+        ):
+            if kind == "counter":
+                lines.append(f"{metric.name}{_format_labels(metric.labelnames, labels)} {value}")
+                continue
+            cumulative = 0
+            for bound, count in zip(metric.buckets + (float("inf"),), value[:-1]):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"{metric.name}_bucket{_format_labels(metric.labelnames, labels, [('le', le)])} {cumulative}")
+            lines.append(f"{metric.name}_sum{_format_labels(metric.labelnames, labels)} {value[-1]}")
+            lines.append(f"{metric.name}_count{_format_labels(metric.labelnames, labels)} {cumulative}")
+
+    for kind, families in (("gauge", gauges), ("counter", counters)):
+        for name, documentation, samples in families:
+            lines.append(f"# HELP {name} {documentation}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                lines.append(f"{name}{_format_labels(tuple(labels), tuple(labels.values()))} {value}")
+    return "\n".join(lines) + "\n"
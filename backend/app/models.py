@@ -1,6 +1,6 @@
 # backend/app/models.py
 
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, SmallInteger, String, Boolean, Float, Date, DateTime, ForeignKey
 from sqlalchemy.orm import relationship
 from .database import Base
 
@@ -11,6 +11,12 @@ class User(Base):
     email = Column(String, unique=True, index=True, nullable=False)
     password_hash = Column(String, nullable=False)
     is_verified = Column(Boolean, default=False)
+    # Row version, surfaced as the ETag. SQLAlchemy bumps it on every ORM flush
+    # and adds "AND version = :old" to the UPDATE, so concurrent writers can't
+    # silently overwrite each other. Core (bulk) updates must bump it explicitly.
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+
+    __mapper_args__ = {"version_id_col": version}
 
     # If a user can own multiple businesses, define the relationship:
     businesses = relationship("Business", back_populates="owner")
@@ -23,6 +29,74 @@ class Business(Base):
     name = Column(String, unique=True, index=True, nullable=False)
     is_verified = Column(Boolean, default=False)
     owner_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+
+    __mapper_args__ = {"version_id_col": version}
 
     # Link back to the user
     owner = relationship("User", back_populates="businesses")
+
+
+# ---------------------------------------------------------------------------
+# Synthetic-data tables, filled by scripts/load_scenario.py from the ML
+# generators' scenario directories. The API doesn't read them; they give load
+# tests realistic users, IP links and rings. Kept out of users/businesses so
+# existing databases only gain tables (create_all can't add columns).
+# ---------------------------------------------------------------------------
+class UserProfile(Base):
+    __tablename__ = "user_profiles"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    name = Column(String)
+    username = Column(String)
+    birthdate = Column(Date)
+    gender = Column(String(1))
+    segment = Column(String)
+    device_id = Column(String)
+    phone = Column(String)
+    country_code = Column(String(2))
+    signup_at = Column(DateTime)
+    burst_signup = Column(Boolean)
+    is_ring_leader = Column(Boolean)
+    wave_fraud_boost = Column(Float)
+    fraud_label = Column(SmallInteger)
+
+
+class BusinessProfile(Base):
+    __tablename__ = "business_profiles"
+
+    business_id = Column(Integer, ForeignKey("businesses.id"), primary_key=True)
+    registration_country = Column(String(2))
+    incorporation_date = Column(Date)
+    owner_name = Column(String)
+    fraud_label = Column(SmallInteger)
+
+
+class IPAddress(Base):
+    __tablename__ = "ip_addresses"
+
+    id = Column(Integer, primary_key=True)
+    address = Column(String, index=True, nullable=False)
+    fraud_label = Column(SmallInteger)
+
+
+class UserIP(Base):
+    __tablename__ = "user_ips"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    ip_id = Column(Integer, ForeignKey("ip_addresses.id"), primary_key=True, index=True)
+
+
+class UserLink(Base):
+    __tablename__ = "user_links"
+
+    from_user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    to_user_id = Column(Integer, ForeignKey("users.id"), primary_key=True, index=True)
+
+
+# Generator businesses can have several owners; businesses.owner_id keeps the first
+class BusinessOwner(Base):
+    __tablename__ = "business_owners"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    business_id = Column(Integer, ForeignKey("businesses.id"), primary_key=True, index=True)
@@ -0,0 +1,347 @@
+# backend/app/network.py
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+
+from fastapi import HTTPException
+from kafka import KafkaConsumer
+
+from . import profiler
+from .database import GRAPH_BACKEND, get_driver, get_graph_store
+from .graph_projector import GRAPH_PROJECTED_TOPIC, KAFKA_BOOTSTRAP_SERVERS
+from .resources import registry
+from .serializers import dumps
+
+NETWORK_MAX_DEPTH = int(os.getenv("NETWORK_MAX_DEPTH", "3"))
+# Neighbours expanded per node per hop; hubs (a shared IP, a mule account) get cut off here
+NETWORK_FANOUT_CAP = int(os.getenv("NETWORK_FANOUT_CAP", "50"))
+NETWORK_MAX_NODES = int(os.getenv("NETWORK_MAX_NODES", "500"))
+NETWORK_QUERY_TIMEOUT_SECONDS = float(os.getenv("NETWORK_QUERY_TIMEOUT_SECONDS", "2"))
+NETWORK_CACHE_SIZE = int(os.getenv("NETWORK_CACHE_SIZE", "1024"))
+# Safety net for invalidation events this worker never saw (e.g. while Kafka was down)
+NETWORK_CACHE_TTL_SECONDS = float(os.getenv("NETWORK_CACHE_TTL_SECONDS", "300"))
+
+ROOT_QUERY = """
+MATCH (u:User {userId: $userId})
+RETURN elementId(u) AS eid, labels(u) AS labels, u {.userId, .email, .isVerified} AS props
+"""
+
+# One hop for the whole frontier. The per-node LIMIT inside CALL {} is the fan-out cap
+# (one extra row tells us the cap was hit).
+HOP_QUERY = """
+UNWIND $frontier AS eid
+MATCH (n) WHERE elementId(n) = eid
+CALL {
+    WITH n
+    MATCH (n)-[r:OWNS|USES_IP|LINKED_TO]-(m)
+    RETURN r, m
+    LIMIT $limit
+}
+RETURN eid AS source, type(r) AS type, startNode(r) = n AS outgoing, elementId(m) AS eid_m, labels(m) AS labels,
+       m {.userId, .bizId, .ipId, .email, .name, .address, .isVerified} AS props
+"""
+
+_KEYS = {"User": "userId", "Business": "bizId", "IP": "ipId"}
+
+
+def _node_ref(labels, props):
+    for label in labels:
+        if label in _KEYS:
+            return label, props.get(_KEYS[label])
+    return None
+
+
+class Neo4jReader:
+    """
+    The reader interface `expand` walks: root() -> (handle, labels, props) and
+    hop(frontier, limit) -> (source handle, type, outgoing, handle, labels, props) rows.
+    Handles are element ids here; graph_store.CSRGraph implements the same with indices.
+    """
+
+    def __init__(self, tx):
+        self.tx = tx
+
+    def root(self, user_id: int):
+        record = self.tx.run(ROOT_QUERY, userId=user_id).single()
+        return None if record is None else (record["eid"], record["labels"], record["props"])
+
+    def hop(self, frontier, limit: int):
+        for record in self.tx.run(HOP_QUERY, frontier=frontier, limit=limit):
+            yield (record["source"], record["type"], record["outgoing"], record["eid_m"],
+                   record["labels"], record["props"])
+
+
+def expand(reader, user_id: int, depth: int, fanout: int = NETWORK_FANOUT_CAP, max_nodes: int = NETWORK_MAX_NODES):
+    """
+    Breadth-first expansion from a user, `depth` hops over OWNS, USES_IP and LINKED_TO
+    (with Neo4j, all inside one read transaction). Returns (payload, node refs), or None
+    if the user isn't in the graph. `truncated` is set when a fan-out or node cap cut the result.
+    """
+    root = reader.root(user_id)
+    if root is None:
+        return None
+
+    root_handle, root_labels, root_props = root
+    root_ref = _node_ref(root_labels, root_props)
+    nodes = {root_ref: {"label": root_ref[0], "id": root_ref[1], "depth": 0, "properties": _props(root_props)}}
+    handles = {root_handle: root_ref}
+    edges = set()
+    truncated = False
+    frontier = [root_handle]
+
+    for hop in range(1, depth + 1):
+        if not frontier:
+            break
+        per_source = {}
+        next_frontier = []
+        for source, kind, outgoing, handle, labels, props in reader.hop(frontier, fanout + 1):
+            per_source[source] = per_source.get(source, 0) + 1
+            if per_source[source] > fanout:
+                truncated = True
+                continue
+            ref = _node_ref(labels, props)
+            if ref is None:
+                continue
+            if ref not in nodes:
+                if len(nodes) >= max_nodes:
+                    truncated = True
+                    continue
+                nodes[ref] = {"label": ref[0], "id": ref[1], "depth": hop, "properties": _props(props)}
+                handles[handle] = ref
+                next_frontier.append(handle)
+            a, b = handles[source], ref
+            edges.add((a, b, kind) if outgoing else (b, a, kind))
+        frontier = next_frontier
+
+    return {
+        "user_id": user_id,
+        "depth": depth,
+        "truncated": truncated,
+        "nodes": list(nodes.values()),
+        "edges": [
+            {"source": f"{s[0]}:{s[1]}", "target": f"{t[0]}:{t[1]}", "type": kind}
+            for s, t, kind in sorted(edges, key=lambda e: (e[2], e[0], e[1]))
+        ],
+    }, set(nodes)
+
+
+def _props(props: dict) -> dict:
+    return {key: value for key, value in props.items() if value is not None and key not in ("userId", "bizId", "ipId")}
+
+
+class NetworkCache:
+    """
+    LRU of serialized neighbourhoods keyed by (user_id, depth). Each entry is also
+    indexed by every node it contains, so a projection event touching a node drops
+    exactly the cached neighbourhoods that node appears in.
+    """
+
+    def __init__(self, max_entries: int = NETWORK_CACHE_SIZE, ttl: float = NETWORK_CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (body, nodes, expires_at)
+        self._index = {}               # node ref -> set of keys
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        # Bumped by every invalidation. A result computed across an invalidation of one of
+        # its nodes must not be stored, so recent invalidations are kept to check against.
+        self.generation = 0
+        self._recent = deque(maxlen=1024)  # (generation, node refs)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[2] <= time.monotonic():
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, body: bytes, nodes, generation: int):
+        with self._lock:
+            if self._stale(nodes, generation):
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (body, nodes, time.monotonic() + self.ttl)
+            for node in nodes:
+                self._index.setdefault(node, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, nodes) -> int:
+        with self._lock:
+            keys = set()
+            for node in nodes:
+                keys |= self._index.get(node, set())
+            for key in keys:
+                self._remove(key)
+            self.invalidations += len(keys)
+            self.generation += 1
+            self._recent.append((self.generation, frozenset(nodes)))
+            return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._index.clear()
+            self.generation += 1
+            # Nothing computed before a clear may be stored
+            self._recent.clear()
+            self._recent.append((self.generation, None))
+
+    def _stale(self, nodes, generation: int) -> bool:
+        if generation == self.generation:
+            return False
+        if not self._recent or self._recent[0][0] > generation + 1:
+            return True  # the log no longer reaches back that far
+        for gen, touched in self._recent:
+            if gen > generation and (touched is None or not touched.isdisjoint(nodes)):
+                return True
+        return False
+
+    def _remove(self, key):
+        _, nodes, _ = self._entries.pop(key)
+        for node in nodes:
+            keys = self._index.get(node)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._index[node]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses,
+                    "invalidations": self.invalidations}
+
+
+cache = NetworkCache()
+
+
+def _create_invalidation_consumer():
+    # No group: every worker needs every event, and only new ones matter
+    return KafkaConsumer(
+        GRAPH_PROJECTED_TOPIC,
+        bootstrap_servers=KAFKA_BOOTSTRAP_SERVERS,
+        group_id=None,
+        auto_offset_reset="latest",
+        value_deserializer=lambda v: json.loads(v.decode("utf-8")),
+    )
+
+
+registry.register("network_invalidation_consumer", _create_invalidation_consumer, close=lambda c: c.close())
+
+
+class InvalidationListener:
+    """
+    Background thread that drops cached neighbourhoods when the graph projector reports
+    the nodes it changed. Started on first use of the network endpoint. If the stream
+    breaks, the cache is cleared, since events may have been missed in between.
+    """
+
+    def __init__(self, cache: NetworkCache):
+        self.cache = cache
+        self._thread = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    def start(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._stop.clear()
+                self._thread = profiler.ignore_thread(
+                    threading.Thread(target=self._run, name="network-cache-invalidation", daemon=True)
+                )
+                self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        with self._lock:
+            if self._thread is not None:
+                self._thread.join(timeout=5)
+                self._thread = None
+
+    def _run(self):
+        backoff = 1.0
+        while not self._stop.is_set():
+            try:
+                consumer = registry.get("network_invalidation_consumer")
+                backoff = 1.0
+                while not self._stop.is_set():
+                    for messages in consumer.poll(timeout_ms=1000).values():
+                        for msg in messages:
+                            self.cache.invalidate(invalidated_nodes(msg.value))
+            except Exception as e:
+                print(f"[Network] Invalidation stream failed: {e}; clearing cache")
+                self.cache.clear()
+                registry.close("network_invalidation_consumer")
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, 30.0)
+
+
+def invalidated_nodes(event: dict):
+    """Node refs named by a graph_projected event."""
+    return (
+        [("User", int(i)) for i in event.get("users", ())]
+        + [("Business", int(i)) for i in event.get("businesses", ())]
+        + [("IP", int(i)) for i in event.get("ips", ())]
+    )
+
+
+listener = InvalidationListener(cache)
+
+
+def _query_network(user_id: int, depth: int):
+    if GRAPH_BACKEND == "memory":
+        return expand(get_graph_store(), user_id, depth)
+
+    from neo4j import READ_ACCESS
+
+    # An explicit transaction rather than execute_read: its retry loop would stretch a
+    # timed-out traversal well past the timeout.
+    with get_driver().session(default_access_mode=READ_ACCESS) as session:
+        with session.begin_transaction(timeout=NETWORK_QUERY_TIMEOUT_SECONDS) as tx:
+            return expand(Neo4jReader(tx), user_id, depth)
+
+
+def get_network(user_id: int, depth: int):
+    """
+    Returns (body, cache_status) for a user's neighbourhood. Raises HTTPException
+    404 if the user isn't in the graph (yet), 504 on query timeout, 503 if Neo4j is down.
+    """
+    from neo4j.exceptions import Neo4jError, ServiceUnavailable, SessionExpired
+
+    if GRAPH_BACKEND != "memory":
+        # The in-memory graph is static, so there is nothing to invalidate
+        listener.start()
+    key = (user_id, depth)
+    body = cache.get(key)
+    if body is not None:
+        return body, "HIT"
+
+    generation = cache.generation
+    try:
+        result = _query_network(user_id, depth)
+    except Neo4jError as e:
+        if e.code and "TransactionTimedOut" in e.code:
+            raise HTTPException(status_code=504, detail="Network query timed out.")
+        raise
+    except (ServiceUnavailable, SessionExpired):
+        raise HTTPException(status_code=503, detail="Graph database unavailable.")
+    if result is None:
+        raise HTTPException(status_code=404, detail="User not found in graph.")
+
+    payload, nodes = result
+    body = dumps(payload)
+    cache.put(key, body, nodes, generation)
+    return body, "MISS"
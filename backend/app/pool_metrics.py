@@ -0,0 +1,161 @@
+# backend/app/pool_metrics.py
+
+import threading
+import time
+import weakref
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import QueuePool
+
+# Upper bounds (seconds) of the checkout-wait histogram buckets
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, float("inf"))
+
+
+class PoolStats:
+    """
+    Counters fed by TimedQueuePool and the engine's pool events.
+    A stall that is really pool starvation shows up as growing wait times,
+    overflow checkouts and, eventually, timeouts. Wait times, overflow and
+    timeouts are only measured by TimedQueuePool; other pools (e.g. SQLite's)
+    still count checkouts from the "checkout" event.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.checkouts = 0
+            self.checkins = 0
+            self.connects = 0
+            self.invalidations = 0
+            self.overflow_checkouts = 0
+            self.timeouts = 0
+            self.timed_waits = 0
+            self.wait_seconds_total = 0.0
+            self.wait_seconds_max = 0.0
+            self.wait_buckets = [0] * len(WAIT_BUCKETS)
+
+    def record_checkout(self, waited: float, overflow: bool):
+        with self._lock:
+            self.checkouts += 1
+            if overflow:
+                self.overflow_checkouts += 1
+            self._record_wait(waited)
+
+    def record_timeout(self, waited: float):
+        with self._lock:
+            self.timeouts += 1
+            self._record_wait(waited)
+
+    def _record_wait(self, waited: float):
+        self.timed_waits += 1
+        self.wait_seconds_total += waited
+        if waited > self.wait_seconds_max:
+            self.wait_seconds_max = waited
+        for i, bound in enumerate(WAIT_BUCKETS):
+            if waited <= bound:
+                self.wait_buckets[i] += 1
+                break
+
+    def incr(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            waits = self.timed_waits
+            return {
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "overflow_checkouts": self.overflow_checkouts,
+                "timeouts": self.timeouts,
+                "wait_ms_avg": round(self.wait_seconds_total / waits * 1000, 3) if waits else 0.0,
+                "wait_ms_max": round(self.wait_seconds_max * 1000, 3),
+                "wait_histogram": {
+                    ("+Inf" if bound == float("inf") else f"le_{bound * 1000:g}ms"): count
+                    for bound, count in zip(WAIT_BUCKETS, self.wait_buckets)
+                },
+            }
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection into self.stats."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def recreate(self):
+        # engine.dispose() swaps in a new pool; keep counting into the same stats
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            conn = super().connect()
+        except exc.TimeoutError:
+            self.stats.record_timeout(time.perf_counter() - start)
+            raise
+        self.stats.record_checkout(time.perf_counter() - start, overflow=self.checkedout() > self.size())
+        return conn
+
+
+# Each engine (primary and every replica) counts into its own PoolStats
+_engine_stats = weakref.WeakKeyDictionary()
+
+
+def instrument_engine(engine) -> PoolStats:
+    """Attach pool event hooks that feed this engine's own PoolStats, and return it."""
+    timed = isinstance(engine.pool, TimedQueuePool)
+    stats = engine.pool.stats if timed else PoolStats()
+    _engine_stats[engine] = stats
+
+    if not timed:
+        # TimedQueuePool.connect() already counts checkouts, with their wait
+        @event.listens_for(engine, "checkout")
+        def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+            stats.incr("checkouts")
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        stats.incr("connects")
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        stats.incr("checkins")
+
+    @event.listens_for(engine, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        stats.incr("invalidations")
+
+    return stats
+
+
+def stats_for(engine) -> PoolStats:
+    """The engine's PoolStats (empty if it was never instrumented)."""
+    stats = _engine_stats.get(engine)
+    if stats is None:
+        stats = engine.pool.stats if isinstance(engine.pool, TimedQueuePool) else PoolStats()
+    return stats
+
+
+def pool_status(engine) -> dict:
+    """Live pool gauges plus the accumulated counters."""
+    pool = engine.pool
+    status = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update({
+            "size": pool.size(),
+            "max_overflow": pool._max_overflow,
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": pool.overflow(),
+        })
+    status.update(stats_for(engine).snapshot())
+    return status
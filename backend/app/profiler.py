@@ -0,0 +1,151 @@
+# backend/app/profiler.py
+
+import itertools
+import os
+import random
+import sys
+import threading
+import time
+import weakref
+from collections import Counter
+
+from starlette.concurrency import run_in_threadpool
+
+from . import admin_auth
+
+# Profiling is off unless ADMIN_TOKEN or a sample rate is set; with neither the middleware isn't installed
+PROFILER_SAMPLE_RATE = float(os.getenv("PROFILER_SAMPLE_RATE", "0"))
+PROFILER_INTERVAL_MS = float(os.getenv("PROFILER_INTERVAL_MS", "5"))
+PROFILER_OUTPUT_DIR = os.getenv("PROFILER_OUTPUT_DIR", "/tmp/verishield-profiles")
+PROFILER_MAX_WINDOW_SECONDS = 60
+
+PROFILER_ENABLED = bool(admin_auth.ADMIN_TOKEN) or PROFILER_SAMPLE_RATE > 0
+
+# Stacks without a frame from the app package are idle threads (pool waits, Kafka IO loop, ...)
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+# Our own long-lived background threads (probers, listeners, ...), which would otherwise count as app code
+_background_threads = weakref.WeakSet()
+# Keeps profile file names unique when requests finish within the same second
+_profile_ids = itertools.count(1)
+
+
+def ignore_thread(thread: threading.Thread) -> threading.Thread:
+    """Leaves one of our own background threads out of every profile; returns the thread."""
+    _background_threads.add(thread)
+    return thread
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+
+class StackSampler:
+    """
+    Samples the stacks of all other threads every `interval` seconds using
+    sys._current_frames() and counts them in collapsed form
+    ("thread;outer;...;leaf"), which flamegraph.pl, speedscope and similar
+    tools read directly. No tracing hooks are installed, so the profiled code
+    runs unmodified; the cost is one sampler thread waking up per interval.
+    """
+
+    def __init__(self, interval: float = PROFILER_INTERVAL_MS / 1000, app_only: bool = True):
+        self.interval = interval
+        self.app_only = app_only
+        self.samples = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample_once(self, own_ident: int):
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        ignored = {thread.ident for thread in list(_background_threads)}
+        ignored.add(own_ident)
+        for ident, frame in sys._current_frames().items():
+            if ident in ignored:
+                continue
+            name = names.get(ident, f"thread-{ident}")
+            stack = []
+            in_app = False
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                if not in_app and frame.f_code.co_filename.startswith(APP_DIR):
+                    in_app = True
+                frame = frame.f_back
+            if self.app_only and not in_app:
+                continue
+            stack.append(name)
+            self.samples[";".join(reversed(stack))] += 1
+
+    def _run(self):
+        own_ident = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            self._sample_once(own_ident)
+
+    def start(self):
+        self._thread = ignore_thread(threading.Thread(target=self._run, name="stack-sampler", daemon=True))
+        self._thread.start()
+        return self
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return self.samples
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+
+def profile_window(seconds: float, app_only: bool = True) -> str:
+    """Samples the whole worker for a fixed window and returns collapsed stacks."""
+    sampler = StackSampler(app_only=app_only).start()
+    time.sleep(min(seconds, PROFILER_MAX_WINDOW_SECONDS))
+    sampler.stop()
+    return sampler.collapsed()
+
+
+class ProfilerMiddleware:
+    """
+    Profiles a request when it carries a valid X-Admin-Token header, or at
+    random with probability PROFILER_SAMPLE_RATE. The collapsed stacks are
+    written to PROFILER_OUTPUT_DIR and the file name is returned in the
+    X-Profile-File response header. Concurrent requests on the same worker
+    also show up in the samples, under their own thread names.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        os.makedirs(PROFILER_OUTPUT_DIR, exist_ok=True)
+
+    def _should_profile(self, scope) -> bool:
+        if admin_auth.ADMIN_TOKEN:
+            for name, value in scope["headers"]:
+                if name == admin_auth.ADMIN_TOKEN_HEADER.encode():
+                    return admin_auth.token_matches(value.decode("latin-1"))
+        return PROFILER_SAMPLE_RATE > 0 and random.random() < PROFILER_SAMPLE_RATE
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith("/admin/") or not self._should_profile(scope):
+            return await self.app(scope, receive, send)
+
+        safe_path = scope["path"].strip("/").replace("/", "_") or "root"
+        filename = (f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{next(_profile_ids)}"
+                    f"-{scope['method']}-{safe_path}.collapsed")
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [(b"x-profile-file", filename.encode())]
+            await send(message)
+
+        sampler = StackSampler().start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            sampler.stop()
+            # Off the event loop: a slow disk must not stall the other requests
+            await run_in_threadpool(_write_profile, filename, sampler.collapsed())
+
+
+def _write_profile(filename: str, collapsed: str):
+    with open(os.path.join(PROFILER_OUTPUT_DIR, filename), "w") as f:
+        f.write(collapsed)
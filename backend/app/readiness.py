@@ -0,0 +1,103 @@
+# backend/app/readiness.py
+
+import os
+import threading
+import time
+
+from sqlalchemy import text
+
+from . import profiler
+from .database import GRAPH_BACKEND, engine, get_driver, get_graph_store
+from .kafka_producer import get_producer
+
+READINESS_INTERVAL = float(os.getenv("READINESS_INTERVAL", "5"))
+# Dependencies that must be up for /ready to return 200
+READINESS_REQUIRED = [
+    name.strip() for name in os.getenv("READINESS_REQUIRED", "postgres,neo4j,kafka").split(",") if name.strip()
+]
+
+
+def check_postgres():
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+
+def check_neo4j():
+    if GRAPH_BACKEND == "memory":
+        # The first probe also loads the graph, so it's warm before traffic arrives
+        get_graph_store()
+        return
+    get_driver().verify_connectivity()
+
+
+def check_kafka():
+    if not get_producer().bootstrap_connected():
+        raise RuntimeError("producer is not connected to any bootstrap server")
+
+
+CHECKS = {
+    "postgres": check_postgres,
+    "neo4j": check_neo4j,
+    "kafka": check_kafka,
+}
+
+
+class ReadinessProber:
+    """
+    Probes each dependency on its own background thread every `interval` seconds
+    and keeps the latest result. /ready only reads those cached results, so probe
+    traffic to Postgres/Neo4j/Kafka is bounded by the interval, not the probe rate,
+    and one hanging dependency can't delay the others.
+    """
+
+    def __init__(self, checks: dict, interval: float = READINESS_INTERVAL, required=None):
+        self.checks = checks
+        self.interval = interval
+        self.required = list(checks) if required is None else [name for name in required if name in checks]
+        self.results = {
+            name: {"status": "unknown", "latency_ms": None, "checked_at": None, "error": None}
+            for name in checks
+        }
+        self._stop = threading.Event()
+        self._threads = []
+
+    def probe(self, name: str):
+        start = time.perf_counter()
+        try:
+            self.checks[name]()
+            result = {"status": "up", "error": None}
+        except Exception as e:
+            result = {"status": "down", "error": f"{type(e).__name__}: {e}"}
+        result["latency_ms"] = round((time.perf_counter() - start) * 1000, 3)
+        result["checked_at"] = time.time()
+        # Replace rather than mutate so readers always see a complete result
+        self.results[name] = result
+
+    def _loop(self, name: str):
+        while not self._stop.is_set():
+            self.probe(name)
+            self._stop.wait(self.interval)
+
+    def start(self):
+        if self._threads:
+            return
+        self._stop.clear()
+        for name in self.checks:
+            thread = profiler.ignore_thread(
+                threading.Thread(target=self._loop, args=(name,), name=f"readiness-{name}", daemon=True)
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self):
+        self._stop.set()
+        self._threads = []
+
+    def snapshot(self):
+        """Returns (ready, per-dependency results) from the cached probe results."""
+        results = dict(self.results)
+        ready = all(results[name]["status"] == "up" for name in self.required)
+        return ready, results
+
+
+prober = ReadinessProber(CHECKS, required=READINESS_REQUIRED)
@@ -0,0 +1,142 @@
+# backend/app/replicas.py
+
+import itertools
+import os
+import threading
+import time
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session, sessionmaker
+
+from . import profiler
+from .database import SessionLocal, replica_engines
+from .pool_metrics import pool_status
+
+# Replicas lagging more than this are skipped in favour of the primary
+REPLICA_MAX_LAG_SECONDS = float(os.getenv("DB_REPLICA_MAX_LAG_SECONDS", "5"))
+# How often each replica's lag is re-checked (on a background thread, never on a request)
+REPLICA_CHECK_INTERVAL = float(os.getenv("DB_REPLICA_CHECK_INTERVAL", "2"))
+# After a write, the same client reads from the primary for this long
+READ_YOUR_WRITES_SECONDS = float(os.getenv("DB_READ_YOUR_WRITES_SECONDS", "5"))
+STICKY_COOKIE = "vs_primary_until"
+
+# 0 when the replica has replayed everything it received, otherwise seconds since the last replay
+_PG_LAG_QUERY = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+class _Replica:
+    def __init__(self, engine):
+        self.engine = engine
+        self.sessionmaker = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        self.lag = 0.0
+        # Not used for reads until the first lag check has succeeded
+        self.healthy = False
+        self.checked_at = None
+
+
+class ReplicaRouter:
+    """
+    Hands out sessions for read-only handlers. Replicas are used round-robin,
+    skipping any that are unreachable or lag more than REPLICA_MAX_LAG_SECONDS;
+    if none qualify (or none are configured) reads fall back to the primary.
+
+    Lag is measured on background threads every `check_interval` seconds (see
+    start()), so a dead replica only costs its checker thread the connect timeout;
+    requests just read the last result.
+    """
+
+    def __init__(self, primary_sessionmaker, engines, max_lag=REPLICA_MAX_LAG_SECONDS,
+                 check_interval=REPLICA_CHECK_INTERVAL):
+        self.primary_sessionmaker = primary_sessionmaker
+        self.replicas = [_Replica(engine) for engine in engines]
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self._next = itertools.count()
+        self._stop = threading.Event()
+        self._threads = []
+
+    @property
+    def has_replicas(self) -> bool:
+        return bool(self.replicas)
+
+    def _measure_lag(self, engine) -> float:
+        if engine.dialect.name != "postgresql":
+            # SQLite files (or other stand-ins) used in tests have no replication lag
+            return 0.0
+        with engine.connect() as conn:
+            return float(conn.execute(_PG_LAG_QUERY).scalar() or 0.0)
+
+    def check(self, replica: _Replica):
+        try:
+            replica.lag = self._measure_lag(replica.engine)
+            replica.healthy = True
+        except Exception as e:
+            if replica.healthy or replica.checked_at is None:
+                print(f"[Replicas] Lag check failed for {replica.engine.url!r}: {e}")
+            replica.healthy = False
+        replica.checked_at = time.time()
+
+    def check_all(self):
+        for replica in self.replicas:
+            self.check(replica)
+
+    def _loop(self, replica: _Replica):
+        while not self._stop.is_set():
+            self.check(replica)
+            self._stop.wait(self.check_interval)
+
+    def start(self):
+        """One checker thread per replica, so a hanging replica can't delay the others' checks."""
+        if self._threads:
+            return
+        self._stop.clear()
+        for i, replica in enumerate(self.replicas):
+            thread = profiler.ignore_thread(
+                threading.Thread(target=self._loop, args=(replica,), name=f"replica-lag-{i}", daemon=True)
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self):
+        self._stop.set()
+        self._threads = []
+
+    def _is_usable(self, replica: _Replica) -> bool:
+        return replica.healthy and replica.lag <= self.max_lag
+
+    def read_session(self, pin_to_primary: bool = False) -> Session:
+        if pin_to_primary or not self.replicas:
+            return self.primary_sessionmaker()
+        start = next(self._next)
+        for i in range(len(self.replicas)):
+            replica = self.replicas[(start + i) % len(self.replicas)]
+            if self._is_usable(replica):
+                return replica.sessionmaker()
+        return self.primary_sessionmaker()
+
+    def status(self) -> list:
+        return [
+            {"url": repr(r.engine.url), "healthy": r.healthy, "lag_seconds": r.lag,
+             "checked_at": r.checked_at, "pool": pool_status(r.engine)}
+            for r in self.replicas
+        ]
+
+
+router = ReplicaRouter(SessionLocal, replica_engines)
+
+
+def is_pinned_to_primary(cookies) -> bool:
+    """True if this client wrote recently and must read its own writes."""
+    try:
+        return float(cookies.get(STICKY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+def pin_to_primary(response):
+    """Marks the client so its next reads, for READ_YOUR_WRITES_SECONDS, go to the primary."""
+    until = time.time() + READ_YOUR_WRITES_SECONDS
+    response.set_cookie(STICKY_COOKIE, f"{until:.3f}", max_age=int(READ_YOUR_WRITES_SECONDS) + 1, httponly=True)
@@ -0,0 +1,66 @@
+# backend/app/resources.py
+
+import os
+import threading
+import time
+
+
+class ResourceRegistry:
+    """
+    Process-wide registry of lazily created clients (Neo4j driver, Kafka producers/consumers).
+
+    Factories are registered at import time but nothing connects until the first get().
+    Each client is created once per process (a forked worker re-creates its own instead
+    of inheriting the parent's sockets) and close_all() shuts them down on app shutdown.
+    """
+
+    def __init__(self):
+        self._factories = {}
+        self._instances = {}
+        self._lock = threading.Lock()
+        # name -> seconds spent in the factory, for cold-start reporting
+        self.timings = {}
+
+    def register(self, name: str, factory, close=None):
+        """Register a zero-arg factory and an optional close(instance) callback."""
+        self._factories[name] = (factory, close)
+
+    def get(self, name: str):
+        entry = self._instances.get(name)
+        if entry is not None and entry[1] == os.getpid():
+            return entry[0]
+
+        with self._lock:
+            entry = self._instances.get(name)
+            if entry is not None and entry[1] == os.getpid():
+                return entry[0]
+            factory, _ = self._factories[name]
+            start = time.perf_counter()
+            instance = factory()
+            self.timings[name] = time.perf_counter() - start
+            self._instances[name] = (instance, os.getpid())
+            return instance
+
+    def is_initialized(self, name: str) -> bool:
+        entry = self._instances.get(name)
+        return entry is not None and entry[1] == os.getpid()
+
+    def close(self, name: str):
+        with self._lock:
+            entry = self._instances.pop(name, None)
+        if entry is None or entry[1] != os.getpid():
+            return
+        _, close = self._factories[name]
+        if close is None:
+            return
+        try:
+            close(entry[0])
+        except Exception as e:
+            print(f"[Resources] Error closing {name}: {e}")
+
+    def close_all(self):
+        for name in list(self._instances):
+            self.close(name)
+
+
+registry = ResourceRegistry()
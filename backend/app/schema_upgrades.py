@@ -0,0 +1,70 @@
+# backend/app/schema_upgrades.py
+"""
+In-place upgrades for databases created by an older version of the models.
+
+Base.metadata.create_all() creates missing tables but never adds columns to
+existing ones. A database created before row versions existed has no
+users.version / businesses.version, and every ORM query on those tables then
+fails with "column users.version does not exist". upgrade_schema() adds such
+columns. It only ever adds, is safe to run repeatedly, and runs at startup right
+after create_all, so several workers booting against the same old database may
+run it at once: on PostgreSQL the ALTER uses ADD COLUMN IF NOT EXISTS, elsewhere a
+failed ALTER is forgiven when the column turns out to exist (another worker won).
+
+To upgrade by hand (e.g. before rolling out a new image), from backend/:
+    python -m app.schema_upgrades
+"""
+
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import DBAPIError
+
+# (table, column, column DDL): applied in order when the table exists without the column
+COLUMN_UPGRADES = [
+    ("users", "version", "INTEGER NOT NULL DEFAULT 1"),
+    ("businesses", "version", "INTEGER NOT NULL DEFAULT 1"),
+]
+
+
+def missing_columns(engine) -> list:
+    """The upgrades in COLUMN_UPGRADES that this database still needs."""
+    inspector = inspect(engine)
+    tables = set(inspector.get_table_names())
+    missing = []
+    for table, column, ddl in COLUMN_UPGRADES:
+        if table in tables and column not in {c["name"] for c in inspector.get_columns(table)}:
+            missing.append((table, column, ddl))
+    return missing
+
+
+def _has_column(engine, table, column) -> bool:
+    return column in {c["name"] for c in inspect(engine).get_columns(table)}
+
+
+def upgrade_schema(engine) -> list:
+    """
+    Adds missing columns; returns the "table.column" names this call added (on
+    PostgreSQL, also any that a concurrent worker added first).
+    """
+    added = []
+    if_not_exists = "IF NOT EXISTS " if engine.dialect.name == "postgresql" else ""
+    # One transaction per column, so losing a race on one doesn't undo the others
+    for table, column, ddl in missing_columns(engine):
+        try:
+            with engine.begin() as conn:
+                conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {if_not_exists}{column} {ddl}"))
+        except DBAPIError:
+            if not _has_column(engine, table, column):
+                raise
+            continue  # added by another process since missing_columns() looked
+        added.append(f"{table}.{column}")
+    if added:
+        print(f"[Schema] Added {', '.join(added)}")
+    return added
+
+
+if __name__ == "__main__":
+    from .database import Base, engine
+
+    Base.metadata.create_all(bind=engine)
+    if not upgrade_schema(engine):
+        print("[Schema] Up to date")
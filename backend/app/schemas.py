@@ -1,6 +1,6 @@
 # backend/app/schemas.py
 
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, conlist
 
 # ---------------------
 #  User Schemas
@@ -34,3 +34,11 @@ class BusinessRead(BusinessBase):
 
     class Config:
         orm_mode = True
+
+
+# ---------------------
+#  Bulk Verification
+# ---------------------
+class BulkVerificationRequest(BaseModel):
+    ids: conlist(int, min_items=1, max_items=10000)
+    verified: bool = True
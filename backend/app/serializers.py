@@ -0,0 +1,83 @@
+# backend/app/serializers.py
+
+import json
+import os
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
+from pydantic.json import pydantic_encoder
+
+from . import schemas
+
+# Opt-in fast path: orjson as the default response class, plus precompiled
+# serializers that render trusted ORM rows without re-validating them.
+FAST_JSON = os.getenv("FAST_JSON_RESPONSES", "false").lower() in ("1", "true", "yes")
+
+# Field types that can be copied straight off an ORM row into JSON
+_PLAIN_TYPES = (int, float, str, bool)
+
+
+def dumps(content) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content)
+    # pydantic_encoder covers what orjson handles natively (datetimes, UUIDs, ...)
+    return json.dumps(content, separators=(",", ":"), default=pydantic_encoder).encode("utf-8")
+
+
+def default_response_class():
+    if FAST_JSON and orjson is not None:
+        return ORJSONResponse
+    return JSONResponse
+
+
+class ORMSerializer:
+    """
+    Built once per response schema. Resolves the field list up front so rendering
+    a row is a single dict comprehension plus one encoder call, instead of
+    from_orm() validation, jsonable_encoder and stdlib json on every response.
+
+    Only use this for rows loaded from our own DB; schemas with non-plain fields
+    (nested models, dates, ...) fall back to regular from_orm() validation.
+    """
+
+    def __init__(self, schema):
+        self.schema = schema
+        self._fields = tuple((field.alias, name) for name, field in schema.__fields__.items())
+        self._trusted = all(
+            isinstance(field.outer_type_, type) and issubclass(field.outer_type_, _PLAIN_TYPES)
+            for field in schema.__fields__.values()
+        )
+        # A NULL in one of these (e.g. is_verified on a row inserted outside the ORM)
+        # must fail validation like response_model does, not render as null
+        self._not_null = tuple(field.alias for field in schema.__fields__.values() if not field.allow_none)
+
+    def to_dict(self, obj) -> dict:
+        if self._trusted:
+            row = {alias: getattr(obj, name) for alias, name in self._fields}
+            if all(row[alias] is not None for alias in self._not_null):
+                return row
+        return self.schema.from_orm(obj).dict(by_alias=True)
+
+    def response(self, obj, status_code: int = 200, headers: dict = None) -> Response:
+        return Response(
+            content=dumps(self.to_dict(obj)),
+            status_code=status_code,
+            headers=headers,
+            media_type="application/json",
+        )
+
+    def response_many(self, objs, status_code: int = 200, headers: dict = None) -> Response:
+        return Response(
+            content=dumps([self.to_dict(obj) for obj in objs]),
+            status_code=status_code,
+            headers=headers,
+            media_type="application/json",
+        )
+
+
+user_read = ORMSerializer(schemas.UserRead)
+business_read = ORMSerializer(schemas.BusinessRead)
@@ -0,0 +1,227 @@
+# backend/app/slow_queries.py
+
+import os
+import queue
+import re
+import threading
+import time
+
+from sqlalchemy import event
+
+from . import profiler
+from .metrics import current_route
+
+# Statements slower than this are logged and aggregated; 0 disables the recorder
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "200"))
+# Re-capture a fingerprint's plan at most this often (plans drift as tables grow)
+SLOW_QUERY_PLAN_TTL_SECONDS = float(os.getenv("SLOW_QUERY_PLAN_TTL_SECONDS", "600"))
+
+_WHITESPACE = re.compile(r"\s+")
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%\([^)]+\)s|%s|\?|(?<![:\w]):[a-zA-Z_]\w*|\$\d+")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+# Only DML has a plan worth capturing (DDL/PRAGMA are skipped)
+_EXPLAINABLE = re.compile(r"^\s*(SELECT|INSERT|UPDATE|DELETE|WITH)\b", re.IGNORECASE)
+
+
+def fingerprint(statement: str) -> str:
+    """
+    Normalizes a statement so executions that differ only in values (or in the
+    length of an expanded IN list) aggregate together.
+    """
+    normalized = _WHITESPACE.sub(" ", statement).strip()
+    normalized = _STRING_LITERAL.sub("?", normalized)
+    normalized = _PLACEHOLDER.sub("?", normalized)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    return _PLACEHOLDER_LIST.sub("(?...)", normalized)
+
+
+def redact(parameters):
+    """Keeps parameter names and types, never values (emails, hashes, ...)."""
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+class SlowQueryLog:
+    """
+    Aggregates slow statements per fingerprint and captures their plans on a
+    background thread, so the request that ran the slow query never waits for
+    the EXPLAIN.
+    """
+
+    def __init__(self, threshold_ms: float = SLOW_QUERY_THRESHOLD_MS, plan_ttl: float = SLOW_QUERY_PLAN_TTL_SECONDS):
+        self.threshold = threshold_ms / 1000
+        self.plan_ttl = plan_ttl
+        self.entries = {}
+        self._lock = threading.Lock()
+        self._plans = queue.Queue(maxsize=100)
+        self._worker = None
+
+    def record(self, engine, statement: str, parameters, elapsed: float, executemany: bool):
+        key = fingerprint(statement)
+        now = time.time()
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                entry = self.entries[key] = {
+                    "fingerprint": key,
+                    "count": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "routes": set(),
+                    "last_seen": None,
+                    "last_parameters": None,
+                    "plan": None,
+                    "plan_captured_at": 0.0,
+                }
+            entry["count"] += 1
+            entry["total_ms"] += elapsed * 1000
+            entry["max_ms"] = max(entry["max_ms"], elapsed * 1000)
+            entry["routes"].add(current_route())
+            entry["last_seen"] = now
+            entry["last_parameters"] = redact(parameters)
+            want_plan = (
+                not executemany
+                and _EXPLAINABLE.match(statement) is not None
+                and now - entry["plan_captured_at"] >= self.plan_ttl
+            )
+            if want_plan:
+                # Claim the capture now so concurrent slow executions don't queue duplicates
+                entry["plan_captured_at"] = now
+
+        print(f"[SlowQuery] {elapsed * 1000:.1f} ms route={current_route()} "
+              f"params={redact(parameters)} sql={_WHITESPACE.sub(' ', statement).strip()}")
+        if want_plan:
+            self._enqueue_plan(engine, key, statement, parameters)
+
+    def _enqueue_plan(self, engine, key, statement, parameters):
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = profiler.ignore_thread(
+                threading.Thread(target=self._explain_loop, name="slow-query-explain", daemon=True)
+            )
+            self._worker.start()
+        try:
+            self._plans.put_nowait((engine, key, statement, parameters))
+        except queue.Full:
+            pass  # shed plan captures rather than build a backlog
+
+    def _explain_loop(self):
+        while True:
+            engine, key, statement, parameters = self._plans.get()
+            try:
+                plan = explain(engine, statement, parameters)
+            except Exception as e:
+                plan = f"EXPLAIN failed: {type(e).__name__}: {e}"
+            with self._lock:
+                if key in self.entries:
+                    self.entries[key]["plan"] = plan
+
+    def report(self) -> list:
+        with self._lock:
+            rows = [
+                {**entry, "routes": sorted(entry["routes"]),
+                 "mean_ms": round(entry["total_ms"] / entry["count"], 3),
+                 "total_ms": round(entry["total_ms"], 3), "max_ms": round(entry["max_ms"], 3)}
+                for entry in self.entries.values()
+            ]
+        return sorted(rows, key=lambda row: row["total_ms"], reverse=True)
+
+    def reset(self):
+        with self._lock:
+            self.entries.clear()
+
+
+# DBAPI placeholders (pyformat/format) and the %% escape, as psycopg2 sends them
+_PYFORMAT = re.compile(r"%%|%\(([^)]+)\)s|%s")
+_PREPARED_PLAN_NAME = "verishield_slow_query_plan"
+
+
+def numbered_placeholders(statement: str):
+    """
+    Rewrites %(name)s / %s placeholders to Postgres $1, $2, ... (a repeated name
+    reuses its number) and unescapes %%. Returns (statement, placeholder count).
+    """
+    numbers = {}
+    positional = [0]
+
+    def _replace(match):
+        if match.group(0) == "%%":
+            return "%"
+        if match.group(1) is None:
+            positional[0] += 1
+            key = ("positional", positional[0])
+        else:
+            key = match.group(1)
+        numbers.setdefault(key, len(numbers) + 1)
+        return f"${numbers[key]}"
+
+    return _PYFORMAT.sub(_replace, statement), len(numbers)
+
+
+def redact_plan(plan: str) -> str:
+    """Replaces quoted literals in plan text (e.g. Filter: (email = 'x@y'::text)) with ?."""
+    return _STRING_LITERAL.sub("?", plan)
+
+
+def _postgres_generic_plan(conn, statement: str) -> list:
+    """
+    The plan for the statement's placeholders ($1, $2, ...), not for the values of
+    the slow execution: psycopg2 inlines parameters client-side, so a plain EXPLAIN
+    with them would print the values in Index Cond / Filter lines.
+    """
+    generic, count = numbered_placeholders(statement)
+    if conn.dialect.server_version_info >= (16,):
+        return conn.exec_driver_sql("EXPLAIN (GENERIC_PLAN) " + generic).fetchall()
+    # Before 16: prepare it and force the generic plan; the NULLs are never planned for
+    conn.exec_driver_sql("SET LOCAL plan_cache_mode = force_generic_plan")
+    conn.exec_driver_sql(f"PREPARE {_PREPARED_PLAN_NAME} AS {generic}")
+    try:
+        args = f"({', '.join(['NULL'] * count)})" if count else ""
+        return conn.exec_driver_sql(f"EXPLAIN EXECUTE {_PREPARED_PLAN_NAME}{args}").fetchall()
+    finally:
+        conn.rollback()
+        conn.exec_driver_sql(f"DEALLOCATE {_PREPARED_PLAN_NAME}")
+
+
+def explain(engine, statement: str, parameters) -> str:
+    """
+    Plan (never executes: no ANALYZE) for a statement, in the dialect's own format.
+    Parameter values never end up in it: Postgres gets a generic plan, SQLite's
+    EXPLAIN QUERY PLAN doesn't print values, and quoted literals are redacted from
+    whatever comes back.
+    """
+    with engine.connect() as conn:
+        # Keep the EXPLAIN itself out of the slow-query log (info outlives this checkout)
+        conn.info["skip_slow_query_log"] = True
+        try:
+            if engine.dialect.name == "postgresql":
+                rows = _postgres_generic_plan(conn, statement)
+            elif engine.dialect.name == "sqlite":
+                rows = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).fetchall()
+            else:
+                rows = conn.exec_driver_sql("EXPLAIN " + statement, parameters).fetchall()
+        finally:
+            conn.info.pop("skip_slow_query_log", None)
+    return redact_plan("\n".join(" ".join(str(col) for col in row) for row in rows))
+
+
+slow_query_log = SlowQueryLog()
+
+
+def instrument_slow_queries(engine, log: SlowQueryLog = slow_query_log):
+    if log.threshold <= 0:
+        return
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("slow_query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["slow_query_start"].pop()
+        if elapsed >= log.threshold and not conn.info.get("skip_slow_query_log"):
+            log.record(engine, statement, parameters, elapsed, executemany)
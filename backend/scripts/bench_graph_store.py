@@ -0,0 +1,71 @@
+"""
+bench_graph_store.py
+
+Builds an in-memory CSRGraph of generator-like shape (40% of users own 1-10
+businesses, every user has one IP with 20% collisions, 0.5% ring leaders with
+5-15 links) and times the build, single-node neighbour lookups and the same
+k-hop expansion the /users/{id}/network endpoint runs.
+
+Usage:
+    python bench_graph_store.py              # 1M users
+    python bench_graph_store.py 100000
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+# Adjust Python path to recognize 'app' package if needed
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.graph_store import CSRGraph
+from app.network import expand
+
+
+def synthetic_edges(num_users, num_businesses, num_ips, rng):
+    owners = np.flatnonzero(rng.random(num_users) < 0.4) + 1
+    counts = rng.integers(1, 11, len(owners))
+    owns = np.column_stack([np.repeat(owners, counts), rng.integers(1, num_businesses + 1, counts.sum())])
+
+    ips = rng.integers(1, num_ips + 1, num_users)
+    colliding = int(num_users * 0.2)
+    ips[:colliding] = rng.choice(rng.integers(1, num_ips + 1, 500), colliding)
+    uses_ip = np.column_stack([np.arange(1, num_users + 1), ips])
+
+    leaders = rng.choice(num_users, max(1, num_users // 200), replace=False) + 1
+    links = rng.integers(5, 16, len(leaders))
+    linked_to = np.column_stack([np.repeat(leaders, links), rng.integers(1, num_users + 1, links.sum())])
+    return owns, uses_ip, linked_to
+
+
+def main(num_users=1_000_000):
+    rng = np.random.default_rng(0)
+    num_businesses, num_ips = num_users // 10, num_users // 20
+    owns, uses_ip, linked_to = synthetic_edges(num_users, num_businesses, num_ips, rng)
+
+    start = time.perf_counter()
+    graph = CSRGraph(
+        np.arange(1, num_users + 1), np.arange(1, num_businesses + 1), np.arange(1, num_ips + 1),
+        owns=owns, uses_ip=uses_ip, linked_to=linked_to,
+    )
+    build = time.perf_counter() - start
+    print(f"Build: {graph.num_nodes:,d} nodes, {graph.num_edges:,d} edges in {build:.2f}s")
+
+    sample = rng.integers(1, num_users + 1, 2000)
+    for label, fn in (
+        ("neighbors", lambda u: graph.neighbors("User", int(u))),
+        ("shared IP", lambda u: graph.shared(int(u))),
+        ("2-hop expand", lambda u: expand(graph, int(u), 2)),
+        ("3-hop expand", lambda u: expand(graph, int(u), 3)),
+    ):
+        start = time.perf_counter()
+        for user_id in sample:
+            fn(user_id)
+        per_call = (time.perf_counter() - start) / len(sample)
+        print(f"{label:>13}: {per_call * 1e6:8.1f} us/call")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
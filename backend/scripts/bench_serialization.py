@@ -0,0 +1,67 @@
+"""
+bench_serialization.py
+
+Micro-benchmark for the response serialization path of the read endpoints.
+Compares what FastAPI does for a `response_model=schemas.UserRead` handler
+(from_orm validation -> jsonable_encoder -> stdlib json) against the
+precompiled serializers in app.serializers (direct field copy -> orjson).
+
+No database is needed: the rows are transient ORM objects.
+
+Usage:
+    python bench_serialization.py            # 100k iterations
+    python bench_serialization.py 500000
+"""
+
+import sys
+import os
+import json
+import timeit
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+# Adjust Python path to recognize 'app' package if needed
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app import schemas, serializers
+from app.models import User, Business
+
+
+def default_path(schema, obj) -> bytes:
+    model = schema.from_orm(obj)
+    return JSONResponse(content=jsonable_encoder(model)).body
+
+
+def fast_path(serializer, obj) -> bytes:
+    return serializer.response(obj).body
+
+
+def bench(label, fn, number):
+    seconds = min(timeit.repeat(fn, number=number, repeat=3))
+    per_call_us = seconds / number * 1e6
+    print(f"  {label:<28} {per_call_us:8.2f} us/response")
+    return per_call_us
+
+
+def main(number=100_000):
+    user = User(id=42, email="bench@example.com", password_hash="x", is_verified=True, version=3)
+    biz = Business(id=7, name="Bench Corp", is_verified=False, owner_id=42, version=1)
+
+    # Both paths must produce the same payload
+    assert json.loads(default_path(schemas.UserRead, user)) == json.loads(fast_path(serializers.user_read, user))
+
+    encoder = "orjson" if serializers.orjson is not None else "stdlib json"
+    print(f"Serializing {number} responses per run (fast path encoder: {encoder})")
+    for label, schema, serializer, obj in (
+        ("UserRead", schemas.UserRead, serializers.user_read, user),
+        ("BusinessRead", schemas.BusinessRead, serializers.business_read, biz),
+    ):
+        print(label)
+        slow = bench("from_orm + jsonable_encoder", lambda: default_path(schema, obj), number)
+        fast = bench("precompiled serializer", lambda: fast_path(serializer, obj), number)
+        print(f"  saving: {slow - fast:.2f} us/response ({slow / fast:.1f}x)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,76 @@
+"""
+bench_startup.py
+
+Reports import-time and cold-start timings for the backend modules.
+Each measurement runs in a fresh interpreter so module caches don't skew it.
+
+    python bench_startup.py
+
+Import timings should not depend on whether Postgres, Neo4j or Kafka are
+reachable: clients are created lazily through app.resources.registry.
+The "first use" rows do try to construct the clients and report either the
+creation time or the error (e.g. NoBrokersAvailable when Kafka is down).
+"""
+
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+IMPORT_TARGETS = [
+    "app.database",
+    "app.kafka_producer",
+    "app.kafka_consumer",
+    "app.main",
+]
+
+SNIPPET_IMPORT = """
+import time
+start = time.perf_counter()
+import {module}
+print(f"{{(time.perf_counter() - start) * 1000:.1f}}")
+"""
+
+SNIPPET_FIRST_USE = """
+import time
+from app.resources import registry
+import {module}
+start = time.perf_counter()
+try:
+    registry.get("{resource}")
+    result = f"{{(time.perf_counter() - start) * 1000:.1f}} ms"
+except Exception as e:
+    result = f"failed after {{(time.perf_counter() - start) * 1000:.1f}} ms ({{type(e).__name__}})"
+print(result)
+registry.close_all()
+"""
+
+FIRST_USE_TARGETS = [
+    ("app.database", "neo4j_driver"),
+    ("app.kafka_producer", "kafka_producer"),
+]
+
+
+def run(code):
+    proc = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=BACKEND_DIR, capture_output=True, text=True, timeout=120,
+    )
+    if proc.returncode != 0:
+        return f"error: {proc.stderr.strip().splitlines()[-1]}"
+    return proc.stdout.strip().splitlines()[-1]
+
+
+def main():
+    print("Import time (fresh interpreter):")
+    for module in IMPORT_TARGETS:
+        print(f"  {module:<22} {run(SNIPPET_IMPORT.format(module=module))} ms")
+
+    print("First use (client construction):")
+    for module, resource in FIRST_USE_TARGETS:
+        print(f"  {resource:<22} {run(SNIPPET_FIRST_USE.format(module=module, resource=resource))}")
+
+
+if __name__ == "__main__":
+    main()
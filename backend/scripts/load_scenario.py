@@ -0,0 +1,331 @@
+"""
+load_scenario.py
+
+Loads an ML generator scenario directory (verishield_ml_experiments/data_generators,
+e.g. ./data/high_fraud) into the backend database, so load tests run against
+realistic users, businesses, IPs, rings and multi-owner links instead of Faker junk.
+
+  synthetic_users.csv              -> users + user_profiles
+  synthetic_businesses.csv         -> businesses + business_profiles
+  ip_nodes.csv                     -> ip_addresses
+  user_ip_relationships.csv        -> user_ips
+  user_user_relationships.csv      -> user_links
+  user_business_relationships.csv  -> business_owners (+ businesses.owner_id = first owner)
+
+CSVs are streamed in chunks and written with COPY FROM STDIN on Postgres (batched
+INSERTs elsewhere). Secondary indexes on the target tables are dropped before the
+load and rebuilt once afterwards, which is much cheaper than maintaining them row
+by row. Run it against an idle database: the API is slow without those indexes.
+
+Generator ids are kept as primary keys. Emails and business names must be unique
+in the backend schema, so duplicates (and blanks) get a deterministic suffix.
+Both only hold within the scenario, so the target tables must be empty: the load
+refuses to start otherwise, unless --truncate empties them first.
+
+Usage:
+    python load_scenario.py ../../verishield_ml_experiments/data_generators/data/high_fraud --truncate
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+
+import pandas as pd
+from passlib.context import CryptContext
+from sqlalchemy import text
+
+# Adjust Python path to recognize 'app' package if needed
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.database import Base, engine
+from app.schema_upgrades import upgrade_schema
+from app.models import (
+    Business, BusinessOwner, BusinessProfile, IPAddress, User, UserIP, UserLink, UserProfile,
+)
+
+DEFAULT_CHUNK_SIZE = 100_000
+DEFAULT_PASSWORD = "DefaultPass123"
+
+# Load order respects foreign keys
+TABLES = [User, UserProfile, Business, BusinessProfile, IPAddress, UserIP, UserLink, BusinessOwner]
+
+
+class _Unique:
+    """
+    Makes a string column unique across chunks, remembering only 64-bit hashes of what it
+    has seen. It never looks at the database; run() checks that the tables start empty.
+    """
+
+    def __init__(self):
+        self.seen = set()
+
+    def apply(self, values, ids, fallback, suffix):
+        out = []
+        for value, row_id in zip(values, ids):
+            if not isinstance(value, str) or not value:
+                value = fallback(row_id)
+            if hash(value) in self.seen:
+                value = self._unseen(value, row_id, suffix)
+            self.seen.add(hash(value))
+            out.append(value)
+        return out
+
+    def _unseen(self, value, row_id, suffix):
+        # The suffixed value may itself be in the file already (a literal "a+5@x"), so keep going
+        candidate = suffix(value, row_id)
+        n = 1
+        while hash(candidate) in self.seen:
+            n += 1
+            candidate = suffix(value, f"{row_id}-{n}")
+        return candidate
+
+
+class _Pairs:
+    """Drops relationship rows already loaded (the generators can repeat an edge, and PKs are the pair)."""
+
+    def __init__(self):
+        self.seen = {}
+
+    def apply(self, model, frame):
+        frame = frame.dropna()
+        keys = frame.iloc[:, 0].astype("int64").to_numpy() * (1 << 32) + frame.iloc[:, 1].astype("int64").to_numpy()
+        seen = self.seen.setdefault(model, set())
+        keep = []
+        for key in keys.tolist():
+            keep.append(key not in seen)
+            seen.add(key)
+        return frame[keep]
+
+
+def _int(series):
+    return pd.to_numeric(series, errors="coerce").round().astype("Int64")
+
+
+def _bool(series):
+    return series.map({"True": True, "False": False, "true": True, "false": False}).astype("boolean")
+
+
+def _date(series):
+    return pd.to_datetime(series, errors="coerce").dt.date
+
+
+def _email_suffix(email, row_id):
+    local, _, domain = email.partition("@")
+    return f"{local}+{row_id}@{domain}" if domain else f"{email}+{row_id}"
+
+
+class ScenarioLoader:
+    def __init__(self, path: str, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.path = path
+        self.chunk_size = chunk_size
+        self.use_copy = engine.dialect.name == "postgresql"
+        self.password_hash = CryptContext(schemes=["bcrypt"], deprecated="auto").hash(DEFAULT_PASSWORD)
+        self.emails = _Unique()
+        self.names = _Unique()
+        self.pairs = _Pairs()
+        self.rows = {}
+        self.seconds = {}
+
+    # ---- per-file transforms: CSV chunk -> {model: DataFrame in column order} ----
+    def users(self, chunk):
+        ids = _int(chunk["user_id"])
+        emails = self.emails.apply(chunk.get("email", pd.Series([None] * len(chunk))), ids,
+                                   lambda i: f"user{i}@synthetic.invalid", _email_suffix)
+        users = pd.DataFrame({"id": ids, "email": emails, "password_hash": self.password_hash,
+                              "is_verified": False, "version": 1})
+        profiles = pd.DataFrame({
+            "user_id": ids,
+            "name": chunk.get("name"),
+            "username": chunk.get("username"),
+            "birthdate": _date(chunk["birthdate"]) if "birthdate" in chunk else None,
+            "gender": chunk.get("gender"),
+            "segment": chunk.get("segment"),
+            "device_id": chunk.get("device_id"),
+            "phone": chunk.get("phone"),
+            "country_code": chunk.get("country_code"),
+            "signup_at": pd.to_datetime(chunk["created_at"], errors="coerce") if "created_at" in chunk else None,
+            "burst_signup": _bool(chunk["burst_signup"]) if "burst_signup" in chunk else None,
+            "is_ring_leader": _bool(chunk["is_ring_leader"]) if "is_ring_leader" in chunk else None,
+            "wave_fraud_boost": pd.to_numeric(chunk.get("wave_fraud_boost"), errors="coerce"),
+            "fraud_label": _int(chunk["fraud_label"]) if "fraud_label" in chunk else None,
+        })
+        return {User: users, UserProfile: profiles}
+
+    def businesses(self, chunk):
+        ids = _int(chunk["business_id"])
+        names = self.names.apply(chunk.get("business_name", pd.Series([None] * len(chunk))), ids,
+                                 lambda i: f"Business {i}", lambda name, i: f"{name} #{i}")
+        businesses = pd.DataFrame({"id": ids, "name": names, "is_verified": False, "owner_id": pd.NA,
+                                   "version": 1})
+        profiles = pd.DataFrame({
+            "business_id": ids,
+            "registration_country": chunk.get("registration_country"),
+            "incorporation_date": _date(chunk["incorporation_date"]) if "incorporation_date" in chunk else None,
+            "owner_name": chunk.get("owner_name"),
+            "fraud_label": _int(chunk["fraud_label"]) if "fraud_label" in chunk else None,
+        })
+        return {Business: businesses, BusinessProfile: profiles}
+
+    def ips(self, chunk):
+        return {IPAddress: pd.DataFrame({
+            "id": _int(chunk["ip_id"]),
+            "address": chunk["ip_addr"],
+            "fraud_label": _int(chunk["fraud_label"]) if "fraud_label" in chunk else None,
+        })}
+
+    def user_ips(self, chunk):
+        return {UserIP: self.pairs.apply(UserIP, pd.DataFrame({
+            "user_id": _int(chunk["user_id"]), "ip_id": _int(chunk["ip_id"]),
+        }))}
+
+    def user_links(self, chunk):
+        return {UserLink: self.pairs.apply(UserLink, pd.DataFrame({
+            "from_user_id": _int(chunk["from_user_id"]), "to_user_id": _int(chunk["to_user_id"]),
+        }))}
+
+    def owners(self, chunk):
+        return {BusinessOwner: self.pairs.apply(BusinessOwner, pd.DataFrame({
+            "user_id": _int(chunk["user_id"]), "business_id": _int(chunk["business_id"]),
+        }))}
+
+    # ---- writing ----
+    def _write(self, conn, model, frame):
+        table = model.__table__
+        frame = frame[[c.name for c in table.columns]]
+        if self.use_copy:
+            buf = io.StringIO()
+            frame.to_csv(buf, header=False, index=False)
+            buf.seek(0)
+            sql = f"COPY {table.name} ({', '.join(frame.columns)}) FROM STDIN WITH (FORMAT csv)"
+            with conn.connection.dbapi_connection.cursor() as cur:
+                if hasattr(cur, "copy_expert"):  # psycopg2
+                    cur.copy_expert(sql, buf)
+                else:  # psycopg 3
+                    with cur.copy(sql) as copy:
+                        copy.write(buf.getvalue())
+        else:
+            records = frame.astype(object).where(frame.notna(), None).to_dict("records")
+            conn.execute(table.insert(), records)
+        self.rows[table.name] = self.rows.get(table.name, 0) + len(frame)
+
+    def load_file(self, name: str, transform):
+        path = os.path.join(self.path, name)
+        if not os.path.exists(path):
+            print(f"[Load] {name}: not found, skipping")
+            return
+        start = time.perf_counter()
+        rows = 0
+        with engine.begin() as conn:
+            for chunk in pd.read_csv(path, chunksize=self.chunk_size, dtype=str, keep_default_na=True):
+                for model, frame in transform(chunk).items():
+                    self._write(conn, model, frame)
+                rows += len(chunk)
+                elapsed = time.perf_counter() - start
+                print(f"[Load] {name}: {rows:,d} rows ({rows / max(elapsed, 1e-9):,.0f} rows/s)")
+        self.seconds[name] = time.perf_counter() - start
+
+    # ---- orchestration ----
+    def check_empty(self):
+        """Raises if a target table already has rows, before anything is dropped or written."""
+        with engine.connect() as conn:
+            nonempty = [
+                model.__tablename__ for model in TABLES
+                if conn.execute(model.__table__.select().limit(1)).first() is not None
+            ]
+        if nonempty:
+            raise RuntimeError(
+                f"{', '.join(nonempty)} already contain rows; the scenario's explicit ids and emails "
+                "would collide with them partway through the COPY. Rerun with --truncate (Dev only!) "
+                "or load into an empty database."
+            )
+
+    def truncate(self):
+        with engine.begin() as conn:
+            if self.use_copy:
+                names = ", ".join(model.__tablename__ for model in TABLES)
+                conn.execute(text(f"TRUNCATE {names} CASCADE"))
+            else:
+                for model in reversed(TABLES):
+                    conn.execute(model.__table__.delete())
+        print("[Load] Truncated target tables. (Dev only)")
+
+    def drop_indexes(self):
+        with engine.begin() as conn:
+            for model in TABLES:
+                for index in model.__table__.indexes:
+                    index.drop(conn, checkfirst=True)
+
+    def rebuild_indexes(self):
+        start = time.perf_counter()
+        with engine.begin() as conn:
+            for model in TABLES:
+                for index in model.__table__.indexes:
+                    index.create(conn, checkfirst=True)
+        self.seconds["index rebuild"] = time.perf_counter() - start
+
+    def finish(self):
+        start = time.perf_counter()
+        with engine.begin() as conn:
+            # businesses.owner_id is single-valued; point it at the lowest owner id
+            conn.execute(text(
+                "UPDATE businesses SET owner_id = "
+                "(SELECT MIN(user_id) FROM business_owners bo WHERE bo.business_id = businesses.id) "
+                "WHERE owner_id IS NULL"
+            ))
+            if self.use_copy:
+                # Ids were loaded explicitly; move the sequences past them
+                for table in ("users", "businesses", "ip_addresses"):
+                    conn.execute(text(
+                        f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), COALESCE(MAX(id), 0) + 1, false) FROM {table}"
+                    ))
+        if self.use_copy:
+            with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+                for model in TABLES:
+                    conn.execute(text(f"ANALYZE {model.__tablename__}"))
+        self.seconds["owners + sequences + analyze"] = time.perf_counter() - start
+
+    def run(self, truncate=False):
+        total_start = time.perf_counter()
+        Base.metadata.create_all(bind=engine)
+        upgrade_schema(engine)
+        if truncate:
+            self.truncate()
+        self.check_empty()
+        self.drop_indexes()
+        try:
+            self.load_file("synthetic_users.csv", self.users)
+            self.load_file("synthetic_businesses.csv", self.businesses)
+            self.load_file("ip_nodes.csv", self.ips)
+            self.load_file("user_ip_relationships.csv", self.user_ips)
+            self.load_file("user_user_relationships.csv", self.user_links)
+            self.load_file("user_business_relationships.csv", self.owners)
+        finally:
+            # Rebuild even after a failed load, so the API isn't left without its indexes
+            self.rebuild_indexes()
+        self.finish()
+
+        total = time.perf_counter() - total_start
+        print("\n===== Summary =====")
+        for table, rows in self.rows.items():
+            print(f"{table:>18}: {rows:,d} rows")
+        for phase, seconds in self.seconds.items():
+            print(f"{phase:>32}: {seconds:.2f}s")
+        all_rows = sum(self.rows.values())
+        print(f"Total: {all_rows:,d} rows in {total:.2f}s ({all_rows / max(total, 1e-9):,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load a generator scenario directory into the backend database.")
+    parser.add_argument("scenario_dir", help="e.g. .../data_generators/data/high_fraud")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="CSV rows per COPY.")
+    parser.add_argument("--truncate", action="store_true",
+                        help="Empty users, businesses and the synthetic tables first; required "
+                             "unless they are already empty. (Dev only!)")
+    args = parser.parse_args()
+
+    try:
+        ScenarioLoader(args.scenario_dir, chunk_size=args.chunk_size).run(truncate=args.truncate)
+    except RuntimeError as e:
+        parser.exit(1, f"[Load] {e}\n")
@@ -4,19 +4,31 @@ seed_data.py
 Populates the VeriShield project's local database with realistic dummy data for Users and Businesses.
 Utilizes the Faker library to generate names, emails, addresses, etc.
 This script also demonstrates how to seed Neo4j (optional) with basic user/business relationships.
+
+For load tests, --bulk seeds millions of rows: the password is hashed once, rows are
+generated in NumPy-vectorized chunks, and loaded with COPY (Postgres) or batched
+executemany ... RETURNING (other databases), optionally across --workers processes.
 """
 
 import sys
 import os
+import io
 import random
+import time
+import uuid
+import multiprocessing
+import numpy as np
 from faker import Faker
 from passlib.context import CryptContext
+from sqlalchemy import insert, text
 
 # Adjust Python path to recognize 'app' package if needed
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from app.database import SessionLocal, engine, Base, driver
+from app.database import SessionLocal, engine, Base, get_driver
 from app.models import User, Business
+from app.graph_loader import NEO4J_BATCH_SIZE, load_graph
+from app.schema_upgrades import upgrade_schema
 
 # Initialize Faker
 fake = Faker()
@@ -27,15 +39,20 @@ fake = Faker()
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
+DEFAULT_PASSWORD = "DefaultPass123"
+BULK_CHUNK_SIZE = 50_000
+
+
 def generate_users(db, num_users=10):
     """
     Generate a specified number of user records with realistic names and emails.
     Some users might be 'verified', others not.
     """
+    # bcrypt is deliberately slow (~0.2s); every seeded user shares one hash
+    password_hash = pwd_context.hash(DEFAULT_PASSWORD)
     user_objects = []
     for _ in range(num_users):
         email = fake.unique.email()
-        password_hash = pwd_context.hash("DefaultPass123")  # or randomize if you like
         is_verified = random.choice([True, False])  # 50% chance user is verified
 
         user = User(
@@ -89,6 +106,7 @@ def seed_postgres_data(db, num_users=10, num_businesses=15):
     """
     print("Creating (if not exists) all tables...")
     Base.metadata.create_all(bind=engine)
+    upgrade_schema(engine)
 
     print(f"Generating {num_users} users...")
     users = generate_users(db, num_users=num_users)
@@ -100,53 +118,26 @@ def seed_postgres_data(db, num_users=10, num_businesses=15):
     return users, businesses
 
 
-def seed_neo4j_data(users, businesses):
-    """
-    OPTIONAL: Demonstrates how to seed basic relationships in Neo4j.
-    For example: Create (:User {email: ...}) nodes and link them to 
-    (:Business {name: ...}) via (:User)-[:OWNS]->(:Business).
-
-    Requires that you have a 'driver' from your Neo4j config in app.database.
-    """
-    with driver.session() as session:
-        # Clear existing data (CAUTION: in dev only)
-        session.run("MATCH (n) DETACH DELETE n")
-        print("Neo4j: All existing nodes/relationships cleared. (Dev only)")
-
-        # Create user nodes
-        for user in users:
-            session.run(
-                """
-                CREATE (u:User {userId: $userId, email: $email, isVerified: $isVerified})
-                """,
-                userId=user.id, email=user.email, isVerified=user.is_verified
-            )
-
-        # Create business nodes
-        for biz in businesses:
-            session.run(
-                """
-                CREATE (b:Business {bizId: $bizId, name: $name, isVerified: $isVerified})
-                """,
-                bizId=biz.id, name=biz.name, isVerified=biz.is_verified
-            )
-
-        # Create relationships: for each business that has an owner
-        # link the corresponding user node
-        for biz in businesses:
-            if biz.owner_id:
-                session.run(
-                    """
-                    MATCH (u:User {userId: $ownerId}), (b:Business {bizId: $bizId})
-                    CREATE (u)-[:OWNS]->(b)
-                    """,
-                    ownerId=biz.owner_id, bizId=biz.id
-                )
-
-        print("Neo4j seeding complete!")
-
+def seed_neo4j_data(users, businesses, batch_size=NEO4J_BATCH_SIZE):
+    """
+    OPTIONAL: Seeds (:User) and (:Business) nodes plus (:User)-[:OWNS]->(:Business)
+    edges in Neo4j. Uniqueness constraints are created first, then nodes and edges
+    are written in UNWIND batches (see app.graph_loader), so this stays fast at 100k+ users.
 
-def seed(num_users=10, num_businesses=15, seed_neo4j=False):
+    Uses the lazily created Neo4j driver from app.database (only connects when called).
+    """
+    load_graph(
+        get_driver(),
+        users=({"userId": u.id, "email": u.email, "isVerified": u.is_verified} for u in users),
+        businesses=({"bizId": b.id, "name": b.name, "isVerified": b.is_verified} for b in businesses),
+        owns=({"ownerId": b.owner_id, "bizId": b.id} for b in businesses if b.owner_id),
+        batch_size=batch_size,
+        clear=True,  # CAUTION: in dev only
+    )
+    print("Neo4j seeding complete!")
+
+
+def seed(num_users=10, num_businesses=15, seed_neo4j=False, neo4j_batch_size=NEO4J_BATCH_SIZE):
     """
     Main function to orchestrate seeding PostgreSQL + optional Neo4j.
     """
@@ -157,13 +148,259 @@ def seed(num_users=10, num_businesses=15, seed_neo4j=False):
 
         # Seed Neo4j if needed
         if seed_neo4j:
-            seed_neo4j_data(users, businesses)
+            seed_neo4j_data(users, businesses, batch_size=neo4j_batch_size)
 
         print("Done seeding data!")
     finally:
         db.close()
 
 
+# --------------------
+#  High-volume (--bulk) seeding
+# --------------------
+def _vocabulary(seed, size=1000):
+    """
+    A pool of Faker values sampled once per run, from a Faker seeded with `seed`, and
+    handed to every worker; rows then draw from it with NumPy indexing.
+    """
+    faker = Faker()
+    faker.seed_instance(seed)
+    # Letters only, so every combination is a valid email local part
+    first = {"".join(filter(str.isalpha, faker.first_name().lower())) for _ in range(size)} - {""}
+    last = {"".join(filter(str.isalpha, faker.last_name().lower())) for _ in range(size)} - {""}
+    companies = {faker.company() for _ in range(size)}
+    domains = ["example.com", "example.org", "example.net", "mail.test", "corp.test"]
+    return (np.array(sorted(first), dtype=object), np.array(sorted(last), dtype=object),
+            np.array(sorted(companies), dtype=object), np.array(domains, dtype=object))
+
+
+def _csv_field(value: str) -> str:
+    return '"' + value.replace('"', '""') + '"'
+
+
+class _Loader:
+    """
+    Writes row chunks either with COPY FROM STDIN (Postgres, ids reserved up front from
+    the table's sequence) or with one executemany INSERT ... RETURNING id per chunk.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.use_copy = engine.dialect.name == "postgresql"
+
+    def reserve_ids(self, conn, table: str, count: int):
+        if not self.use_copy:
+            return None
+        rows = conn.execute(
+            text("SELECT nextval(pg_get_serial_sequence(:table, 'id')) FROM generate_series(1, :n)"),
+            {"table": table, "n": count},
+        )
+        return np.fromiter((r[0] for r in rows), dtype=np.int64, count=count)
+
+    def copy(self, conn, table: str, columns, lines):
+        raw = conn.connection.dbapi_connection
+        sql = f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)"
+        data = "\n".join(lines) + "\n"
+        with raw.cursor() as cur:
+            if hasattr(cur, "copy_expert"):  # psycopg2
+                cur.copy_expert(sql, io.StringIO(data))
+            else:  # psycopg 3
+                with cur.copy(sql) as copy:
+                    copy.write(data)
+
+    def insert_returning(self, conn, model, rows):
+        result = conn.execute(insert(model).returning(model.id, sort_by_parameter_order=True), rows)
+        return np.fromiter((r[0] for r in result), dtype=np.int64, count=len(rows))
+
+
+class _PhaseTimer:
+    def __init__(self):
+        self.seconds = {}
+
+    def add(self, phase: str, seconds: float):
+        self.seconds[phase] = self.seconds.get(phase, 0.0) + seconds
+
+    def merge(self, other: dict):
+        for phase, seconds in other.items():
+            self.add(phase, seconds)
+
+
+def _seed_user_shard(args):
+    """Inserts `count` users in chunks; returns (ids, verified flags, phase seconds). Runs in a worker process."""
+    shard, count, chunk_size, password_hash, tag, rng_seed, vocabulary = args
+    engine.dispose(close=False)  # never reuse connections inherited from the parent
+    rng = np.random.default_rng(rng_seed)
+    first, last, _, domains = vocabulary
+    loader = _Loader(engine)
+    timer = _PhaseTimer()
+    ids = []
+    flags = []
+
+    for offset in range(0, count, chunk_size):
+        n = min(chunk_size, count - offset)
+        start = time.perf_counter()
+        f = first[rng.integers(0, len(first), n)]
+        l = last[rng.integers(0, len(last), n)]
+        d = domains[rng.integers(0, len(domains), n)]
+        seq = np.arange(offset, offset + n)
+        emails = [f"{a}.{b}.{tag}{shard}x{i}@{c}" for a, b, c, i in zip(f, l, d, seq)]
+        verified = rng.random(n) < 0.5
+        timer.add("users: generate", time.perf_counter() - start)
+
+        start = time.perf_counter()
+        with engine.begin() as conn:
+            if loader.use_copy:
+                chunk_ids = loader.reserve_ids(conn, "users", n)
+                lines = [
+                    f"{i},{e},{password_hash},{'t' if v else 'f'}"
+                    for i, e, v in zip(chunk_ids.tolist(), emails, verified.tolist())
+                ]
+                loader.copy(conn, "users", ("id", "email", "password_hash", "is_verified"), lines)
+            else:
+                rows = [
+                    {"email": e, "password_hash": password_hash, "is_verified": v}
+                    for e, v in zip(emails, verified.tolist())
+                ]
+                chunk_ids = loader.insert_returning(conn, User, rows)
+        timer.add("users: load", time.perf_counter() - start)
+        ids.append(chunk_ids)
+        flags.append(verified)
+
+    if not ids:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=bool), timer.seconds
+    return np.concatenate(ids), np.concatenate(flags), timer.seconds
+
+
+def _seed_business_shard(args):
+    """Inserts `count` businesses owned by random seeded users; returns (rows, phase seconds)."""
+    shard, count, chunk_size, owner_ids, tag, rng_seed, vocabulary = args
+    engine.dispose(close=False)
+    rng = np.random.default_rng(rng_seed)
+    _, _, companies, _ = vocabulary
+    loader = _Loader(engine)
+    timer = _PhaseTimer()
+    out = []
+
+    for offset in range(0, count, chunk_size):
+        n = min(chunk_size, count - offset)
+        start = time.perf_counter()
+        base = companies[rng.integers(0, len(companies), n)]
+        names = [f"{b} {tag}{shard}x{i}" for b, i in zip(base, range(offset, offset + n))]
+        verified = rng.random(n) < 0.5
+        # Same odds as the small seeder: owner drawn from users + [None]
+        picks = rng.integers(0, len(owner_ids) + 1, n)
+        owners = [int(owner_ids[p]) if p < len(owner_ids) else None for p in picks.tolist()]
+        timer.add("businesses: generate", time.perf_counter() - start)
+
+        start = time.perf_counter()
+        with engine.begin() as conn:
+            if loader.use_copy:
+                chunk_ids = loader.reserve_ids(conn, "businesses", n)
+                lines = [
+                    f"{i},{_csv_field(name)},{'t' if v else 'f'},{'' if o is None else o}"
+                    for i, name, v, o in zip(chunk_ids.tolist(), names, verified.tolist(), owners)
+                ]
+                loader.copy(conn, "businesses", ("id", "name", "is_verified", "owner_id"), lines)
+            else:
+                rows = [
+                    {"name": name, "is_verified": v, "owner_id": o}
+                    for name, v, o in zip(names, verified.tolist(), owners)
+                ]
+                chunk_ids = loader.insert_returning(conn, Business, rows)
+        timer.add("businesses: load", time.perf_counter() - start)
+        out.append((chunk_ids, names, verified, owners))
+
+    return out, timer.seconds
+
+
+def _run_shards(fn, jobs, workers):
+    if workers <= 1:
+        return [fn(job) for job in jobs]
+    # Let each worker open its own connections; the parent's pool is not shared across fork
+    engine.dispose()
+    with multiprocessing.Pool(workers) as pool:
+        return pool.map(fn, jobs)
+
+
+def _split(total: int, parts: int):
+    base, extra = divmod(total, parts)
+    return [base + (1 if i < extra else 0) for i in range(parts)]
+
+
+def bulk_seed(num_users, num_businesses, workers=1, chunk_size=BULK_CHUNK_SIZE,
+              seed_neo4j=False, neo4j_batch_size=NEO4J_BATCH_SIZE, rng_seed=None):
+    """
+    High-volume seeding. Prints wall time and rows/s for each phase; with several
+    workers the generate/load phases are summed across processes (CPU-seconds).
+    """
+    print("Creating (if not exists) all tables...")
+    Base.metadata.create_all(bind=engine)
+    upgrade_schema(engine)
+    workers = max(1, workers)
+    tag = uuid.uuid4().hex[:6]  # keeps emails/names unique across repeated runs
+    seq = np.random.SeedSequence(rng_seed)
+    seeds = seq.spawn(2 * workers)
+    # One vocabulary for all workers, so a --seed run draws the same names whatever --workers is
+    vocabulary = _vocabulary(int(seq.generate_state(1)[0]))
+    timer = _PhaseTimer()
+    total_start = time.perf_counter()
+
+    start = time.perf_counter()
+    password_hash = pwd_context.hash(DEFAULT_PASSWORD)
+    print(f"[Seed] hash: 1 bcrypt hash in {time.perf_counter() - start:.2f}s (shared by all users)")
+
+    start = time.perf_counter()
+    jobs = [
+        (w, n, chunk_size, password_hash, tag, seeds[w], vocabulary)
+        for w, n in enumerate(_split(num_users, workers)) if n
+    ]
+    results = _run_shards(_seed_user_shard, jobs, workers)
+    user_ids = np.concatenate([ids for ids, _, _ in results]) if results else np.empty(0, dtype=np.int64)
+    user_verified = np.concatenate([flags for _, flags, _ in results]) if results else np.empty(0, dtype=bool)
+    for _, _, seconds in results:
+        timer.merge(seconds)
+    elapsed = time.perf_counter() - start
+    print(f"[Seed] users: {len(user_ids):,d} rows in {elapsed:.2f}s ({len(user_ids) / max(elapsed, 1e-9):,.0f} rows/s)")
+
+    start = time.perf_counter()
+    jobs = [
+        (w, n, chunk_size, user_ids, tag, seeds[workers + w], vocabulary)
+        for w, n in enumerate(_split(num_businesses, workers)) if n
+    ]
+    results = _run_shards(_seed_business_shard, jobs, workers)
+    businesses = [chunk for chunks, _ in results for chunk in chunks]
+    for _, seconds in results:
+        timer.merge(seconds)
+    elapsed = time.perf_counter() - start
+    num_biz = sum(len(ids) for ids, _, _, _ in businesses)
+    print(f"[Seed] businesses: {num_biz:,d} rows in {elapsed:.2f}s ({num_biz / max(elapsed, 1e-9):,.0f} rows/s)")
+
+    for phase, seconds in timer.seconds.items():
+        rows = len(user_ids) if phase.startswith("users") else num_biz
+        print(f"[Seed]   {phase}: {seconds:.2f}s ({rows / max(seconds, 1e-9):,.0f} rows/s)")
+
+    if seed_neo4j:
+        # Emails aren't kept in memory for millions of users, so bulk graph users carry
+        # userId and isVerified but no email property
+        load_graph(
+            get_driver(),
+            users=({"userId": int(u), "email": None, "isVerified": bool(v)} for u, v in zip(user_ids, user_verified)),
+            businesses=(
+                {"bizId": int(i), "name": name, "isVerified": bool(v)}
+                for ids, names, verified, _ in businesses for i, name, v in zip(ids, names, verified)
+            ),
+            owns=(
+                {"ownerId": o, "bizId": int(i)}
+                for ids, _, _, owners in businesses for i, o in zip(ids, owners) if o is not None
+            ),
+            batch_size=neo4j_batch_size,
+            clear=True,  # CAUTION: in dev only
+        )
+        print("Neo4j seeding complete!")
+
+    print(f"[Seed] total: {time.perf_counter() - total_start:.2f}s")
+
+
 if __name__ == "__main__":
     # Example usage:
     # python seed_data.py  --> seeds default amounts of data (10 users, 15 businesses) in Postgres, skip Neo4j
@@ -174,7 +411,20 @@ if __name__ == "__main__":
     parser.add_argument("num_users", nargs="?", type=int, default=10, help="Number of users to generate.")
     parser.add_argument("num_businesses", nargs="?", type=int, default=15, help="Number of businesses to generate.")
     parser.add_argument("seed_neo4j", nargs="?", type=bool, default=False, help="Whether to seed Neo4j data (True/False).")
+    parser.add_argument("--neo4j-batch-size", type=int, default=NEO4J_BATCH_SIZE, help="Rows per UNWIND batch when seeding Neo4j.")
+    parser.add_argument("--bulk", action="store_true",
+                        help="High-volume mode: shared hash, vectorized chunks, COPY / executemany loading.")
+    parser.add_argument("--workers", type=int, default=1, help="Processes to shard --bulk seeding across.")
+    parser.add_argument("--chunk-size", type=int, default=BULK_CHUNK_SIZE, help="Rows per --bulk chunk (one transaction each).")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="RNG seed for --bulk row generation (names, flags, owners; a per-run tag keeps emails unique).")
 
     args = parser.parse_args()
 
-    seed(num_users=args.num_users, num_businesses=args.num_businesses, seed_neo4j=args.seed_neo4j)
+    if args.bulk:
+        # e.g. python seed_data.py 1000000 100000 --bulk --workers 4
+        bulk_seed(args.num_users, args.num_businesses, workers=args.workers, chunk_size=args.chunk_size,
+                  seed_neo4j=args.seed_neo4j, neo4j_batch_size=args.neo4j_batch_size, rng_seed=args.seed)
+    else:
+        seed(num_users=args.num_users, num_businesses=args.num_businesses, seed_neo4j=args.seed_neo4j,
+             neo4j_batch_size=args.neo4j_batch_size)
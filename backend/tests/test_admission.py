@@ -0,0 +1,20 @@
+# backend/tests/test_admission.py
+
+from backend.app.admission import classify, lanes
+
+
+def test_single_entity_verify_is_prioritized():
+    assert classify("PATCH", "/users/42/verify") is None
+    assert classify("PATCH", "/businesses/7/verify") is None
+    assert classify("GET", "/health") is None
+
+
+def test_bulk_verify_goes_to_the_write_lane():
+    assert classify("PATCH", "/users/verify") is lanes["write"]
+    assert classify("PATCH", "/businesses/verify") is lanes["write"]
+    assert classify("PATCH", "/users/abc/verify") is lanes["write"]
+
+
+def test_signup_and_read_lanes():
+    assert classify("POST", "/users") is lanes["signup"]
+    assert classify("GET", "/users/42") is lanes["read"]
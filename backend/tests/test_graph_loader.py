@@ -0,0 +1,41 @@
+# backend/tests/test_graph_loader.py
+
+from backend.app import graph_loader
+
+
+class FakeResult:
+    def consume(self):
+        return None
+
+
+class FakeSession:
+    """Records statements instead of talking to Neo4j."""
+
+    def __init__(self):
+        self.runs = []
+
+    def run(self, query, **params):
+        self.runs.append((query, params))
+        return FakeResult()
+
+    def execute_write(self, fn):
+        return fn(self)
+
+
+def test_write_batches_unwinds_in_fixed_size_batches():
+    session = FakeSession()
+    rows = ({"userId": i, "email": f"u{i}@example.com", "isVerified": False} for i in range(25))
+
+    written = graph_loader.write_batches(session, graph_loader.MERGE_USERS, rows, batch_size=10)
+
+    assert written == 25
+    assert [len(params["rows"]) for _, params in session.runs] == [10, 10, 5]
+    assert all("UNWIND $rows" in query for query, _ in session.runs)
+
+
+def test_ensure_schema_creates_unique_constraints():
+    session = FakeSession()
+    graph_loader.ensure_schema(session)
+    statements = " ".join(query for query, _ in session.runs)
+    for key in ("u.userId", "b.bizId", "i.ipId"):
+        assert f"REQUIRE {key} IS UNIQUE" in statements
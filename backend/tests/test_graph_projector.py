@@ -0,0 +1,55 @@
+# backend/tests/test_graph_projector.py
+
+import pytest
+
+from backend.app import graph_loader
+from backend.app.graph_projector import ProjectionBatch
+from backend.tests.test_graph_loader import FakeSession
+
+
+def test_batch_coalesces_events_per_node():
+    batch = ProjectionBatch()
+    batch.add("user_created", {"action": "UserCreated", "user_id": 1, "email": "a@example.com"})
+    batch.add("user_verified", {"action": "UserVerified", "user_id": 1, "email": "a@example.com", "is_verified": True})
+    batch.add("user_verified", {"action": "UserUnverified", "user_id": 2, "email": "b@example.com", "is_verified": False})
+    batch.add("business_created", {"action": "BusinessCreated", "business_id": 7, "name": "Acme", "owner_id": 1})
+
+    assert len(batch) == 4
+    assert batch.topics == {"user_created": 1, "user_verified": 2, "business_created": 1}
+    assert batch.users[1] == {"userId": 1, "email": "a@example.com", "isVerified": True}
+    assert batch.users[2]["isVerified"] is False
+    assert batch.owns == {(1, 7)}
+
+
+def test_missing_fields_stay_none_so_the_graph_keeps_them():
+    batch = ProjectionBatch()
+    batch.add("business_verified", {"action": "BusinessVerified", "business_id": 3, "is_verified": True})
+    assert batch.businesses[3] == {"bizId": 3, "name": None, "isVerified": True}
+
+
+@pytest.mark.parametrize("event", [{"action": "UserCreated"}, {"action": "Unknown", "user_id": 1}])
+def test_unusable_events_are_rejected(event):
+    batch = ProjectionBatch()
+    with pytest.raises(ValueError):
+        batch.add("user_created", event)
+    assert len(batch) == 0
+
+
+def test_apply_writes_nodes_before_edges():
+    batch = ProjectionBatch()
+    batch.add("business_created", {"action": "BusinessCreated", "business_id": 7, "name": "Acme", "owner_id": 1})
+    batch.add("user_created", {"action": "UserCreated", "user_id": 1, "email": "a@example.com"})
+    session = FakeSession()
+
+    batch.apply(session)
+
+    queries = [query for query, _ in session.runs]
+    assert queries == [graph_loader.PROJECT_USERS, graph_loader.PROJECT_BUSINESSES, graph_loader.PROJECT_OWNS]
+    assert session.runs[2][1]["rows"] == [{"ownerId": 1, "bizId": 7}]
+
+
+def test_touched_includes_both_ends_of_new_edges():
+    batch = ProjectionBatch()
+    batch.add("business_created", {"action": "BusinessCreated", "business_id": 7, "name": "Acme", "owner_id": 1})
+    batch.add("user_verified", {"action": "UserVerified", "user_id": 2, "is_verified": True})
+    assert batch.touched() == {"users": [1, 2], "businesses": [7]}
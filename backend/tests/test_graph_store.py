@@ -0,0 +1,75 @@
+# backend/tests/test_graph_store.py
+
+import pandas as pd
+import pytest
+
+from backend.app import database
+from backend.app.graph_store import CSRGraph
+from backend.app.network import expand
+
+
+def _graph():
+    return CSRGraph(
+        user_ids=[3, 1, 2], business_ids=[7], ip_ids=[9],
+        owns=[(1, 7), (2, 7)], uses_ip=[(1, 9), (2, 9), (3, 9), (4, 9)], linked_to=[(1, 3)],
+        emails=["c@example.com", "a@example.com", "b@example.com"],
+    )
+
+
+def test_builds_csr_and_drops_edges_to_unknown_nodes():
+    graph = _graph()
+    assert graph.num_nodes == 5
+    assert graph.num_edges == 6  # (4, 9) has no user 4
+    assert graph.indptr[-1] == 2 * graph.num_edges
+
+
+def test_neighbors_carry_type_and_direction():
+    graph = _graph()
+    assert sorted(graph.neighbors("User", 1)) == [
+        ("Business", 7, "OWNS", True), ("IP", 9, "USES_IP", True), ("User", 3, "LINKED_TO", True),
+    ]
+    assert ("User", 1, "LINKED_TO", False) in graph.neighbors("User", 3)
+    assert graph.neighbors("User", 42) == []
+
+
+def test_shared_attribute_lookups():
+    graph = _graph()
+    assert graph.shared(1, via="USES_IP") == {2: 1, 3: 1}
+    assert graph.shared(1, via="OWNS") == {2: 1}
+
+
+def test_expand_matches_network_payload_shape():
+    payload, nodes = expand(_graph(), 1, depth=2)
+    assert ("User", 2) in nodes
+    root = next(n for n in payload["nodes"] if n["depth"] == 0)
+    assert root == {"label": "User", "id": 1, "depth": 0, "properties": {"email": "a@example.com"}}
+    assert {"source": "User:1", "target": "Business:7", "type": "OWNS"} in payload["edges"]
+
+
+def test_loads_generator_scenario_dir(tmp_path):
+    pd.DataFrame({"user_id": [1, 2], "email": ["a@example.com", None]}).to_csv(tmp_path / "synthetic_users.csv", index=False)
+    pd.DataFrame({"ip_id": [5], "ip_addr": ["10.0.0.5"]}).to_csv(tmp_path / "ip_nodes.csv", index=False)
+    pd.DataFrame({"user_id": [1, 2], "ip_id": [5, 5]}).to_csv(tmp_path / "user_ip_relationships.csv", index=False)
+
+    graph = CSRGraph.from_scenario_dir(str(tmp_path))
+
+    assert graph.shared(1) == {2: 1}
+    assert graph.node(graph.index_of("User", 2)) == ("User", 2, {})
+
+
+def test_missing_users_csv_fails_instead_of_serving_an_empty_graph(tmp_path):
+    with pytest.raises(FileNotFoundError, match="synthetic_users.csv"):
+        CSRGraph.from_scenario_dir(str(tmp_path / "no-such-scenario"))
+
+
+def test_absent_optional_files_are_reported(tmp_path, capsys):
+    pd.DataFrame({"user_id": [1], "email": ["a@example.com"]}).to_csv(tmp_path / "synthetic_users.csv", index=False)
+    CSRGraph.from_scenario_dir(str(tmp_path))
+    out = capsys.readouterr().out
+    assert "user_ip_relationships.csv" in out and "user_user_relationships.csv" in out
+
+
+def test_memory_backend_requires_a_data_dir(monkeypatch):
+    monkeypatch.setattr(database, "GRAPH_DATA_DIR", "")
+    with pytest.raises(RuntimeError, match="GRAPH_DATA_DIR"):
+        database._create_graph_store()
@@ -0,0 +1,65 @@
+# backend/tests/test_idempotency.py
+
+import threading
+
+from backend.app import idempotency
+from backend.app.idempotency import IdempotencyStore
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _slow_request(store, key):
+    """Starts a request that stays in flight until the returned event is set."""
+    release = threading.Event()
+    started = threading.Event()
+
+    def handler():
+        started.set()
+        release.wait(5)
+        return 201, {"key": key}
+
+    thread = threading.Thread(target=store.execute, args=(key, "fp", handler))
+    thread.start()
+    started.wait(5)
+    return release, thread
+
+
+def test_in_flight_entry_does_not_block_ttl_expiry(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(idempotency.time, "monotonic", clock)
+    store = IdempotencyStore(ttl=10, max_entries=100)
+    release, thread = _slow_request(store, "slow")
+    try:
+        for i in range(5):
+            store.execute(f"k{i}", "fp", lambda: (201, {}))
+        clock.now += 11
+        store.execute("fresh", "fp", lambda: (201, {}))
+        assert list(store._entries) == ["slow", "fresh"]
+    finally:
+        release.set()
+        thread.join()
+
+
+def test_in_flight_entry_does_not_block_the_size_cap(monkeypatch):
+    monkeypatch.setattr(idempotency.time, "monotonic", _Clock())
+    store = IdempotencyStore(ttl=3600, max_entries=3)
+    release, thread = _slow_request(store, "slow")
+    try:
+        for i in range(6):
+            store.execute(f"k{i}", "fp", lambda: (201, {}))
+        assert len(store._entries) <= 4  # the cap, plus the entry just added
+        assert "slow" in store._entries
+        assert "k5" in store._entries and "k0" not in store._entries
+    finally:
+        release.set()
+        thread.join()
+
+    # Once finished, the slow request's entry is the newest completed one
+    store.execute("k6", "fp", lambda: (201, {}))
+    assert "slow" in store._entries
@@ -0,0 +1,73 @@
+# backend/tests/test_kafka_producer.py
+
+from kafka.errors import KafkaError, KafkaTimeoutError
+
+from backend.app import kafka_producer
+
+
+class _Future:
+    def __init__(self, error=None):
+        self.error = error
+
+    def get(self, timeout=None):
+        if self.error:
+            raise self.error
+        return "metadata"
+
+
+class _FlakyProducer:
+    """Fails the events listed in `fail` once each; flush() times out on the first batch."""
+
+    def __init__(self, fail=(), flush_errors=1):
+        self.fail = set(fail)
+        self.flush_errors = flush_errors
+        self.sent = []
+
+    def send(self, topic, data):
+        self.sent.append((topic, data["id"]))
+        if data["id"] in self.fail:
+            self.fail.discard(data["id"])
+            return _Future(KafkaTimeoutError("not acknowledged"))
+        return _Future()
+
+    def flush(self, timeout=None):
+        if self.flush_errors:
+            self.flush_errors -= 1
+            raise KafkaTimeoutError("flush timed out")
+
+
+def _publish(monkeypatch, producer, events):
+    monkeypatch.setattr(kafka_producer, "get_producer", lambda: producer)
+    monkeypatch.setattr(kafka_producer.time, "sleep", lambda _s: None)
+    kafka_producer.publish_events("user_verified", events)
+
+
+def test_failed_flush_only_resends_unacknowledged_events(monkeypatch):
+    producer = _FlakyProducer(fail={2, 4})
+    _publish(monkeypatch, producer, [{"id": i} for i in range(1, 6)])
+    assert producer.sent == [("user_verified", i) for i in (1, 2, 3, 4, 5, 2, 4)]
+
+
+def test_send_error_retries_the_rest_of_the_batch(monkeypatch):
+    class _SendFails(_FlakyProducer):
+        def send(self, topic, data):
+            if data["id"] == 3 and not any(i == 3 for _, i in self.sent):
+                self.sent.append((topic, 3))
+                raise KafkaError("buffer full")
+            return super().send(topic, data)
+
+    producer = _SendFails(flush_errors=0)
+    _publish(monkeypatch, producer, [{"id": i} for i in range(1, 5)])
+    assert producer.sent == [("user_verified", i) for i in (1, 2, 3, 3, 4)]
+
+
+def test_events_still_failing_go_to_dlq(monkeypatch):
+    class _AlwaysFails(_FlakyProducer):
+        def send(self, topic, data):
+            self.sent.append((topic, data.get("id", data.get("failed_data", {}).get("id"))))
+            return _Future(KafkaTimeoutError("down") if topic == "user_verified" else None)
+
+    producer = _AlwaysFails(flush_errors=0)
+    _publish(monkeypatch, producer, [{"id": 1}, {"id": 2}])
+    assert producer.sent[-2:] == [(kafka_producer.DLQ_TOPIC, 1), (kafka_producer.DLQ_TOPIC, 2)]
+    assert len(producer.sent) == 2 * 3 + 2
@@ -0,0 +1,81 @@
+# backend/tests/test_load_scenario.py
+
+import os
+import subprocess
+import sys
+
+import pytest
+from sqlalchemy import create_engine, text
+
+SCRIPT = os.path.join(os.path.dirname(__file__), "..", "scripts", "load_scenario.py")
+
+SCENARIO = {
+    # a+4@x.com is in the file literally, so row 4's duplicate needs a second suffix
+    "synthetic_users.csv": "user_id,email,name,created_at,burst_signup,fraud_label\n"
+                           "1,a@x.com,Ann,2024-10-01 10:00:00,False,0\n"
+                           "2,a+4@x.com,Bob,2024-10-02 11:00:00,True,1\n"
+                           "3,a@x.com,Cid,2024-10-03 12:00:00,False,0\n"
+                           "4,a@x.com,Dee,2024-10-04 13:00:00,False,1\n"
+                           "5,,Eve,2024-10-05 14:00:00,False,0\n",
+    "synthetic_businesses.csv": "business_id,business_name,registration_country,fraud_label\n"
+                                "1,Acme,US,0\n"
+                                "2,Acme,GB,1\n"
+                                "3,,DE,0\n",
+    "ip_nodes.csv": "ip_id,ip_addr,fraud_label\n1,10.0.0.1,0\n2,10.0.0.2,1\n",
+    "user_ip_relationships.csv": "user_id,ip_id\n1,1\n1,1\n2,1\n3,2\n",
+    "user_user_relationships.csv": "from_user_id,to_user_id\n1,2\n1,2\n2,3\n",
+    "user_business_relationships.csv": "user_id,business_id\n3,1\n2,1\n2,1\n4,2\n",
+}
+
+
+@pytest.fixture
+def scenario(tmp_path):
+    directory = tmp_path / "scenario"
+    directory.mkdir()
+    for name, content in SCENARIO.items():
+        (directory / name).write_text(content)
+    url = f"sqlite:///{tmp_path / 'load.db'}"
+
+    def load(*args):
+        env = {**os.environ, "DATABASE_URL": url}
+        return subprocess.run([sys.executable, os.path.abspath(SCRIPT), str(directory), "--chunk-size", "2", *args],
+                              env=env, capture_output=True, text=True)
+
+    return load, create_engine(url)
+
+
+def _rows(engine, sql):
+    with engine.connect() as conn:
+        return [tuple(row) for row in conn.execute(text(sql))]
+
+
+def test_loads_scenario(scenario):
+    load, engine = scenario
+    result = load()
+    assert result.returncode == 0, result.stderr
+
+    counts = {table: _rows(engine, f"SELECT COUNT(*) FROM {table}")[0][0] for table in (
+        "users", "user_profiles", "businesses", "business_profiles", "ip_addresses",
+        "user_ips", "user_links", "business_owners")}
+    assert counts == {"users": 5, "user_profiles": 5, "businesses": 3, "business_profiles": 3,
+                      "ip_addresses": 2, "user_ips": 3, "user_links": 2, "business_owners": 3}
+
+    assert _rows(engine, "SELECT id, email FROM users ORDER BY id") == [
+        (1, "a@x.com"), (2, "a+4@x.com"), (3, "a+3@x.com"), (4, "a+4-2@x.com"), (5, "user5@synthetic.invalid")]
+    assert _rows(engine, "SELECT id, name, owner_id FROM businesses ORDER BY id") == [
+        (1, "Acme", 2), (2, "Acme #2", 4), (3, "Business 3", None)]
+    # The unique indexes were rebuilt over the loaded rows
+    assert "ix_users_email" in {row[0] for row in _rows(engine, "SELECT name FROM sqlite_master WHERE type = 'index'")}
+
+
+def test_refuses_non_empty_tables(scenario):
+    load, engine = scenario
+    assert load().returncode == 0
+
+    again = load()
+    assert again.returncode == 1
+    assert "already contain rows" in again.stderr
+    assert _rows(engine, "SELECT COUNT(*) FROM users") == [(5,)]
+
+    assert load("--truncate").returncode == 0
+    assert _rows(engine, "SELECT COUNT(*) FROM users") == [(5,)]
@@ -1,6 +1,7 @@
 import uuid
 import pytest
 from fastapi.testclient import TestClient
+from backend.app import admin_auth
 from backend.app.main import app
 
 client = TestClient(app)
@@ -56,6 +57,65 @@ def test_health_check():
     assert response.json() == {"status": "OK"}
 
 
+def test_readiness_reports_each_dependency():
+    response = client.get("/ready")
+    assert response.status_code in (200, 503)
+    data = response.json()
+    assert set(data["dependencies"]) == {"postgres", "neo4j", "kafka"}
+    for result in data["dependencies"].values():
+        assert result["status"] in ("up", "down", "unknown")
+
+
+def test_db_pool_metrics():
+    client.get("/users/99999")  # make sure at least one checkout happened
+    response = client.get("/metrics/db-pool")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["checkouts"] >= 1
+    assert "wait_ms_max" in data
+
+
+def test_prometheus_metrics():
+    client.get("/users/99999")
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'http_requests_total{method="GET",route="/users/{user_id}",status="404"}' in response.text
+    assert 'db_query_duration_seconds_count{route="/users/{user_id}"}' in response.text
+    # Running totals are counters with a _total suffix; current levels stay gauges
+    assert "# TYPE db_pool_checkouts_total counter" in response.text
+    assert "# TYPE admission_shed_total counter" in response.text
+    assert "# TYPE admission_queue_seconds_total counter" in response.text
+    assert "# TYPE admission_in_flight gauge" in response.text
+
+
+def test_admin_profile_requires_token():
+    response = client.post("/admin/profile?seconds=0.1")
+    assert response.status_code == 403
+
+
+def test_admin_routes_share_one_token(monkeypatch):
+    monkeypatch.setattr(admin_auth, "ADMIN_TOKEN", "s3cret")
+    for method, path in (("post", "/admin/profile?seconds=0.05"), ("get", "/admin/slow-queries")):
+        assert getattr(client, method)(path, headers={"X-Admin-Token": "wrong"}).status_code == 403
+        assert getattr(client, method)(path, headers={"X-Admin-Token": "s3cret"}).status_code == 200
+
+
+@pytest.mark.parametrize("seconds", ["-1", "0", "nan", "inf", "3600"])
+def test_admin_profile_rejects_bad_windows(monkeypatch, seconds):
+    monkeypatch.setattr(admin_auth, "ADMIN_TOKEN", "s3cret")
+    response = client.post(f"/admin/profile?seconds={seconds}", headers={"X-Admin-Token": "s3cret"})
+    assert response.status_code == 422
+
+
+def test_admission_metrics():
+    response = client.get("/metrics/admission")
+    assert response.status_code == 200
+    data = response.json()
+    assert set(data) == {"signup", "read", "write"}
+    assert data["signup"]["shed"] >= 0
+
+
 # ------------------------------
 #       USER TESTS
 # ------------------------------
@@ -141,3 +201,97 @@ def test_get_business_not_found():
     response = client.get("/businesses/99999")
     assert response.status_code == 404
     assert "Business not found." in response.text
+
+
+# ------------------------------
+#    BULK VERIFICATION TESTS
+# ------------------------------
+
+def test_bulk_verify_businesses(unique_business_name):
+    """
+    Verifies two businesses in one call, then unverifies one of them.
+    Unknown IDs are ignored rather than failing the whole batch.
+    """
+    ids = []
+    for suffix in ("a", "b"):
+        resp = client.post("/businesses", json={"name": f"{unique_business_name}_{suffix}"})
+        assert resp.status_code == 201
+        ids.append(resp.json()["id"])
+
+    response = client.patch("/businesses/verify", json={"ids": ids + [99999999]})
+    assert response.status_code == 200
+    data = response.json()
+    assert sorted(b["id"] for b in data) == sorted(ids)
+    assert all(b["is_verified"] is True for b in data)
+
+    response = client.patch("/businesses/verify", json={"ids": ids[:1], "verified": False})
+    assert response.status_code == 200
+    assert response.json() == [{"id": ids[0], "name": f"{unique_business_name}_a", "is_verified": False}]
+
+
+def test_bulk_verify_users_empty_list():
+    response = client.patch("/users/verify", json={"ids": []})
+    assert response.status_code == 422
+
+
+# ------------------------------
+#    CONDITIONAL REQUEST TESTS
+# ------------------------------
+
+def test_get_business_etag_not_modified(unique_business_name):
+    """
+    A GET returns an ETag; repeating it with If-None-Match yields an empty 304.
+    """
+    created = client.post("/businesses", json={"name": unique_business_name}).json()
+    response = client.get(f"/businesses/{created['id']}")
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+
+    response = client.get(f"/businesses/{created['id']}", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert response.content == b""
+
+
+def test_verify_business_if_match(unique_business_name):
+    """
+    Verifying with a stale If-Match returns 412; the current ETag succeeds and bumps it.
+    """
+    created = client.post("/businesses", json={"name": unique_business_name}).json()
+    etag = client.get(f"/businesses/{created['id']}").headers["ETag"]
+
+    response = client.patch(f"/businesses/{created['id']}/verify", headers={"If-Match": '"stale"'})
+    assert response.status_code == 412
+
+    response = client.patch(f"/businesses/{created['id']}/verify", headers={"If-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["is_verified"] is True
+    assert response.headers["ETag"] != etag
+
+
+# ------------------------------
+#    IDEMPOTENCY TESTS
+# ------------------------------
+
+def test_create_user_idempotent_retry(unique_email):
+    """
+    Retrying a signup with the same Idempotency-Key replays the original 201
+    instead of failing with 'Email already registered.'
+    """
+    payload = {"email": unique_email, "password": "somePassword123"}
+    headers = {"Idempotency-Key": uuid.uuid4().hex}
+    first = client.post("/users", json=payload, headers=headers)
+    assert first.status_code == 201
+
+    retry = client.post("/users", json=payload, headers=headers)
+    assert retry.status_code == 201
+    assert retry.json() == first.json()
+    assert retry.headers["Idempotent-Replayed"] == "true"
+
+
+def test_idempotency_key_reused_with_different_payload(unique_business_name):
+    headers = {"Idempotency-Key": uuid.uuid4().hex}
+    assert client.post("/businesses", json={"name": unique_business_name}, headers=headers).status_code == 201
+
+    response = client.post("/businesses", json={"name": f"{unique_business_name}_2"}, headers=headers)
+    assert response.status_code == 422
@@ -0,0 +1,128 @@
+# backend/tests/test_network.py
+
+from fastapi.testclient import TestClient
+
+from backend.app import network
+from backend.app.main import app
+from backend.app.network import NetworkCache, Neo4jReader, expand
+
+client = TestClient(app)
+
+
+class FakeResult(list):
+    def single(self):
+        return self[0] if self else None
+
+
+class FakeTx:
+    """A tiny in-memory graph answering ROOT_QUERY / HOP_QUERY the way Neo4j would."""
+
+    def __init__(self, nodes, rels):
+        self.nodes = nodes  # eid -> (label, props)
+        self.rels = rels    # (start eid, type, end eid)
+
+    def run(self, query, **params):
+        if query == network.ROOT_QUERY:
+            rows = [
+                {"eid": eid, "labels": [label], "props": props}
+                for eid, (label, props) in self.nodes.items()
+                if label == "User" and props["userId"] == params["userId"]
+            ]
+            return FakeResult(rows)
+        rows = []
+        for eid in params["frontier"]:
+            found = [(s == eid, t if s == eid else s, kind) for s, kind, t in self.rels if eid in (s, t)]
+            for outgoing, other, kind in found[:params["limit"]]:
+                label, props = self.nodes[other]
+                rows.append({"source": eid, "type": kind, "outgoing": outgoing, "eid_m": other,
+                             "labels": [label], "props": props})
+        return FakeResult(rows)
+
+
+def _graph():
+    nodes = {
+        "u1": ("User", {"userId": 1, "email": "a@example.com", "isVerified": False}),
+        "u2": ("User", {"userId": 2, "email": "b@example.com", "isVerified": True}),
+        "b7": ("Business", {"bizId": 7, "name": "Acme"}),
+        "ip9": ("IP", {"ipId": 9, "address": "10.0.0.9"}),
+    }
+    rels = [("u1", "OWNS", "b7"), ("u1", "USES_IP", "ip9"), ("u2", "USES_IP", "ip9")]
+    return Neo4jReader(FakeTx(nodes, rels))
+
+
+def test_expand_walks_hops_and_orients_edges():
+    payload, nodes = expand(_graph(), 1, depth=2)
+
+    assert nodes == {("User", 1), ("Business", 7), ("IP", 9), ("User", 2)}
+    depths = {(n["label"], n["id"]): n["depth"] for n in payload["nodes"]}
+    assert depths[("IP", 9)] == 1 and depths[("User", 2)] == 2
+    assert {"source": "User:2", "target": "IP:9", "type": "USES_IP"} in payload["edges"]
+    assert not payload["truncated"]
+
+
+def test_expand_applies_fanout_cap():
+    payload, nodes = expand(_graph(), 1, depth=1, fanout=1)
+    assert len(nodes) == 2
+    assert payload["truncated"]
+
+
+def test_expand_unknown_user():
+    assert expand(_graph(), 42, depth=1) is None
+
+
+def test_cache_invalidates_only_entries_containing_the_node():
+    cache = NetworkCache(max_entries=10, ttl=60)
+    cache.put((1, 1), b"a", {("User", 1), ("Business", 7)}, cache.generation)
+    cache.put((2, 1), b"b", {("User", 2)}, cache.generation)
+
+    assert cache.invalidate([("Business", 7)]) == 1
+    assert cache.get((1, 1)) is None
+    assert cache.get((2, 1)) == b"b"
+
+
+def test_cache_evicts_least_recently_used():
+    cache = NetworkCache(max_entries=2, ttl=60)
+    for user_id in (1, 2):
+        cache.put((user_id, 1), b"x", {("User", user_id)}, cache.generation)
+    cache.get((1, 1))
+    cache.put((3, 1), b"x", {("User", 3)}, cache.generation)
+    assert cache.get((2, 1)) is None
+    assert cache.get((1, 1)) == b"x"
+
+
+def test_cache_drops_results_computed_across_an_invalidation():
+    cache = NetworkCache(max_entries=10, ttl=60)
+    generation = cache.generation
+    cache.invalidate([("User", 1)])
+    cache.put((1, 1), b"stale", {("User", 1)}, generation)
+    cache.put((2, 1), b"fine", {("User", 2)}, generation)
+    assert cache.get((1, 1)) is None
+    assert cache.get((2, 1)) == b"fine"
+
+
+def test_network_endpoint_caches_results(monkeypatch):
+    calls = []
+
+    def fake_query(user_id, depth):
+        calls.append((user_id, depth))
+        return expand(_graph(), user_id, depth)
+
+    monkeypatch.setattr(network, "_query_network", fake_query)
+    monkeypatch.setattr(network.listener, "start", lambda: None)
+    monkeypatch.setattr(network, "cache", NetworkCache())
+
+    first = client.get("/users/1/network?depth=2")
+    second = client.get("/users/1/network?depth=2")
+
+    assert first.status_code == 200
+    assert first.headers["X-Cache"] == "MISS" and second.headers["X-Cache"] == "HIT"
+    assert first.json() == second.json()
+    assert calls == [(1, 2)]
+
+
+def test_network_endpoint_validates_depth_and_missing_users(monkeypatch):
+    monkeypatch.setattr(network, "_query_network", lambda user_id, depth: None)
+    monkeypatch.setattr(network.listener, "start", lambda: None)
+
+    assert client.get(f"/users/1/network?depth={network.NETWORK_MAX_DEPTH + 1}").status_code == 422
+    assert client.get("/users/999/network").status_code == 404
@@ -0,0 +1,31 @@
+# backend/tests/test_pool_metrics.py
+
+from sqlalchemy import create_engine
+from sqlalchemy.pool import NullPool
+
+from backend.app.pool_metrics import TimedQueuePool, instrument_engine, pool_status
+
+
+def _checkouts(engine, n):
+    for _ in range(n):
+        with engine.connect():
+            pass
+
+
+def test_checkouts_counted_for_any_pool_class(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'plain.db'}", poolclass=NullPool)
+    instrument_engine(engine)
+    _checkouts(engine, 2)
+    status = pool_status(engine)
+    assert status["pool_class"] == "NullPool"
+    assert status["checkouts"] == 2
+    assert status["wait_ms_avg"] == 0.0  # only TimedQueuePool measures waits
+
+
+def test_timed_pool_counts_each_checkout_once(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'timed.db'}", poolclass=TimedQueuePool)
+    instrument_engine(engine)
+    _checkouts(engine, 3)
+    status = pool_status(engine)
+    assert status["checkouts"] == 3
+    assert sum(status["wait_histogram"].values()) == 3
@@ -0,0 +1,63 @@
+# backend/tests/test_profiler.py
+
+import threading
+import time
+
+from fastapi.testclient import TestClient
+
+from backend.app import profiler
+from backend.app.profiler import StackSampler
+
+
+def _busy_loop(stop):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_sampler_collects_collapsed_stacks():
+    stop = threading.Event()
+    worker = threading.Thread(target=_busy_loop, args=(stop,), name="busy-worker")
+    worker.start()
+    try:
+        sampler = StackSampler(interval=0.001, app_only=False).start()
+        time.sleep(0.1)
+        sampler.stop()
+    finally:
+        stop.set()
+        worker.join()
+
+    lines = sampler.collapsed().splitlines()
+    busy = [line for line in lines if line.startswith("busy-worker;")]
+    assert busy
+    stack, count = busy[0].rsplit(" ", 1)
+    assert "test_profiler.py:_busy_loop" in stack
+    assert int(count) > 0
+
+
+def test_registered_background_threads_are_left_out():
+    stop = threading.Event()
+    worker = profiler.ignore_thread(threading.Thread(target=_busy_loop, args=(stop,), name="busy-prober"))
+    worker.start()
+    try:
+        sampler = StackSampler(interval=0.001, app_only=False).start()
+        time.sleep(0.05)
+        sampler.stop()
+    finally:
+        stop.set()
+        worker.join()
+    assert not [line for line in sampler.collapsed().splitlines() if line.startswith("busy-prober;")]
+
+
+def test_middleware_writes_one_file_per_request(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiler, "PROFILER_OUTPUT_DIR", str(tmp_path))
+    monkeypatch.setattr(profiler, "PROFILER_SAMPLE_RATE", 1.0)
+    monkeypatch.setattr(profiler.admin_auth, "ADMIN_TOKEN", "")
+
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    client = TestClient(profiler.ProfilerMiddleware(app))
+    files = [client.get("/users/1").headers["x-profile-file"] for _ in range(3)]
+    assert len(set(files)) == 3  # same route, same second
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted(files)
@@ -0,0 +1,27 @@
+# backend/tests/test_readiness.py
+
+from backend.app.readiness import ReadinessProber
+
+
+def _fail():
+    raise RuntimeError("connection refused")
+
+
+def test_not_ready_until_probed():
+    prober = ReadinessProber({"postgres": lambda: None})
+    ready, results = prober.snapshot()
+    assert not ready
+    assert results["postgres"]["status"] == "unknown"
+
+
+def test_probe_results_are_cached_per_dependency():
+    prober = ReadinessProber({"postgres": lambda: None, "kafka": _fail}, required=["postgres"])
+    prober.probe("postgres")
+    prober.probe("kafka")
+
+    ready, results = prober.snapshot()
+    assert ready  # kafka is down but not required
+    assert results["postgres"]["status"] == "up"
+    assert results["kafka"]["status"] == "down"
+    assert "connection refused" in results["kafka"]["error"]
+    assert results["kafka"]["latency_ms"] is not None
@@ -0,0 +1,91 @@
+# backend/tests/test_replicas.py
+
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.app.pool_metrics import TimedQueuePool, instrument_engine, pool_status
+from backend.app.replicas import ReplicaRouter, STICKY_COOKIE, is_pinned_to_primary
+
+
+def _engine(tmp_path, name):
+    return create_engine(f"sqlite:///{tmp_path / name}")
+
+
+def test_reads_go_to_replicas_round_robin(tmp_path):
+    primary = _engine(tmp_path, "primary.db")
+    replicas = [_engine(tmp_path, "replica_a.db"), _engine(tmp_path, "replica_b.db")]
+    router = ReplicaRouter(sessionmaker(bind=primary), replicas)
+    router.check_all()
+
+    used = {router.read_session().get_bind() for _ in range(4)}
+    assert used == set(replicas)
+    assert router.read_session(pin_to_primary=True).get_bind() is primary
+
+
+def test_lagging_replica_falls_back_to_primary(tmp_path):
+    primary = _engine(tmp_path, "primary.db")
+    router = ReplicaRouter(sessionmaker(bind=primary), [_engine(tmp_path, "replica.db")], max_lag=1.0)
+    router._measure_lag = lambda engine: 30.0
+    router.check_all()
+
+    assert router.read_session().get_bind() is primary
+
+
+def test_unchecked_or_unreachable_replica_is_skipped(tmp_path):
+    primary = _engine(tmp_path, "primary.db")
+    router = ReplicaRouter(sessionmaker(bind=primary), [_engine(tmp_path, "replica.db")])
+    assert router.read_session().get_bind() is primary  # no lag check has run yet
+
+    def unreachable(engine):
+        raise OSError("connection timed out")
+
+    router._measure_lag = unreachable
+    router.check_all()
+    assert router.read_session().get_bind() is primary
+    assert router.status()[0]["healthy"] is False
+
+
+def test_lag_is_never_measured_on_the_request_path(tmp_path):
+    primary = _engine(tmp_path, "primary.db")
+    router = ReplicaRouter(sessionmaker(bind=primary), [_engine(tmp_path, "replica.db")], check_interval=0)
+    router.check_all()
+
+    def hang(engine):
+        raise AssertionError("lag measured inline")
+
+    router._measure_lag = hang
+    for _ in range(3):
+        router.read_session()
+
+
+def test_replica_pools_have_their_own_stats(tmp_path):
+    primary = create_engine(f"sqlite:///{tmp_path / 'primary.db'}", poolclass=TimedQueuePool)
+    replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}", poolclass=TimedQueuePool)
+    instrument_engine(primary)
+    instrument_engine(replica)
+
+    for _ in range(3):
+        with replica.connect():
+            pass
+    assert pool_status(replica)["checkouts"] == 3
+    assert pool_status(primary)["checkouts"] == 0
+
+    replica.dispose()  # a recreated pool keeps counting into the same stats
+    with replica.connect():
+        pass
+    assert pool_status(replica)["checkouts"] == 4
+
+
+def test_without_replicas_reads_use_primary(tmp_path):
+    primary = _engine(tmp_path, "primary.db")
+    router = ReplicaRouter(sessionmaker(bind=primary), [])
+    assert router.read_session().get_bind() is primary
+
+
+def test_sticky_cookie():
+    assert is_pinned_to_primary({STICKY_COOKIE: str(time.time() + 10)})
+    assert not is_pinned_to_primary({STICKY_COOKIE: str(time.time() - 10)})
+    assert not is_pinned_to_primary({STICKY_COOKIE: "garbage"})
+    assert not is_pinned_to_primary({})
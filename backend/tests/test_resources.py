@@ -0,0 +1,37 @@
+# backend/tests/test_resources.py
+
+from backend.app.resources import ResourceRegistry
+
+
+def test_registry_creates_lazily_and_once():
+    created = []
+    registry = ResourceRegistry()
+    registry.register("client", lambda: created.append(object()) or created[-1])
+
+    assert created == []
+    assert not registry.is_initialized("client")
+
+    first = registry.get("client")
+    assert registry.get("client") is first
+    assert len(created) == 1
+    assert "client" in registry.timings
+
+
+def test_registry_close_all():
+    closed = []
+    registry = ResourceRegistry()
+    registry.register("client", object, close=closed.append)
+    instance = registry.get("client")
+
+    registry.close_all()
+    assert closed == [instance]
+    assert not registry.is_initialized("client")
+    # A closed resource is re-created on next use
+    assert registry.get("client") is not instance
+
+
+def test_importing_database_does_not_create_driver():
+    from backend.app.resources import registry
+    import backend.app.database  # noqa: F401
+
+    assert not registry.is_initialized("neo4j_driver")
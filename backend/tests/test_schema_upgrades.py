@@ -0,0 +1,79 @@
+# backend/tests/test_schema_upgrades.py
+
+import threading
+
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import sessionmaker
+
+from backend.app.models import Business, User
+from backend.app import schema_upgrades
+from backend.app.schema_upgrades import missing_columns, upgrade_schema
+
+
+def _pre_version_db(tmp_path):
+    """A database as create_all left it before users/businesses had a version column."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE users (id INTEGER PRIMARY KEY, email VARCHAR NOT NULL UNIQUE, "
+                          "password_hash VARCHAR NOT NULL, is_verified BOOLEAN)"))
+        conn.execute(text("CREATE TABLE businesses (id INTEGER PRIMARY KEY, name VARCHAR NOT NULL UNIQUE, "
+                          "is_verified BOOLEAN, owner_id INTEGER REFERENCES users(id))"))
+        conn.execute(text("INSERT INTO users VALUES (1, 'old@example.com', 'x', 0)"))
+        conn.execute(text("INSERT INTO businesses VALUES (1, 'Old Corp', 0, 1)"))
+    return engine
+
+
+def test_upgrade_adds_version_columns_to_existing_rows(tmp_path):
+    engine = _pre_version_db(tmp_path)
+    assert len(missing_columns(engine)) == 2
+
+    assert upgrade_schema(engine) == ["users.version", "businesses.version"]
+    assert "version" in {c["name"] for c in inspect(engine).get_columns("users")}
+
+    session = sessionmaker(bind=engine)()
+    user = session.get(User, 1)
+    assert user.version == 1
+    user.is_verified = True
+    session.commit()
+    assert user.version == 2
+    assert session.get(Business, 1).version == 1
+    session.close()
+
+
+def test_upgrade_is_idempotent(tmp_path):
+    engine = _pre_version_db(tmp_path)
+    upgrade_schema(engine)
+    assert upgrade_schema(engine) == []
+    assert missing_columns(engine) == []
+
+
+def test_upgrade_tolerates_column_added_by_another_worker(tmp_path, monkeypatch):
+    """Another worker adds the columns between our inspect() and our ALTER."""
+    engine = _pre_version_db(tmp_path)
+    stale = missing_columns(engine)
+    upgrade_schema(create_engine(engine.url))  # the other worker
+    monkeypatch.setattr(schema_upgrades, "missing_columns", lambda _engine: stale)
+    assert upgrade_schema(engine) == []
+
+
+def test_concurrent_upgrades_add_each_column_once(tmp_path):
+    url = _pre_version_db(tmp_path).url
+    results, errors = [], []
+    start = threading.Barrier(4)
+
+    def worker():
+        engine = create_engine(url, connect_args={"timeout": 30})
+        start.wait()
+        try:
+            results.extend(upgrade_schema(engine))
+        except Exception as e:  # noqa: BLE001 - reported below
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    assert sorted(results) == ["businesses.version", "users.version"]
+    assert missing_columns(create_engine(url)) == []
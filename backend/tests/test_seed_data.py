@@ -0,0 +1,45 @@
+# backend/tests/test_seed_data.py
+
+import os
+import re
+import subprocess
+import sys
+
+from sqlalchemy import create_engine, text
+
+SCRIPT = os.path.join(os.path.dirname(__file__), "..", "scripts", "seed_data.py")
+
+
+def _bulk_seed(tmp_path, name, *args):
+    url = f"sqlite:///{tmp_path / name}"
+    result = subprocess.run([sys.executable, os.path.abspath(SCRIPT), "60", "25", "--bulk", "--chunk-size", "16", *args],
+                            env={**os.environ, "DATABASE_URL": url}, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    engine = create_engine(url)
+    with engine.connect() as conn:
+        users = conn.execute(text("SELECT id, email, is_verified FROM users ORDER BY id")).all()
+        businesses = conn.execute(text("SELECT id, name, is_verified, owner_id FROM businesses ORDER BY id")).all()
+    engine.dispose()
+    return users, businesses
+
+
+def _untagged(values):
+    """Drops the per-run tag that keeps emails/names unique across repeated runs."""
+    return sorted(re.sub(r"[0-9a-f]{6}(\d+x\d+)", r"\1", value) for value in values)
+
+
+def test_bulk_seed_smoke(tmp_path):
+    users, businesses = _bulk_seed(tmp_path, "bulk.db", "--workers", "2")
+    assert len(users) == 60 and len(businesses) == 25
+    assert len({email for _, email, _ in users}) == 60
+    assert {verified for _, _, verified in users} == {0, 1}
+    user_ids = {user_id for user_id, _, _ in users}
+    assert {owner for *_, owner in businesses} - {None} <= user_ids
+
+
+def test_bulk_seed_is_reproducible(tmp_path):
+    first_users, first_biz = _bulk_seed(tmp_path, "a.db", "--seed", "43")
+    again_users, again_biz = _bulk_seed(tmp_path, "b.db", "--seed", "43")
+    assert _untagged(email for _, email, _ in first_users) == _untagged(email for _, email, _ in again_users)
+    assert _untagged(name for _, name, _, _ in first_biz) == _untagged(name for _, name, _, _ in again_biz)
+    assert [u[2] for u in first_users] == [u[2] for u in again_users]
@@ -0,0 +1,105 @@
+# backend/tests/test_serializers.py
+
+import json
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import Optional
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import ORJSONResponse
+from fastapi.testclient import TestClient
+from pydantic import BaseModel, ValidationError
+
+from backend.app import serializers
+from backend.app.main import app
+from backend.app.models import User
+
+client = TestClient(app)
+
+
+class AuditRead(BaseModel):
+    id: int
+    note: Optional[str]
+    reviewed_at: Optional[datetime]
+    created_at: datetime
+
+    class Config:
+        orm_mode = True
+
+
+def _pydantic_body(schema, obj):
+    """What FastAPI renders for `response_model=schema`."""
+    return json.loads(json.dumps(jsonable_encoder(schema.from_orm(obj))))
+
+
+@pytest.fixture
+def fast_json(monkeypatch):
+    monkeypatch.setattr(serializers, "FAST_JSON", True)
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_datetimes_and_none_match_pydantic(monkeypatch, use_orjson):
+    if not use_orjson:
+        monkeypatch.setattr(serializers, "orjson", None)
+    serializer = serializers.ORMSerializer(AuditRead)
+    rows = [
+        SimpleNamespace(id=1, note=None, reviewed_at=None, created_at=datetime(2024, 2, 29, 23, 59, 59, 123456)),
+        SimpleNamespace(id=2, note="ok", reviewed_at=datetime(2024, 3, 1, tzinfo=timezone.utc),
+                        created_at=datetime(2024, 1, 1)),
+    ]
+    assert json.loads(serializer.response(rows[0]).body) == _pydantic_body(AuditRead, rows[0])
+    assert json.loads(serializer.response_many(rows).body) == [_pydantic_body(AuditRead, row) for row in rows]
+
+
+def test_trusted_rows_match_pydantic():
+    user = User(id=7, email="fast@example.com", password_hash="x", is_verified=True, version=2)
+    assert serializers.user_read.to_dict(user) == _pydantic_body(serializers.schemas.UserRead, user)
+
+
+def test_null_in_required_field_fails_like_response_model():
+    user = User(id=8, email="null@example.com", password_hash="x", is_verified=None)
+    with pytest.raises(ValidationError):
+        serializers.schemas.UserRead.from_orm(user)
+    with pytest.raises(ValidationError):
+        serializers.user_read.to_dict(user)
+
+
+def test_default_response_class(monkeypatch):
+    monkeypatch.setattr(serializers, "FAST_JSON", True)
+    assert serializers.default_response_class() is ORJSONResponse
+
+
+def test_user_endpoints_same_body_with_fast_json(monkeypatch):
+    created = client.post("/users", json={"email": f"fast_{uuid.uuid4().hex}@example.com", "password": "pw"}).json()
+    slow = client.get(f"/users/{created['id']}")
+
+    monkeypatch.setattr(serializers, "FAST_JSON", True)
+    fast = client.get(f"/users/{created['id']}")
+    assert fast.status_code == 200
+    assert fast.headers["content-type"] == "application/json"
+    assert fast.json() == slow.json()
+    assert fast.headers["ETag"] == slow.headers["ETag"]
+
+    not_modified = client.get(f"/users/{created['id']}", headers={"If-None-Match": fast.headers["ETag"]})
+    assert not_modified.status_code == 304
+
+    bulk = client.patch("/users/verify", json={"ids": [created["id"]], "verified": True})
+    assert bulk.status_code == 200
+    assert bulk.json() == [{**slow.json(), "is_verified": True}]
+    # The bulk update bumped the version, so the old ETag no longer matches
+    assert client.get(f"/users/{created['id']}").headers["ETag"] != fast.headers["ETag"]
+
+
+def test_business_endpoints_same_body_with_fast_json(monkeypatch):
+    created = client.post("/businesses", json={"name": f"FastCorp_{uuid.uuid4().hex}"}).json()
+    slow = client.get(f"/businesses/{created['id']}")
+    slow_bulk = client.patch("/businesses/verify", json={"ids": [created["id"]], "verified": False})
+
+    monkeypatch.setattr(serializers, "FAST_JSON", True)
+    fast = client.get(f"/businesses/{created['id']}")
+    assert fast.json() == slow.json()
+    assert fast.headers["ETag"] != slow.headers["ETag"]  # the bulk update bumped the version
+    fast_bulk = client.patch("/businesses/verify", json={"ids": [created["id"]], "verified": False})
+    assert fast_bulk.json() == slow_bulk.json()
@@ -0,0 +1,80 @@
+# backend/tests/test_slow_queries.py
+
+import json
+import time
+
+from sqlalchemy import create_engine, text
+
+from backend.app.slow_queries import (
+    SlowQueryLog, fingerprint, instrument_slow_queries, numbered_placeholders, redact, redact_plan,
+)
+
+
+def test_fingerprint_ignores_values_and_in_list_length():
+    a = fingerprint("SELECT * FROM users WHERE id IN (%(id_1_1)s, %(id_1_2)s) AND email = 'a@b.c'")
+    b = fingerprint("SELECT *  FROM users\n WHERE id IN (%(id_1_1)s, %(id_1_2)s, %(id_1_3)s) AND email = 'x@y.z'")
+    assert a == b == "SELECT * FROM users WHERE id IN (?...) AND email = ?"
+
+
+def test_redact_keeps_only_types():
+    assert redact({"email_1": "secret@example.com", "param_1": 1}) == {"email_1": "str", "param_1": "int"}
+    assert redact(("secret@example.com",)) == ["str"]
+
+
+def _slow_log(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'slow.db'}")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE users (id INTEGER PRIMARY KEY, email TEXT)"))
+        conn.execute(text("CREATE INDEX ix_users_email ON users (email)"))
+    log = SlowQueryLog(threshold_ms=0.000001)
+    instrument_slow_queries(engine, log)
+    return engine, log
+
+
+def _wait_for_plans(log):
+    deadline = time.time() + 5
+    while time.time() < deadline and not all(row["plan"] for row in log.report()):
+        time.sleep(0.01)
+
+
+def test_slow_statements_are_aggregated_with_plan(tmp_path):
+    engine, log = _slow_log(tmp_path)
+    with engine.connect() as conn:
+        for user_id in (1, 2):
+            conn.execute(text("SELECT email FROM users WHERE id = :id"), {"id": user_id})
+    _wait_for_plans(log)
+
+    [row] = log.report()
+    assert row["count"] == 2
+    assert row["last_parameters"] == ["int"]
+    assert "users" in row["plan"]
+
+
+def test_parameter_values_never_reach_the_report(tmp_path):
+    marker = "marker-7f3a9c@example.com"
+    engine, log = _slow_log(tmp_path)
+    with engine.connect() as conn:
+        conn.execute(text("SELECT id FROM users WHERE email = :email"), {"email": marker})
+    _wait_for_plans(log)
+
+    [row] = log.report()
+    assert row["plan"]
+    assert marker not in json.dumps(row, default=str)
+
+
+def test_postgres_plans_use_numbered_placeholders():
+    statement, count = numbered_placeholders(
+        "SELECT * FROM users WHERE email = %(email_1)s OR name LIKE 'a%%' OR backup = %(email_1)s AND id = %(id_1)s"
+    )
+    assert statement == "SELECT * FROM users WHERE email = $1 OR name LIKE 'a%' OR backup = $1 AND id = $2"
+    assert count == 2
+    assert numbered_placeholders("SELECT %s, %s") == ("SELECT $1, $2", 2)
+
+
+def test_literals_are_redacted_from_plans():
+    plan = ("Index Scan using ix_users_email on users  (cost=0.42..8.44 rows=1 width=4)\n"
+            "  Index Cond: ((email)::text = 'marker-7f3a9c@example.com'::text)")
+    redacted = redact_plan(plan)
+    assert "marker-7f3a9c" not in redacted
+    assert "Index Cond: ((email)::text = ?::text)" in redacted
+    assert "cost=0.42..8.44" in redacted
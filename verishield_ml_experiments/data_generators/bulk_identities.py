@@ -0,0 +1,307 @@
+# verishield_ml_experiments/data_generators/bulk_identities.py
+"""
+bulk_identities.py
+
+Bulk synthetic identities for the generator scripts, without a Faker call per row.
+
+Faker is used once to draw a vocabulary (first/last names, email domains, companies,
+company suffixes, words, bs phrases, color names, country codes). The vocabulary is
+cached on disk, keyed by locale, size and Faker version. Columns are then assembled
+with NumPy: index draws into the vocabulary, digit/letter draws, and element-wise
+string concatenation. Phone prefixes (per country, from COUNTRY_PHONE_PREFIXES) and
+missing-field masks are vectorized the same way.
+
+Names, usernames, emails and business names follow the same formats Faker uses, so
+the generators' heuristics (email domains, phone prefixes, business keywords) see the
+same distributions as before. Full user records come out at a few hundred thousand
+rows per second (single columns such as IPs at millions) instead of ~1-2 thousand.
+
+Every function takes `rng`: the np.random module (seeded from --seed) by default, or
+a np.random.Generator. The vocabulary itself is drawn from a fixed seed, so a cached
+and a freshly built vocabulary give the same rows.
+"""
+
+import json
+import os
+import string
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+VOCAB_SIZE = 5000
+VOCAB_SEED = 0
+VOCAB_CACHE_DIR = os.getenv("VERISHIELD_VOCAB_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "verishield"))
+
+# The fallback prefixes may include this token, meaning "3 random digits" (fake.msisdn()[:3])
+RANDOM_PREFIX = "###"
+
+###############################################################################
+# VOCABULARY
+###############################################################################
+def _draw_vocabulary(size: int, locale: str) -> dict:
+    from faker import Faker
+
+    fake = Faker(locale)
+    fake.seed_instance(VOCAB_SEED)
+    # Draws keep Faker's weighting: frequent names show up more often in the lists
+    vocab = {
+        "first_names_male": [fake.first_name_male() for _ in range(size)],
+        "first_names_female": [fake.first_name_female() for _ in range(size)],
+        "last_names": [fake.last_name() for _ in range(size)],
+        "free_email_domains": [fake.free_email_domain() for _ in range(size // 10 or 1)],
+        "companies": [fake.company() for _ in range(size)],
+        "company_suffixes": [fake.company_suffix() for _ in range(size // 10 or 1)],
+        "words": [fake.word() for _ in range(size)],
+        "bs": [fake.bs() for _ in range(size)],
+        "color_names": [fake.color_name() for _ in range(size // 10 or 1)],
+    }
+    codes = getattr(fake, "alpha_2_country_codes", None)
+    vocab["country_codes"] = list(codes) if codes else sorted({fake.country_code() for _ in range(size * 4)})
+    return vocab
+
+
+def load_vocabulary(size: int = VOCAB_SIZE, locale: str = "en_US", cache_dir: str = VOCAB_CACHE_DIR) -> dict:
+    """The Faker vocabulary, from the on-disk cache if present (built and cached otherwise)."""
+    import faker
+
+    path = os.path.join(cache_dir, f"faker_vocab_{locale}_{size}_{faker.VERSION}.json")
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+
+    vocab = _draw_vocabulary(size, locale)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(vocab, f)
+        os.replace(tmp, path)
+        print(f"[INFO] Cached Faker vocabulary at {path}")
+    except OSError as e:
+        print(f"[WARN] Could not cache Faker vocabulary: {e}")
+    return vocab
+
+###############################################################################
+# VECTORIZED PRIMITIVES
+###############################################################################
+# Everything below works on fixed-width NumPy string arrays: np.char.add is a C loop,
+# while concatenating object arrays costs a Python call per element.
+_LETTERS = np.frombuffer(string.ascii_letters.encode(), dtype=np.uint8)
+_LOWER = np.array(list(string.ascii_lowercase))
+_OCTETS = np.array([str(i) for i in range(256)])
+_TWO_DIGITS = np.array([f"{i:02d}" for i in range(100)])
+
+
+def _ints(rng, low, high, size):
+    """Integers in [low, high) from either np.random or a np.random.Generator."""
+    if hasattr(rng, "integers"):
+        return rng.integers(low, high, size)
+    return rng.randint(low, high, size)
+
+
+def _cat(*parts):
+    """Element-wise concatenation of string arrays (and scalars)."""
+    out = parts[0]
+    for part in parts[1:]:
+        out = np.char.add(out, part)
+    return out
+
+
+def pick(values, n: int, rng=np.random) -> np.ndarray:
+    """n uniform draws (with replacement) from `values`."""
+    values = np.asarray(values, dtype=str)
+    return values[_ints(rng, 0, len(values), n)]
+
+
+def digits(n: int, width: int, rng=np.random) -> np.ndarray:
+    """Random zero-padded numbers with `width` digits, as strings."""
+    return np.char.zfill(_ints(rng, 0, 10 ** width, n).astype(f"U{width}"), width)
+
+
+def letters(n: int, width: int, rng=np.random, prefix: str = "") -> np.ndarray:
+    """`prefix` + random ASCII letters (like fake.lexify(prefix + '????'))."""
+    head = np.frombuffer(prefix.encode(), dtype=np.uint8)
+    codes = np.empty((n, len(head) + width), dtype=np.uint8)
+    codes[:, :len(head)] = head
+    codes[:, len(head):] = _LETTERS[_ints(rng, 0, len(_LETTERS), (n, width))]
+    size = len(head) + width
+    return codes.view(f"S{size}").ravel().astype(f"U{size}")
+
+
+def device_ids(n: int, rng=np.random) -> np.ndarray:
+    """Like fake.lexify(text="device_????????")."""
+    return letters(n, 8, rng, prefix="device_")
+
+
+def ipv4_public(n: int, rng=np.random) -> np.ndarray:
+    """
+    Dotted-quad addresses outside the private, loopback, link-local and multicast ranges,
+    carrier-grade NAT (100.64/10) and the documentation/benchmarking blocks.
+    """
+    first = _ints(rng, 1, 224, n)
+    second = _ints(rng, 0, 256, n)
+    third = _ints(rng, 0, 256, n)
+    fourth = _ints(rng, 0, 256, n)
+    reserved = (first == 10) | (first == 127) | ((first == 172) & (second >= 16) & (second < 32)) \
+        | ((first == 192) & (second == 168)) | ((first == 169) & (second == 254)) \
+        | ((first == 100) & (second >= 64) & (second < 128)) \
+        | ((first == 192) & (second == 0) & ((third == 0) | (third == 2))) \
+        | ((first == 198) & ((second == 18) | (second == 19) | ((second == 51) & (third == 100)))) \
+        | ((first == 203) & (second == 0) & (third == 113))
+    # Shift reserved picks into the neighbouring public /8
+    first = np.where(reserved, first + 1, first)
+    return _cat(_OCTETS[first], ".", _OCTETS[second], ".", _OCTETS[third], ".", _OCTETS[fourth])
+
+
+
+def ipv4_to_int(ips) -> np.ndarray:
+    """Dotted quads as uint32 (4 bytes per address instead of a Python string); missing -> 0."""
+    octets = pd.Series(ips).fillna("0.0.0.0").str.split(".", expand=True).astype(np.uint32).to_numpy()
+    return (octets[:, 0] << 24) | (octets[:, 1] << 16) | (octets[:, 2] << 8) | octets[:, 3]
+
+def years_ago(years: int, today: date = None) -> date:
+    today = today or date.today()
+    try:
+        return today.replace(year=today.year - years)
+    except ValueError:  # Feb 29
+        return today.replace(year=today.year - years, day=28)
+
+
+def dates_between(n: int, start: date, end: date, rng=np.random) -> np.ndarray:
+    """Uniform dates in [start, end] as ISO strings."""
+    span = np.datetime64(start, "D") + np.arange((end - start).days + 1)
+    table = np.datetime_as_string(span, unit="D")
+    return table[_ints(rng, 0, len(table), n)]
+
+
+def phones(country_codes, prefixes: dict, fallback, rng=np.random) -> np.ndarray:
+    """
+    prefix + 7 digits per user. Countries in `prefixes` pick one of their own prefixes;
+    all others (and missing countries) pick from `fallback`, where RANDOM_PREFIX stands
+    for three random digits.
+    """
+    country_codes = np.asarray(country_codes)
+    n = len(country_codes)
+    width = max(len(p) for p in [*fallback, *(p for options in prefixes.values() for p in options)])
+    chosen = np.empty(n, dtype=f"U{max(width, 3)}")
+    known = np.zeros(n, dtype=bool)
+    for cc, options in prefixes.items():
+        mask = country_codes == cc
+        chosen[mask] = pick(options, int(mask.sum()), rng)
+        known |= mask
+    chosen[~known] = pick(fallback, int((~known).sum()), rng)
+    random_prefix = chosen == RANDOM_PREFIX
+    chosen[random_prefix] = digits(int(random_prefix.sum()), 3, rng)
+    return np.char.add(chosen, _ints(rng, 1000000, 10000000, n).astype("U7"))
+
+
+def apply_missing(df: pd.DataFrame, fields, prob: float, rng=np.random) -> pd.DataFrame:
+    """Nulls each of `fields` independently with probability `prob` (in place)."""
+    for field in fields:
+        mask = rng.random(len(df)) < prob
+        if mask.any():
+            df[field] = df[field].astype(object)
+            df.loc[mask, field] = None
+    return df
+
+###############################################################################
+# IDENTITIES
+###############################################################################
+class IdentitySynth:
+    """Vectorized replacements for the per-row Faker calls in the generators."""
+
+    def __init__(self, vocab: dict = None, rng=np.random):
+        vocab = vocab if vocab is not None else load_vocabulary()
+        self.vocab = {key: np.asarray(values, dtype=str) for key, values in vocab.items()}
+        for key in ("first_names_male", "first_names_female", "last_names"):
+            self.vocab[f"{key}_lower"] = np.char.lower(self.vocab[key])
+        self.rng = rng
+
+    def _pick(self, key, n):
+        values = self.vocab[key]
+        return values[_ints(self.rng, 0, len(values), n)]
+
+    def _first_names(self, sex, suffix=""):
+        n = len(sex)
+        return np.where(sex == "M", self._pick("first_names_male" + suffix, n),
+                        self._pick("first_names_female" + suffix, n))
+
+    def full_names(self, n: int, sex=None) -> np.ndarray:
+        """'First Last', with first names matching `sex` ('M'/'F'; random if omitted)."""
+        if sex is None:
+            sex = pick(["F", "M"], n, self.rng)
+        return _cat(self._first_names(sex), " ", self._pick("last_names", n))
+
+    def usernames(self, n: int) -> np.ndarray:
+        """Faker's en_US user_name formats: last.first, first.last, first##, ?last (lowercase)."""
+        fmt = _ints(self.rng, 0, 4, n)
+        parts = []
+        for k in range(4):
+            # Each format is only assembled for its own rows
+            m = int((fmt == k).sum())
+            first = self._first_names(pick(["F", "M"], m, self.rng), "_lower")
+            last = self._pick("last_names_lower", m)
+            if k == 0:
+                parts.append(_cat(last, ".", first))
+            elif k == 1:
+                parts.append(_cat(first, ".", last))
+            elif k == 2:
+                parts.append(_cat(first, _TWO_DIGITS[_ints(self.rng, 0, 100, m)]))
+            else:
+                parts.append(_cat(_LOWER[_ints(self.rng, 0, 26, m)], last))
+        width = max(p.dtype.itemsize for p in parts) // 4
+        names = np.empty(n, dtype=f"U{max(width, 1)}")
+        for k, part in enumerate(parts):
+            names[fmt == k] = part
+        return names
+
+    def free_emails(self, n: int) -> np.ndarray:
+        return _cat(self.usernames(n), "@", self._pick("free_email_domains", n))
+
+    def country_codes(self, n: int) -> np.ndarray:
+        return self._pick("country_codes", n)
+
+    def users(self, n: int, phone_prefixes: dict, fallback_prefixes, missing_prob: float = 0.0,
+              missing_fields=("name", "email", "phone", "country_code"), today: date = None) -> pd.DataFrame:
+        """
+        The identity part of a user record, like fake.simple_profile() plus the phone and
+        device logic: name, email, username, birthdate, gender, device_id, phone, country_code.
+        Birthdates are relative to `today` (default: the real date).
+        """
+        today = today or date.today()
+        sex = pick(["F", "M"], n, self.rng)
+        country = self.country_codes(n)
+        df = pd.DataFrame({
+            "name": self.full_names(n, sex),
+            "email": self.free_emails(n),
+            "username": self.usernames(n),
+            # simple_profile's date_of_birth: 0..115 years old
+            "birthdate": dates_between(n, years_ago(115, today), today, self.rng),
+            "gender": sex,
+            "device_id": device_ids(n, self.rng),
+            "phone": phones(country, phone_prefixes, fallback_prefixes, self.rng),
+            "country_code": country,
+        })
+        return apply_missing(df, missing_fields, missing_prob, self.rng)
+
+    def business_names(self, n: int) -> np.ndarray:
+        """random.choice over company(), company_suffix(), 'FakeCo ' + word(), bs(), 'Phantom Inc ' + color_name()."""
+        kind = _ints(self.rng, 0, 5, n)
+        names = self._pick("companies", n)
+        for k, values in ((1, self._pick("company_suffixes", n)), (2, np.char.add("FakeCo ", self._pick("words", n))),
+                          (3, self._pick("bs", n)), (4, np.char.add("Phantom Inc ", self._pick("color_names", n)))):
+            names = np.where(kind == k, values, names)
+        return names
+
+    def businesses(self, n: int, missing_prob: float = 0.0,
+                   missing_fields=("registration_country", "owner_name"), today: date = None) -> pd.DataFrame:
+        """business_name, registration_country, incorporation_date (15 years before `today`), owner_name."""
+        today = today or date.today()
+        df = pd.DataFrame({
+            "business_name": self.business_names(n),
+            "registration_country": self.country_codes(n),
+            "incorporation_date": dates_between(n, years_ago(15, today), today, self.rng),
+            "owner_name": self.full_names(n),
+        })
+        return apply_missing(df, missing_fields, missing_prob, self.rng)
@@ -25,10 +25,13 @@ import os
 import random
 import argparse
 import pandas as pd
-from faker import Faker
 from datetime import timedelta, datetime
 import numpy as np
 
+from bulk_identities import IdentitySynth, RANDOM_PREFIX, ipv4_public
+from output_formats import FORMATS, check_format, run_categories, write_table
+from synergy_labeling import SynergyLabeler
+
 ###############################################################################
 # GLOBAL DEFAULTS & CONFIG
 ###############################################################################
@@ -44,8 +47,6 @@ NUM_WAVES = 3                    # number of "fraud waves" for user signups
 MAX_CONVERGENCE_PASSES = 10  
 TOLERANCE = 0.02  # We'll consider "near 50%" if fraud ratio is in [0.48..0.52]
 
-fake = Faker()
-
 # user segments
 USER_SEGMENTS = {
     "casual":     (0.70, 0.0),
@@ -97,43 +98,32 @@ def get_scenario_params(scenario_name: str):
 ###############################################################################
 # PICK SEGMENT FOR USERS
 ###############################################################################
-def pick_user_segment() -> str:
-    r = random.random()
-    cumulative = 0.0
-    for seg, (prob, _) in USER_SEGMENTS.items():
-        cumulative += prob
-        if r < cumulative:
-            return seg
-    return "casual"
+def pick_user_segments(num_users: int) -> np.ndarray:
+    names = list(USER_SEGMENTS)
+    probs = [prob for prob, _ in USER_SEGMENTS.values()]
+    return np.random.choice(names, size=num_users, p=probs)
 
 ###############################################################################
 # 2) WAVES FOR USER SIGNUPS
 ###############################################################################
 def create_time_waves(num_users: int, wave_count=3):
-    waves = []
-    for _ in range(wave_count):
-        start_day = random.randint(0, 60)
-        length    = random.randint(5, 15)
-        end_day   = start_day + length
-        fraud_boost = random.uniform(0.1, 0.3)
-        waves.append((start_day, end_day, fraud_boost))
-
-    assignments = []
-    for _ in range(num_users):
-        wave = random.choice(waves)
-        day_offset = random.randint(wave[0], wave[1])
-        seconds_in_day = random.randint(0, 86400)
-        assignments.append((day_offset, seconds_in_day, wave[2]))
-    return assignments
+    """(day_offset, seconds_in_day, wave_fraud_boost) arrays, one entry per user."""
+    start_day = np.random.randint(0, 61, size=wave_count)
+    end_day = start_day + np.random.randint(5, 16, size=wave_count)
+    fraud_boost = np.random.uniform(0.1, 0.3, size=wave_count)
+
+    wave = np.random.randint(0, wave_count, size=num_users)
+    day_offset = np.random.randint(start_day[wave], end_day[wave] + 1)
+    seconds_in_day = np.random.randint(0, 86401, size=num_users)
+    return day_offset, seconds_in_day, fraud_boost[wave]
 
 ###############################################################################
 # GENERATE IP NODES
 ###############################################################################
 def generate_ip_nodes(total_ips=2000):
-    ip_list = [fake.ipv4_public() for _ in range(total_ips)]
     ip_nodes = pd.DataFrame({
         "ip_id": range(1, total_ips + 1),
-        "ip_addr": ip_list
+        "ip_addr": ipv4_public(total_ips)
     })
     # We'll store ip_fraud_label later
     ip_nodes["fraud_label"] = 0
@@ -164,86 +154,42 @@ def link_users_to_ips(df_users, df_ip, collision_ratio=0.20):
 ###############################################################################
 def generate_unlabeled_users(num_users: int):
     base_start = datetime.now() - timedelta(days=90)
-    wave_info = create_time_waves(num_users, wave_count=NUM_WAVES)
-
-    users = []
-    for i in range(num_users):
-        user_id = i + 1
-        day_offset, seconds_in_day, wave_boost = wave_info[i]
-        profile = fake.simple_profile()
-
-        cc = fake.country_code()
-        prefix_list = COUNTRY_PHONE_PREFIXES.get(cc, [])
-        if not prefix_list:
-            prefix_list = ["+999", "+000", "555-", fake.msisdn()[:3]]
-        prefix = random.choice(prefix_list)
-        phone_val = prefix + str(random.randint(1000000, 9999999))
-
-        suspicious_burst = False
-        if random.random() < 0.05:
-            suspicious_burst = True
-            seconds_in_day = random.randint(0, 60)
-
-        created_dt = base_start + timedelta(days=day_offset, seconds=seconds_in_day)
-
-        seg = pick_user_segment()
-        user_dict = {
-            "user_id": user_id,
-            "segment": seg,
-            "name": profile["name"],
-            "email": profile["mail"],
-            "username": profile["username"],
-            "birthdate": profile["birthdate"].isoformat() if profile["birthdate"] else None,
-            "gender": profile["sex"],
-            "wave_fraud_boost": wave_boost,
-            "device_id": fake.lexify(text="device_????????"),
-            "phone": phone_val,
-            "country_code": cc,
-            "created_at": created_dt,
-            "burst_signup": suspicious_burst,
-            "fraud_label": None,
-        }
-
-        # random missing fields
-        for f in ["name", "email", "phone", "country_code"]:
-            if random.random() < MISSING_FIELD_PROB:
-                user_dict[f] = None
-
-        users.append(user_dict)
-
-    return pd.DataFrame(users)
+    day_offset, seconds_in_day, wave_boost = create_time_waves(num_users, wave_count=NUM_WAVES)
+    identities = IdentitySynth().users(
+        num_users, COUNTRY_PHONE_PREFIXES, ["+999", "+000", "555-", RANDOM_PREFIX], MISSING_FIELD_PROB
+    )
+
+    # ~5% "suspicious bursts": signup squeezed into the first minute of the day
+    suspicious_burst = np.random.random(num_users) < 0.05
+    seconds_in_day = np.where(suspicious_burst, np.random.randint(0, 61, size=num_users), seconds_in_day)
+    created_at = (pd.Timestamp(base_start) + pd.to_timedelta(day_offset, unit="D")
+                  + pd.to_timedelta(seconds_in_day, unit="s"))
+
+    return pd.DataFrame({
+        "user_id": np.arange(1, num_users + 1),
+        "segment": pick_user_segments(num_users),
+        "name": identities["name"],
+        "email": identities["email"],
+        "username": identities["username"],
+        "birthdate": identities["birthdate"],
+        "gender": identities["gender"],
+        "wave_fraud_boost": wave_boost,
+        "device_id": identities["device_id"],
+        "phone": identities["phone"],
+        "country_code": identities["country_code"],
+        "created_at": created_at,
+        "burst_signup": suspicious_burst,
+        "fraud_label": None,
+    })
 
 ###############################################################################
 # GENERATE BUSINESSES
 ###############################################################################
 def generate_unlabeled_businesses(num_businesses: int):
-    biz_list = []
-    for i in range(num_businesses):
-        biz_id = i + 1
-        biz_name = random.choice([
-            fake.company(),
-            fake.company_suffix(),
-            "FakeCo " + fake.word(),
-            fake.bs(),
-            "Phantom Inc " + fake.color_name()
-        ])
-        reg_ctry = fake.country_code()
-        biz_dict = {
-            "business_id": biz_id,
-            "business_name": biz_name,
-            "registration_country": reg_ctry,
-            "incorporation_date": fake.date_between(start_date="-15y", end_date="today"),
-            "owner_name": fake.name(),
-            "fraud_label": None,
-        }
-
-        if random.random() < MISSING_FIELD_PROB:
-            biz_dict["registration_country"] = None
-        if random.random() < MISSING_FIELD_PROB:
-            biz_dict["owner_name"] = None
-
-        biz_list.append(biz_dict)
-    return pd.DataFrame(biz_list)
+    df = IdentitySynth().businesses(num_businesses, MISSING_FIELD_PROB)
+    df.insert(0, "business_id", np.arange(1, num_businesses + 1))
+    df["fraud_label"] = None
+    return df
 
 ###############################################################################
 # USER-USER RELATIONSHIPS (RING LEADERS)
@@ -288,154 +234,6 @@ def link_users_to_businesses(df_users, df_biz, base_ownership_prob=0.4, max_biz_
                 relationships.append({"user_id": u, "business_id": b})
     return pd.DataFrame(relationships)
 
-###############################################################################
-# SAFE FRAUD LABEL FETCH
-###############################################################################
-def safe_fraud_label(df, user_id_val):
-    subset = df.loc[df["user_id"] == user_id_val, "fraud_label"]
-    if len(subset) < 1:
-        return 0
-    val = subset.values[0]
-    if val is None or pd.isna(val):
-        return 0
-    return int(val)
-
-###############################################################################
-# LABELING FUNCTIONS
-###############################################################################
-def label_users(df_users, df_biz, df_user_biz, df_user_user,
-                user_base_fraud, user_synergy_factor,
-                ip_user_map, user_ip_map):
-    """
-    Synergy-based user fraud labeling with adjustable user_base_fraud and synergy factor.
-    synergy factor scales how strongly ring, IP, and biz adjacency influences p.
-    """
-    biz_fraud_map = dict(zip(df_biz["business_id"], df_biz["fraud_label"]))
-    for k, v in biz_fraud_map.items():
-        if v is None: biz_fraud_map[k] = 0
-
-    user_to_biz = df_user_biz.groupby("user_id")["business_id"].apply(list).to_dict()
-
-    # Build adjacency for user->user
-    user_graph = {}
-    for _, row in df_user_user.iterrows():
-        f_u = row["from_user_id"]
-        t_u = row["to_user_id"]
-        user_graph.setdefault(f_u, []).append(t_u)
-
-    new_labels = []
-    for idx, row in df_users.iterrows():
-        p = user_base_fraud
-        p += row.get("wave_fraud_boost", 0.0)
-
-        seg = row.get("segment", "casual")
-        _, seg_mod = USER_SEGMENTS.get(seg, (1.0, 0.0))
-        p += seg_mod * user_synergy_factor  # scale by synergy
-
-        # suspicious signals
-        email = (row.get("email") or "").lower()
-        if any(d in email for d in SUSPICIOUS_EMAIL_DOMAINS):
-            p += 0.20 * user_synergy_factor
-        phone = str(row.get("phone") or "")
-        if len(phone) < 7:
-            p += 0.10 * user_synergy_factor
-        elif any(x in phone for x in ["+999", "666-666"]):
-            p += 0.15 * user_synergy_factor
-        if row.get("burst_signup"):
-            p += 0.15 * user_synergy_factor
-        if row.get("is_ring_leader", False):
-            p += 0.30 * user_synergy_factor
-
-        # synergy with fraudulent businesses
-        owned_biz_ids = user_to_biz.get(row["user_id"], [])
-        known_fraud_biz_count = sum(biz_fraud_map.get(bid, 0) for bid in owned_biz_ids)
-        p += 0.05 * known_fraud_biz_count * user_synergy_factor
-
-        # synergy with ring neighbors
-        neighbors = user_graph.get(row["user_id"], [])
-        ring_fraud_count = 0
-        for nb in neighbors:
-            ring_fraud_count += safe_fraud_label(df_users, nb)
-        p += 0.03 * ring_fraud_count * user_synergy_factor
-
-        # synergy with IP
-        if user_ip_map and ip_user_map:
-            ip_id = user_ip_map.get(row["user_id"], None)
-            if ip_id:
-                co_users = ip_user_map.get(ip_id, [])
-                co_fraud_count = 0
-                for cu in co_users:
-                    if cu != row["user_id"]:
-                        co_fraud_count += safe_fraud_label(df_users, cu)
-                p += 0.025 * co_fraud_count * user_synergy_factor
-
-        label = 1 if random.random() < max(0, min(1, p)) else 0
-        new_labels.append(label)
-
-    df_users["fraud_label"] = new_labels
-    return df_users
-
-def label_businesses(df_users, df_biz, df_user_biz,
-                     biz_base_fraud, biz_synergy_factor):
-    user_fraud_map = dict(zip(df_users["user_id"], df_users["fraud_label"]))
-    for k, v in user_fraud_map.items():
-        if v is None: user_fraud_map[k] = 0
-
-    biz_to_users = df_user_biz.groupby("business_id")["user_id"].apply(list).to_dict()
-
-    new_labels = []
-    for idx, row in df_biz.iterrows():
-        p = biz_base_fraud
-
-        bname = (row.get("business_name") or "").lower()
-        if any(k in bname for k in ["test", "fake", "shell", "phantom", "bogus", "shady"]):
-            p += 0.15 * biz_synergy_factor
-        reg_ctry = (row.get("registration_country") or "").upper()
-        if reg_ctry in WATCHLIST_COUNTRIES:
-            p += 0.20 * biz_synergy_factor
-        if random.random() < 0.03:
-            p += 0.10 * biz_synergy_factor
-
-        owners = biz_to_users.get(row["business_id"], [])
-        num_fraud_owners = sum(user_fraud_map.get(uid, 0) for uid in owners)
-        p += 0.10 * num_fraud_owners * biz_synergy_factor
-
-        label = 1 if random.random() < max(0, min(1, p)) else 0
-        new_labels.append(label)
-
-    df_biz["fraud_label"] = new_labels
-    return df_biz
-
-def label_ips(df_ip, df_users, ip_user_map, ip_base_fraud, ip_synergy_factor):
-    """
-    Label IPs: if many connected users are fraud, IP is more likely fraud.
-    """
-    new_labels = []
-    for i, row in df_ip.iterrows():
-        ip_id_val = row["ip_id"]
-        connected_users = ip_user_map.get(ip_id_val, [])
-        # start with some base for IP
-        p = ip_base_fraud
-
-        if connected_users:
-            # fraction of fraud among connected users
-            fraud_count = 0
-            for uid in connected_users:
-                sub = df_users.loc[df_users["user_id"] == uid, "fraud_label"]
-                if len(sub) > 0 and sub.values[0] == 1:
-                    fraud_count += 1
-            ratio = fraud_count / len(connected_users)
-            p += ratio * ip_synergy_factor  # synergy effect
-        else:
-            # no connected users => minimal chance
-            p += 0.01
-
-        label = 1 if random.random() < max(0, min(1, p)) else 0
-        new_labels.append(label)
-
-    df_ip["fraud_label"] = new_labels
-    return df_ip
-
 ###############################################################################
 # ENRICH USER FEATURES
 ###############################################################################
@@ -467,35 +265,22 @@ def in_range(val, target=0.50, tol=TOLERANCE):
     return (val >= target - tol) and (val <= target + tol)
 
 def convergence_pass(
-    df_users, df_biz, df_ip,
-    df_user_biz, df_user_user, ip_user_map, user_ip_map,
+    labeler,
     user_base_fraud, biz_base_fraud, ip_base_fraud,
     user_synergy, biz_synergy, ip_synergy
 ):
     """
     Single synergy labeling pass for users, businesses, IPs.
-    Returns updated dataframes + measured fraud ratios.
+    Returns measured fraud ratios; the labels stay in `labeler`.
     """
     # Label users & businesses in synergy
-    df_users = label_users(
-        df_users, df_biz, df_user_biz, df_user_user,
-        user_base_fraud, user_synergy, ip_user_map, user_ip_map
-    )
-    df_biz = label_businesses(
-        df_users, df_biz, df_user_biz,
-        biz_base_fraud, biz_synergy
-    )
+    user_labels = labeler.label_users(user_base_fraud, user_synergy)
+    biz_labels = labeler.label_businesses(biz_base_fraud, biz_synergy)
     # Then label IPs after user labels
-    df_ip = label_ips(
-        df_ip, df_users, ip_user_map,
-        ip_base_fraud, ip_synergy
-    )
+    ip_labels = labeler.label_ips(ip_base_fraud, ip_synergy)
 
     # measure
-    user_ratio = measure_fraud_ratio(df_users)
-    biz_ratio  = measure_fraud_ratio(df_biz)
-    ip_ratio   = measure_fraud_ratio(df_ip)
-    return df_users, df_biz, df_ip, user_ratio, biz_ratio, ip_ratio
+    return user_labels.mean(), biz_labels.mean(), ip_labels.mean()
 
 def adjust_base_rate(current_ratio, base_rate, synergy_factor):
     """
@@ -524,11 +309,16 @@ def main():
     parser.add_argument("--scenario", type=str, default="default",
                         choices=list(SCENARIO_CONFIG.keys()))
     parser.add_argument("--output-dir", type=str, default=DEFAULT_OUTPUT_DIR)
+    parser.add_argument("--output-format", type=str, default="csv", choices=FORMATS,
+                        help="csv (default), or typed parquet, feather (both need pyarrow) or npz.")
     args = parser.parse_args()
+    try:
+        check_format(args.output_format)
+    except ValueError as e:
+        parser.error(str(e))
 
     if args.seed is not None:
         random.seed(args.seed)
-        Faker.seed(args.seed)
         np.random.seed(args.seed)
         print(f"[INFO] Seed set to {args.seed}")
 
@@ -563,18 +353,18 @@ def main():
     # 4) user->biz relationships
     df_user_biz = link_users_to_businesses(df_users, df_biz, base_ownership_prob=0.40)
 
-    # adjacency maps
-    ip_user_map = df_user_ip.groupby("ip_id")["user_id"].apply(list).to_dict()
-    user_ip_map = dict(zip(df_user_ip["user_id"], df_user_ip["ip_id"]))
+    # sparse adjacency + label arrays, built once
+    labeler = SynergyLabeler(df_users, df_biz, df_ip, df_user_biz, df_user_user, df_user_ip,
+                             segments=USER_SEGMENTS, email_domains=SUSPICIOUS_EMAIL_DOMAINS,
+                             watchlist=WATCHLIST_COUNTRIES)
 
     # 5) Convergence Loop
     print("\n--- Starting synergy convergence loop ---")
     converged = False
     for pass_idx in range(MAX_CONVERGENCE_PASSES):
         # do synergy pass
-        df_users, df_biz, df_ip, ur, br, ir = convergence_pass(
-            df_users, df_biz, df_ip,
-            df_user_biz, df_user_user, ip_user_map, user_ip_map,
+        ur, br, ir = convergence_pass(
+            labeler,
             user_base_fraud, biz_base_fraud, ip_base_fraud,
             user_synergy, biz_synergy, ip_synergy
         )
@@ -593,46 +383,35 @@ def main():
 
     if not converged:
         # do one last pass with final rates
-        df_users, df_biz, df_ip, ur, br, ir = convergence_pass(
-            df_users, df_biz, df_ip,
-            df_user_biz, df_user_user, ip_user_map, user_ip_map,
+        ur, br, ir = convergence_pass(
+            labeler,
             user_base_fraud, biz_base_fraud, ip_base_fraud,
             user_synergy, biz_synergy, ip_synergy
         )
         print(f"[WARN] Reached max passes. Final ~fraud: user={ur:.3f}, biz={br:.3f}, ip={ir:.3f}")
 
     # 6) Optional random label flip
-    flips_u = flips_b = flips_ip = 0
-    for i, row in df_users.iterrows():
-        if random.random() < RANDOM_LABEL_FLIP_PROB:
-            df_users.at[i, "fraud_label"] = 1 - (row["fraud_label"] or 0)
-            flips_u += 1
-    for i, row in df_biz.iterrows():
-        if random.random() < RANDOM_LABEL_FLIP_PROB:
-            df_biz.at[i, "fraud_label"] = 1 - (row["fraud_label"] or 0)
-            flips_b += 1
-    for i, row in df_ip.iterrows():
-        if random.random() < RANDOM_LABEL_FLIP_PROB:
-            df_ip.at[i, "fraud_label"] = 1 - (row["fraud_label"] or 0)
-            flips_ip += 1
-
+    flips_u, flips_b, flips_ip = labeler.flip(RANDOM_LABEL_FLIP_PROB)
     if flips_u or flips_b or flips_ip:
         print(f"[INFO] Noise flips => user={flips_u}, biz={flips_b}, ip={flips_ip} flips")
 
+    df_users["fraud_label"] = labeler.user_labels
+    df_biz["fraud_label"] = labeler.biz_labels
+    df_ip["fraud_label"] = labeler.ip_labels
+
     # 7) Enrich user features
     df_users = enrich_user_features(df_users, df_user_biz, df_biz)
 
-    # 8) Save final CSVs
+    # 8) Save final outputs
     scenario_dir = os.path.join(args.output_dir, scenario_name)
     os.makedirs(scenario_dir, exist_ok=True)
-    print(f"-> Saving CSVs to {scenario_dir}")
-
-    df_users.to_csv(os.path.join(scenario_dir, "synthetic_users.csv"), index=False)
-    df_biz.to_csv(os.path.join(scenario_dir, "synthetic_businesses.csv"), index=False)
-    df_ip.to_csv(os.path.join(scenario_dir, "ip_nodes.csv"), index=False)
-    df_user_ip.to_csv(os.path.join(scenario_dir, "user_ip_relationships.csv"), index=False)
-    df_user_user.to_csv(os.path.join(scenario_dir, "user_user_relationships.csv"), index=False)
-    df_user_biz.to_csv(os.path.join(scenario_dir, "user_business_relationships.csv"), index=False)
+    print(f"-> Saving {args.output_format} files to {scenario_dir}")
+
+    categories = run_categories(USER_SEGMENTS) if args.output_format != "csv" else None
+    for name, df in (("synthetic_users", df_users), ("synthetic_businesses", df_biz), ("ip_nodes", df_ip),
+                     ("user_ip_relationships", df_user_ip), ("user_user_relationships", df_user_user),
+                     ("user_business_relationships", df_user_biz)):
+        write_table(df, os.path.join(scenario_dir, name), args.output_format, categories)
 
     # 9) Final summary
     ur = measure_fraud_ratio(df_users)
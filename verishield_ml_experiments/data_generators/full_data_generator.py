@@ -18,19 +18,43 @@ and creates user-business relationships with enhanced realism:
 
 Usage:
     python full_data_generator.py --num-users 1500000 --num-businesses 150000 --seed 123 --scenario high_fraud
+    python full_data_generator.py --seed 123 --shards 8      # 8 id-range shards on up to 8 processes
+    python full_data_generator.py --num-users 10000000 --num-businesses 1000000 --memory-budget-mb 16000
+    python full_data_generator.py --seed 123 --output-format parquet   # typed columns, one row group per shard
+    python full_data_generator.py --seed 123 --reference-date 2024-06-30   # dates relative to 2024-06-30
 
 Default arguments:
     NUM_USERS = 1,500,000
     NUM_BUSINESSES = 150,000
     SEED is None (fully random).
     SCENARIO is "default" if not specified.
+    SHARDS = 1 (raised to fit CHUNK_SIZE = 250,000 rows per shard); WORKERS = min(SHARDS, CPU count).
+    MEMORY_BUDGET_MB = 8192.
+    REFERENCE_DATE is today, or 2025-01-01 when a SEED is given.
+
+Each shard of users/businesses is generated from its own RNG stream (see sharding.py),
+so a given --seed, --shards and --chunk-size reproduce the same files regardless of
+--workers. created_at, birthdate and incorporation_date are relative to --reference-date,
+which is fixed when --seed is given, so seeded runs don't change from one day to the next.
+Shards are streamed: each one is appended to the output tables as soon as it is done, and
+between shards the script keeps only a few bytes per node in NumPy arrays (business
+labels, user signup IPs as uint32, fraudulent businesses owned). The enriched user file
+is written in a second pass over synthetic_users. Fewer workers run when needed to stay
+under --memory-budget-mb (see streaming.py). --output-format picks csv (default),
+parquet, feather or npz (see output_formats.py).
 """
 
-import random
 import argparse
+import math
+import numpy as np
 import pandas as pd
-from faker import Faker
-from datetime import timedelta, datetime
+from datetime import date, timedelta
+
+from bulk_identities import IdentitySynth, RANDOM_PREFIX, ipv4_public, ipv4_to_int, load_vocabulary
+from sharding import default_workers, iter_shards, root_seed, shard_ranges
+from streaming import estimate_mb, peak_rss_mb, workers_for_budget
+from output_formats import FORMATS, check_format, iter_table, open_table, run_categories, table_path
+from synergy_labeling import bernoulli, business_signals, rare_bumps, user_signals
 
 ###############################################################################
 # GLOBAL DEFAULTS & CONFIG
@@ -38,7 +62,14 @@ from datetime import timedelta, datetime
 DEFAULT_NUM_USERS = 1_500_000
 DEFAULT_NUM_BUSINESSES = 150_000
 MISSING_FIELD_PROB = 0.02  # 2% chance to null out certain fields
-fake = Faker()
+SEEDED_REFERENCE_DATE = date(2025, 1, 1)  # "today" for seeded runs unless --reference-date is given
+IP_COLLISION_RATIO = 0.20  # first ~20% of users sign up from a shared pool of IPs
+IP_COLLISION_POOL = 500
+DEFAULT_CHUNK_SIZE = 250_000  # max users/businesses per shard
+DEFAULT_MEMORY_BUDGET_MB = 8192
+# Bytes kept per user between shards: signup IP (uint32), fraud biz owned (uint16),
+# ip_count (uint32) plus np.unique temporaries when ip_count is computed
+USER_STATE_BYTES = 24
 
 # Suspicious email domains (expandable)
 ADDITIONAL_SUSP_DOMAINS = [
@@ -74,287 +105,235 @@ COUNTRY_PHONE_PREFIXES = {
 # CORE FRAUD LOGIC
 ###############################################################################
 
-def assign_user_label(user_dict: dict, scenario_params: dict) -> int:
+def assign_user_labels(df_users: pd.DataFrame, scenario_params: dict, rng=np.random) -> np.ndarray:
     """
-    Assigns a binary fraud label (0=legit, 1=fraud) using layered heuristics.
+    Assigns binary fraud labels (0=legit, 1=fraud) to all users at once using layered heuristics.
     Allows scenario-based 'base_fraud' adjustments.
     Also introduces rare 'sophisticated' fraud and 'false flags'.
     """
-    base_fraud = scenario_params.get("user_base_fraud", 0.15)
-
-    # Start with a scenario-based base probability
-    p = base_fraud
-
-    # Basic signals
-    email = (user_dict.get("email") or "").lower()
-    if any(domain in email for domain in SUSPICIOUS_EMAIL_DOMAINS):
-        p += 0.20
-
-    phone = (user_dict.get("phone") or "")
-    if len(phone) < 7:
-        p += 0.10
-    elif any(prefix in phone for prefix in ["+999", "666-666"]):
-        p += 0.15
-
-    signup_ip = (user_dict.get("signup_ip") or "")
-    if signup_ip.startswith("192.168") or signup_ip.startswith("10."):
-        p += 0.10
-
-    # Time-based suspicious burst? If created_at is in an extremely narrow window, +X
-    if user_dict.get("burst_signup", False):
-        p += 0.15
-
-    # Rare small additive factor
-    if random.random() < 0.02:
-        p += 0.05
-
-    # Rare big red flag
-    if random.random() < 0.01:
-        p += 0.25
+    n = len(df_users)
+    # Scenario base + email/phone/private-IP/burst signals
+    p = scenario_params.get("user_base_fraud", 0.15)
+    p = p + user_signals(df_users, email_domains=SUSPICIOUS_EMAIL_DOMAINS, private_ip=True)
+    # Rare small additive factor, rare big red flag
+    p += rare_bumps(n, [(0.02, 0.05), (0.01, 0.25)], rng)
+    # 'sophisticated' fraud (p < 0.2) and 'false flags' (p > 0.4), ~2% each
+    return bernoulli(p, rng, overrides=True)
 
-    # Introduce 'sophisticated' fraud cases: Looks legit, but is fraud
-    # e.g., 1-2% of the total might have no typical signals but be forced to label=1
-    # We'll do this only if p < 0.2 => meaning not many suspicious indicators
-    if p < 0.2 and random.random() < 0.02:
-        return 1  # forcibly mark as sophisticated fraud
 
-    # Introduce 'false flag': user might have suspicious signals but is still legit
-    # We give a ~2% chance to forcibly set label=0 if p > 0.4
-    if p > 0.4 and random.random() < 0.02:
-        return 0
-
-    return 1 if random.random() < p else 0
-
-
-def assign_business_label(business_dict: dict, scenario_params: dict) -> int:
+def assign_business_labels(df_businesses: pd.DataFrame, scenario_params: dict, rng=np.random) -> np.ndarray:
     """
     Similar approach for businesses. 
     Scenario-based base fraud, plus heuristics.
     """
-    base_fraud = scenario_params.get("biz_base_fraud", 0.10)
-    p = base_fraud
-
-    name = (business_dict.get("business_name") or "").lower()
-    if any(kw in name for kw in ["test", "fake", "shell", "phantom", "bogus", "shady"]):
-        p += 0.15
-
-    watchlist_countries = ["NK", "IR", "SY", "CU", "AF", "SO", "LY"]
-    reg_country = (business_dict.get("registration_country") or "").upper()
-    if reg_country in watchlist_countries:
-        p += 0.20
-
+    p = scenario_params.get("biz_base_fraud", 0.10) + business_signals(df_businesses)
     # If incorporation_date is very recent => suspicious
-    if random.random() < 0.03:
-        p += 0.10
-
-    # Rare forced 'sophisticated' biz fraud with normal signals
-    if p < 0.2 and random.random() < 0.02:
-        return 1
-
-    # Rare 'false flag' scenario
-    if p > 0.4 and random.random() < 0.02:
-        return 0
-
-    return 1 if random.random() < p else 0
+    p = p + rare_bumps(len(df_businesses), [(0.03, 0.10)], rng)
+    return bernoulli(p, rng, overrides=True)
 
 ###############################################################################
 # IP & DEVICE LOGIC
 ###############################################################################
 
-def generate_ip_pool(total_users: int, collision_ratio: float = 0.20):
+def generate_ip_pool(user_ids: np.ndarray, num_colliding: int, collision_ips: np.ndarray, rng=None) -> np.ndarray:
     """
-    Creates repeated IP addresses for ~collision_ratio fraction of users.
-    We'll also produce a small fraction that share both IP & device for
-    advanced collisions.
+    Signup IPs for `user_ids`: users with id <= num_colliding reuse the shared
+    `collision_ips` pool, everyone else gets a random new address.
     """
-    num_repeated_ips = int(total_users * collision_ratio)
-    collision_ips = [fake.ipv4_public() for _ in range(500)]
-
-    collision_mapping = {}
-    for i in range(num_repeated_ips):
-        ip_choice = random.choice(collision_ips)
-        collision_mapping[i + 1] = {
-            "ip": ip_choice,
-            "device_id": fake.lexify(text="device_????????")  # Some random device ID
-        }
-    return collision_mapping
+    rng = np.random.default_rng(rng)
+    signup_ips = ipv4_public(len(user_ids), rng)
+    colliding = user_ids <= num_colliding
+    signup_ips[colliding] = collision_ips[rng.integers(0, len(collision_ips), int(colliding.sum()))]
+    return signup_ips
+
+def reference_start(reference_date: date = None) -> pd.Timestamp:
+    """Signups start at midnight 90 days before `reference_date` (default: today)."""
+    return pd.Timestamp(reference_date or date.today()) - timedelta(days=90)
 
 ###############################################################################
 # USER GENERATION
 ###############################################################################
 
-def generate_user_data(user_id: int, collision_map: dict, scenario_params: dict, base_start: datetime) -> dict:
+def generate_user_dataset(num_users: int, scenario_params: dict, rng=None, first_id: int = 1,
+                          num_colliding: int = None, collision_ips: np.ndarray = None,
+                          reference_date: date = None, vocab: dict = None) -> pd.DataFrame:
     """
-    If user_id is in collision_map, reuse IP + device_id. Otherwise random new.
-    Include time-based burst logic & multi-segment phone correlation.
+    Users first_id..first_id+num_users-1 in bulk: colliding signup IPs, phone prefix
+    correlated with country_code (fallback to suspicious or random prefixes) and
+    time-based burst logic. The IP collision settings and reference_date default to a
+    standalone run (reference_date: today); shards pass the run-wide values.
     """
-    profile = fake.simple_profile()
-    collision_entry = collision_map.get(user_id)
-
-    if collision_entry:
-        signup_ip = collision_entry["ip"]
-        device_id = collision_entry["device_id"]
-    else:
-        signup_ip = fake.ipv4_public()
-        device_id = fake.lexify(text="device_????????")
+    rng = np.random.default_rng(rng)
+    if num_colliding is None:
+        num_colliding = int(num_users * IP_COLLISION_RATIO)
+    if collision_ips is None:
+        collision_ips = ipv4_public(IP_COLLISION_POOL, rng)
+    reference_date = reference_date or date.today()
+    base_start = reference_start(reference_date)
+    user_ids = np.arange(first_id, first_id + num_users)
 
     # Possibly correlate phone prefix with country_code
     # If no match, fallback to suspicious or random phone
-    country_code = fake.country_code()  # e.g. 'US', 'GB', 'DE'
-    possible_prefixes = COUNTRY_PHONE_PREFIXES.get(country_code, [])
-    if not possible_prefixes:
-        # fallback
-        possible_prefixes = [
-            fake.msisdn()[:3],  # random chunk
-            "+999", "+000", "666-666"
-        ]
-    prefix_choice = random.choice(possible_prefixes)
-    phone_chosen = prefix_choice + str(random.randint(1000000, 9999999))  # simplistic append
+    identities = IdentitySynth(vocab, rng).users(
+        num_users, COUNTRY_PHONE_PREFIXES, [RANDOM_PREFIX, "+999", "+000", "666-666"], MISSING_FIELD_PROB,
+        today=reference_date
+    )
 
     # Time-based signup. Some fraction in a suspicious burst window
     # Base start ~90 days ago. We'll pick a random offset in days/hours.
-    days_offset = random.randint(0, 90)
-    suspicious_burst = False
-    if random.random() < 0.05:
-        # 5% chance to put them in a "burst" minute window
-        suspicious_burst = True
-        created_at = base_start + timedelta(days=days_offset, seconds=random.randint(0, 60))
-    else:
-        # normal distribution up to 24h in that day
-        created_at = base_start + timedelta(days=days_offset, seconds=random.randint(0, 86400))
-
-    user = {
-        "user_id": user_id,
-        "name": profile["name"],
-        "email": profile["mail"],
-        "username": profile["username"],
-        "birthdate": profile["birthdate"].isoformat() if profile["birthdate"] else None,
-        "gender": profile["sex"],
-        "signup_ip": signup_ip,
-        "device_id": device_id,
-        "phone": phone_chosen,
-        "country_code": country_code,
-        "created_at": created_at,
+    days_offset = rng.integers(0, 91, num_users)
+    # 5% chance to put them in a "burst" minute window, otherwise anywhere in that day
+    suspicious_burst = rng.random(num_users) < 0.05
+    seconds = np.where(suspicious_burst, rng.integers(0, 61, num_users), rng.integers(0, 86401, num_users))
+
+    df_users = pd.DataFrame({
+        "user_id": user_ids,
+        "name": identities["name"],
+        "email": identities["email"],
+        "username": identities["username"],
+        "birthdate": identities["birthdate"],
+        "gender": identities["gender"],
+        "signup_ip": generate_ip_pool(user_ids, num_colliding, collision_ips, rng),
+        "device_id": identities["device_id"],
+        "phone": identities["phone"],
+        "country_code": identities["country_code"],
+        "created_at": (base_start + pd.to_timedelta(days_offset, unit="D")
+                       + pd.to_timedelta(seconds, unit="s")),
         "burst_signup": suspicious_burst,  # for labeling logic
-    }
-
-    # Random missing fields
-    fields_to_consider = ["name", "email", "phone", "country_code"]
-    for field in fields_to_consider:
-        if random.random() < MISSING_FIELD_PROB:
-            user[field] = None
-
-    # Fraud label
-    user["fraud_label"] = assign_user_label(user, scenario_params)
-    return user
-
-def generate_user_dataset(num_users: int, scenario_params: dict) -> pd.DataFrame:
-    collision_map = generate_ip_pool(num_users, collision_ratio=0.20)
-    # We'll define a base reference date ~90 days ago
-    base_start = datetime.now() - timedelta(days=90)
-
-    users = []
-    for i in range(num_users):
-        user_data = generate_user_data(i + 1, collision_map, scenario_params, base_start)
-        users.append(user_data)
-    return pd.DataFrame(users)
+    })
+    df_users["fraud_label"] = assign_user_labels(df_users, scenario_params, rng)
+    return df_users
 
 ###############################################################################
 # BUSINESS GENERATION
 ###############################################################################
 
-def generate_business_data(biz_id: int, scenario_params: dict) -> dict:
-    """
-    Introduce correlation between registration_country, name, and suspicious signals.
-    """
-    biz_name = random.choice([
-        fake.company(),
-        fake.company_suffix(),
-        "FakeCo " + fake.word(),
-        fake.bs(),
-        "Phantom Inc " + fake.color_name(),
-    ])
-
-    reg_country = fake.country_code()
-    biz = {
-        "business_id": biz_id,
-        "business_name": biz_name,
-        "registration_country": reg_country,
-        "incorporation_date": fake.date_between(start_date="-15y", end_date="today"),
-        "owner_name": fake.name(),
-    }
-
-    # Random missing fields
-    if random.random() < MISSING_FIELD_PROB:
-        biz["owner_name"] = None
-    if random.random() < MISSING_FIELD_PROB:
-        biz["registration_country"] = None
-
-    # Fraud label
-    biz["fraud_label"] = assign_business_label(biz, scenario_params)
-    return biz
-
-def generate_business_dataset(num_businesses: int, scenario_params: dict) -> pd.DataFrame:
-    businesses = []
-    for i in range(num_businesses):
-        biz_data = generate_business_data(i + 1, scenario_params)
-        businesses.append(biz_data)
-    return pd.DataFrame(businesses)
+def generate_business_dataset(num_businesses: int, scenario_params: dict, rng=None, first_id: int = 1,
+                              vocab: dict = None, reference_date: date = None) -> pd.DataFrame:
+    rng = np.random.default_rng(rng)
+    df_businesses = IdentitySynth(vocab, rng).businesses(num_businesses, MISSING_FIELD_PROB, today=reference_date)
+    df_businesses.insert(0, "business_id", np.arange(first_id, first_id + num_businesses))
+    df_businesses["fraud_label"] = assign_business_labels(df_businesses, scenario_params, rng)
+    return df_businesses
 
 ###############################################################################
 # RELATIONSHIP GENERATION
 ###############################################################################
 
 def link_users_to_businesses(
-    df_users: pd.DataFrame,
-    df_businesses: pd.DataFrame,
+    user_ids: np.ndarray,
+    num_businesses: int,
     ownership_probability: float = 0.4,
-    max_businesses_per_user: int = 10
+    max_businesses_per_user: int = 10,
+    rng=None
 ) -> pd.DataFrame:
     """
     Creates user-business relationships. Each user has a 'ownership_probability'
-    chance to own 1..max_businesses_per_user. For advanced realism, you could
-    also let multiple users share the same business. 
+    chance to own 1..max_businesses_per_user distinct businesses out of ids
+    1..num_businesses. For advanced realism, you could also let multiple users
+    share the same business.
     """
-    relationships = []
-    user_ids = df_users["user_id"].tolist()
-    biz_ids = df_businesses["business_id"].tolist()
+    rng = np.random.default_rng(rng)
+    owners = user_ids[rng.random(len(user_ids)) < ownership_probability]
+    if num_businesses < 1 or len(owners) == 0:
+        return pd.DataFrame(columns=["user_id", "business_id"])
+
+    counts = np.minimum(rng.integers(1, max_businesses_per_user + 1, len(owners)), num_businesses)
+    df_rel = pd.DataFrame({"user_id": np.repeat(owners, counts)})
+    df_rel["business_id"] = rng.integers(1, num_businesses + 1, len(df_rel))
+    # A user never owns the same business twice: redraw repeats until none are left
+    repeated = df_rel.duplicated().to_numpy()
+    while repeated.any():
+        df_rel.loc[repeated, "business_id"] = rng.integers(1, num_businesses + 1, int(repeated.sum()))
+        repeated = df_rel.duplicated().to_numpy()
+    return df_rel
 
-    for user_id in user_ids:
-        if random.random() < ownership_probability:
-            num_biz_owned = random.randint(1, max_businesses_per_user)
-            chosen_biz_ids = random.sample(biz_ids, min(num_biz_owned, len(biz_ids)))
-            for b_id in chosen_biz_ids:
-                relationships.append({"user_id": user_id, "business_id": b_id})
+###############################################################################
+# SHARDS
+###############################################################################
 
-    return pd.DataFrame(relationships)
+def generate_shard(task: dict):
+    """
+    One id-range shard from its own RNG stream: ("users", df_users, df_relationships)
+    or ("businesses", df_businesses). Runs in a worker process.
+    """
+    rng = np.random.default_rng(task["seed"])
+    if task["kind"] == "businesses":
+        return "businesses", generate_business_dataset(task["count"], task["scenario_params"], rng,
+                                                       task["first_id"], task["vocab"], task["reference_date"])
+
+    df_users = generate_user_dataset(task["count"], task["scenario_params"], rng, task["first_id"],
+                                     task["num_colliding"], task["collision_ips"], task["reference_date"],
+                                     task["vocab"])
+    df_relationships = link_users_to_businesses(
+        df_users["user_id"].to_numpy(),
+        task["num_businesses"],
+        ownership_probability=0.40,
+        max_businesses_per_user=10,
+        rng=rng
+    )
+    return "users", df_users, df_relationships
+
+def build_shard_tasks(num_users: int, num_businesses: int, scenario_params: dict, shards: int, seed=None,
+                      reference_date: date = None):
+    """
+    Shard tasks for a run. User shards, business shards and the run-wide IP pool each
+    get their own child of the root SeedSequence. Every shard dates its rows from the
+    same reference_date (default: today).
+    """
+    user_seed, biz_seed, shared_seed = root_seed(seed).spawn(3)
+    shared = {
+        "scenario_params": scenario_params,
+        "num_businesses": num_businesses,
+        "num_colliding": int(num_users * IP_COLLISION_RATIO),
+        "collision_ips": ipv4_public(IP_COLLISION_POOL, np.random.default_rng(shared_seed)),
+        "reference_date": reference_date or date.today(),
+        # Loaded once here, so every worker uses the same vocabulary even if the cache is unwritable
+        "vocab": load_vocabulary(),
+    }
+    tasks = []
+    # Businesses first: user enrichment needs their labels
+    for kind, total, parent in (("businesses", num_businesses, biz_seed), ("users", num_users, user_seed)):
+        ranges = shard_ranges(total, shards)
+        for (first_id, count), child in zip(ranges, parent.spawn(len(ranges))):
+            tasks.append({"kind": kind, "first_id": first_id, "count": count, "seed": child, **shared})
+    return tasks
 
 ###############################################################################
 # FEATURE ENRICHMENT
 ###############################################################################
 
-def enrich_user_features(df_users, df_relationships, df_businesses):
+def count_fraud_biz_owned(df_relationships: pd.DataFrame, first_id: int, count: int,
+                          biz_labels: np.ndarray) -> np.ndarray:
+    """Fraudulent businesses owned by each of the users first_id..first_id+count-1."""
+    users = df_relationships["user_id"].to_numpy(np.int64) - first_id
+    fraud = biz_labels[df_relationships["business_id"].to_numpy(np.int64) - 1]
+    return np.bincount(users, weights=fraud, minlength=count).astype(np.uint16)
+
+def count_ip_users(signup_ips: np.ndarray) -> np.ndarray:
+    """For every user, how many users share their signup IP (IPs as uint32)."""
+    _, inverse, counts = np.unique(signup_ips, return_inverse=True, return_counts=True)
+    return counts[inverse].astype(np.uint32)
+
+def enrich_user_features(df_users, ip_count, num_fraud_biz_owned):
     """
+    Enriches a chunk of users (as read back from synthetic_users):
     1) email_domain: separate out from 'email'
     2) ip_count: how many users share the same IP
     3) num_fraud_biz_owned: how many fraudulent businesses each user owns
+    ip_count and num_fraud_biz_owned are arrays over all users, indexed by user_id - 1.
     """
+    rows = pd.to_numeric(df_users['user_id']).to_numpy() - 1
+
     # 1) Email domain
-    df_users['email_domain'] = df_users['email'].apply(
-        lambda x: x.split('@')[-1] if x and '@' in str(x) else 'missing'
-    )
+    emails = df_users['email'].fillna('').astype(str)
+    df_users['email_domain'] = emails.str.split('@').str[-1].where(emails.str.contains('@', regex=False), 'missing')
 
     # 2) IP frequency
-    ip_counts = df_users.groupby('signup_ip')['user_id'].transform('count')
-    df_users['ip_count'] = ip_counts
+    df_users['ip_count'] = ip_count[rows]
 
     # 3) num_fraud_biz_owned
-    df_userbiz = df_relationships.merge(
-        df_businesses[['business_id','fraud_label']], on='business_id', how='left'
-    )
-    user_fraud_biz_count = df_userbiz.groupby('user_id')['fraud_label'].sum().reset_index(name='num_fraud_biz_owned')
-    df_users = df_users.merge(user_fraud_biz_count, on='user_id', how='left')
-    df_users['num_fraud_biz_owned'] = df_users['num_fraud_biz_owned'].fillna(0)
+    df_users['num_fraud_biz_owned'] = num_fraud_biz_owned[rows].astype(np.float64)
 
     return df_users
 
@@ -369,13 +348,27 @@ def main():
     parser.add_argument("--seed", type=int, default=None, help="Random seed for reproducibility. Default=None for no seed.")
     parser.add_argument("--scenario", type=str, default="default", choices=["default", "low_fraud", "high_fraud"],
                         help="Scenario-based config for base fraud rates.")
+    parser.add_argument("--shards", type=int, default=1,
+                        help="Split the user and business id ranges into at least this many shards, each with its "
+                             "own seed stream. Output depends on --seed, --shards and --chunk-size, not on --workers.")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="Max users/businesses per shard; more shards are used if needed.")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Processes generating shards. Default=min(shards, CPU count).")
+    parser.add_argument("--memory-budget-mb", type=float, default=DEFAULT_MEMORY_BUDGET_MB,
+                        help="Peak RSS budget for this process + its workers; fewer workers run if needed.")
+    parser.add_argument("--reference-date", type=date.fromisoformat, default=None,
+                        help="YYYY-MM-DD that signup, birth and incorporation dates are relative to. "
+                             f"Default=today, or {SEEDED_REFERENCE_DATE} when --seed is given.")
+    parser.add_argument("--output-format", type=str, default="csv", choices=FORMATS,
+                        help="csv (what load_scenario.py / neo4j_bulk_export.py read), or typed parquet, "
+                             "feather (both need pyarrow) or npz.")
     args = parser.parse_args()
-
-    # Optional seed for reproducibility
-    if args.seed is not None:
-        print(f"[INFO] Setting random seed to {args.seed}")
-        random.seed(args.seed)
-        Faker.seed(args.seed)
+    try:
+        check_format(args.output_format)
+    except ValueError as e:
+        parser.error(str(e))
+    fmt = args.output_format
 
     # Determine scenario-based parameters
     scenario = args.scenario
@@ -383,44 +376,93 @@ def main():
 
     num_users = args.num_users
     num_businesses = args.num_businesses
+    chunk_size = max(args.chunk_size, 1)
+    shards = max(args.shards, math.ceil(num_users / chunk_size), math.ceil(num_businesses / chunk_size))
+    chunk_rows = math.ceil(max(num_users, num_businesses) / shards)
+    state_bytes = num_users * USER_STATE_BYTES + num_businesses
+
+    requested = args.workers if args.workers is not None else default_workers(shards)
+    try:
+        workers = workers_for_budget(args.memory_budget_mb, chunk_rows, state_bytes, requested)
+    except ValueError as e:
+        parser.error(str(e))
 
     print(f"===== Synthetic Data Generation (Scenario: {scenario}) =====")
     print(f"User base fraud: {scenario_params['user_base_fraud']} | Biz base fraud: {scenario_params['biz_base_fraud']}")
-    print(f"Generating {num_users} users, {num_businesses} businesses...")
-
-    print("-> Creating user dataset...")
-    df_users = generate_user_dataset(num_users, scenario_params)
-    df_users.to_csv("synthetic_users.csv", index=False)
-    print(f"[DONE] synthetic_users.csv with {len(df_users)} records.")
-
-    print("-> Creating business dataset...")
-    df_businesses = generate_business_dataset(num_businesses, scenario_params)
-    df_businesses.to_csv("synthetic_businesses.csv", index=False)
-    print(f"[DONE] synthetic_businesses.csv with {len(df_businesses)} records.")
-
-    print("-> Linking users to businesses via relationships...")
-    df_relationships = link_users_to_businesses(
-        df_users,
-        df_businesses,
-        ownership_probability=0.40,
-        max_businesses_per_user=10
-    )
-    df_relationships.to_csv("user_business_relationships.csv", index=False)
-    print(f"[DONE] user_business_relationships.csv with {len(df_relationships)} records.")
+    print(f"Generating {num_users} users, {num_businesses} businesses in {shards} shard(s) on {workers} worker(s)...")
+    if workers < requested:
+        print(f"[INFO] Running {workers} of {requested} workers to stay within --memory-budget-mb {args.memory_budget_mb:.0f}")
+    print(f"[INFO] Expected peak RSS ~{estimate_mb(workers, chunk_rows, state_bytes):.0f} MB "
+          f"(budget {args.memory_budget_mb:.0f} MB)")
+
+    # Optional seed for reproducibility; a seeded run also needs a fixed "today"
+    reference_date = args.reference_date
+    if args.seed is not None:
+        print(f"[INFO] Setting random seed to {args.seed}")
+        reference_date = reference_date or SEEDED_REFERENCE_DATE
+    reference_date = reference_date or date.today()
+    print(f"[INFO] Dates relative to {reference_date}")
+    tasks = build_shard_tasks(num_users, num_businesses, scenario_params, shards, args.seed, reference_date)
+
+    print(f"-> Streaming business & user shards (+ user-business relationships) as {fmt}...")
+    categories = run_categories() if fmt != "csv" else None
+
+    # Compact per-node state carried between shards
+    biz_labels = np.zeros(num_businesses, dtype=np.int8)
+    signup_ips = np.zeros(num_users, dtype=np.uint32)
+    num_fraud_biz_owned = np.zeros(num_users, dtype=np.uint16)
+    user_fraud = 0
+
+    with open_table("synthetic_users", fmt, categories) as users_out, \
+            open_table("synthetic_businesses", fmt, categories) as businesses_out, \
+            open_table("user_business_relationships", fmt, categories) as relationships_out:
+        for result in iter_shards(generate_shard, tasks, workers):
+            if result[0] == "businesses":
+                df_businesses = result[1]
+                businesses_out.write(df_businesses)
+                biz_labels[df_businesses["business_id"].to_numpy() - 1] = df_businesses["fraud_label"].to_numpy()
+            else:
+                _, df_users, df_relationships = result
+                users_out.write(df_users)
+                relationships_out.write(df_relationships)
+                first_id = int(df_users["user_id"].iloc[0])
+                rows = slice(first_id - 1, first_id - 1 + len(df_users))
+                signup_ips[rows] = ipv4_to_int(df_users["signup_ip"])
+                num_fraud_biz_owned[rows] = count_fraud_biz_owned(df_relationships, first_id, len(df_users),
+                                                                  biz_labels)
+                user_fraud += int(df_users["fraud_label"].sum())
+            del result
+            print(f"[Stream] businesses {businesses_out.rows}/{num_businesses}, users {users_out.rows}/{num_users} "
+                  f"| peak RSS {peak_rss_mb()[0] or 0:.0f} MB")
+
+    for out in (users_out, businesses_out, relationships_out):
+        print(f"[DONE] {table_path(out.stem, fmt)} with {out.rows} records.")
 
     print("-> Enriching user dataset (email_domain, ip_count, num_fraud_biz_owned)...")
-    df_users_enriched = enrich_user_features(df_users, df_relationships, df_businesses)
-    df_users_enriched.to_csv("synthetic_users_enriched.csv", index=False)
-    print("[DONE] synthetic_users_enriched.csv generated.")
+    ip_count = count_ip_users(signup_ips)
+    del signup_ips
+    # csv chunks come back as plain strings, so every original column is written out unchanged
+    with open_table("synthetic_users_enriched", fmt, categories) as enriched_out:
+        for df_chunk in iter_table("synthetic_users", fmt, chunk_rows):
+            enriched_out.write(enrich_user_features(df_chunk, ip_count, num_fraud_biz_owned))
+    print(f"[DONE] {table_path(enriched_out.stem, fmt)} generated.")
 
     # Optional summary stats
-    user_fraud_ratio = df_users_enriched['fraud_label'].mean()
-    business_fraud_ratio = df_businesses['fraud_label'].mean()
+    user_fraud_ratio = user_fraud / max(num_users, 1)
+    business_fraud_ratio = biz_labels.mean() if num_businesses else 0.0
 
     print("\n===== Summary Stats =====")
     print(f"User Fraud Ratio: {user_fraud_ratio:.2%}")
     print(f"Business Fraud Ratio: {business_fraud_ratio:.2%}")
-    print("All CSV files generated successfully. Enjoy your advanced synthetic dataset!")
+    main_mb, worker_mb = peak_rss_mb()
+    if main_mb is not None:
+        total_mb = main_mb + (worker_mb * workers if workers > 1 else 0)
+        workers_note = f", largest worker {worker_mb:.0f} MB" if workers > 1 else ""
+        print(f"Peak RSS: main {main_mb:.0f} MB{workers_note} "
+              f"(~{total_mb:.0f} MB total, budget {args.memory_budget_mb:.0f} MB)")
+        if total_mb > args.memory_budget_mb:
+            print("[WARN] Peak RSS went over --memory-budget-mb; lower --chunk-size or --workers.")
+    print(f"All {fmt} files generated successfully. Enjoy your advanced synthetic dataset!")
 
 if __name__ == "__main__":
     main()
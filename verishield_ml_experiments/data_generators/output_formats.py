@@ -0,0 +1,293 @@
+# verishield_ml_experiments/data_generators/output_formats.py
+"""
+output_formats.py
+
+Typed, chunked output for the generator scripts (--output-format).
+
+  csv      {name}.csv: text, written exactly as before
+  parquet  {name}.parquet: one row group per chunk (needs pyarrow)
+  feather  {name}.feather: Arrow IPC file, one record batch per chunk (needs pyarrow)
+  npz      {name}-00000.npz, {name}-00001.npz, ...: one NumPy archive per chunk
+
+For every format but csv, columns are typed by name before they are written:
+
+  user_id, business_id, ip_id, from_user_id, to_user_id   int32
+  fraud_label                                             int8
+  ip_count                                                int32
+  num_fraud_biz_owned                                     int16
+  burst_signup, is_ring_leader                            bool
+  created_at, birthdate, incorporation_date               timestamp
+  segment, gender, country_code, registration_country     categorical
+
+Categories are fixed for the whole run (see run_categories), so every chunk carries the
+same dictionary. The Arrow IPC file format requires that. Columns without a known
+category list stay strings. Integer and bool columns with missing values use pandas'
+nullable dtypes.
+
+npz keeps only NumPy types: a categorical is stored as int16 codes (-1 = missing) plus
+a "<column>__categories" array. A nullable int or bool column is stored as plain values
+(0 / False where missing) plus a "<column>__mask" bool array that is True where the value
+is missing, and comes back from read_table()/iter_table() with the missing values restored.
+A missing string becomes "". The archives are not compressed: zlib over fixed-width
+UTF-32 strings is slower than writing the CSV, so npz trades disk (~3-4x the CSV) for
+fast writes and reads. Use parquet or feather for compact files. read_table() and
+iter_table() read any format back, e.g. in the GNN data-prep notebooks.
+"""
+
+import glob
+import os
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow is optional; only parquet and feather need it
+    pa = None
+    pq = None
+
+FORMATS = ("csv", "parquet", "feather", "npz")
+DEFAULT_CHUNK_ROWS = 250_000
+
+ID_COLUMNS = ("user_id", "business_id", "ip_id", "from_user_id", "to_user_id")
+INT_COLUMNS = {"fraud_label": "int8", "ip_count": "int32", "num_fraud_biz_owned": "int16",
+               **{column: "int32" for column in ID_COLUMNS}}
+BOOL_COLUMNS = ("burst_signup", "is_ring_leader")
+TIMESTAMP_COLUMNS = ("created_at", "birthdate", "incorporation_date")
+CATEGORY_SUFFIX = "__categories"
+MASK_SUFFIX = "__mask"
+
+
+def check_format(fmt: str):
+    """Raises ValueError for unknown formats, or for parquet/feather without pyarrow."""
+    if fmt not in FORMATS:
+        raise ValueError(f"unknown output format {fmt!r}; choose from {', '.join(FORMATS)}")
+    if fmt in ("parquet", "feather") and pa is None:
+        raise ValueError(f"--output-format {fmt} needs pyarrow (pip install pyarrow)")
+
+
+def run_categories(segments=()) -> dict:
+    """Fixed category lists for a run: generator segments, genders and the vocabulary's country codes."""
+    from bulk_identities import load_vocabulary
+
+    countries = sorted(load_vocabulary()["country_codes"])
+    categories = {"gender": ["F", "M"], "country_code": countries, "registration_country": countries}
+    if segments:
+        categories["segment"] = list(segments)
+    return categories
+
+###############################################################################
+# SCHEMA
+###############################################################################
+def _int(series, dtype):
+    values = pd.to_numeric(series, errors="coerce")
+    if values.isna().any():
+        return values.astype(dtype.capitalize())  # nullable Int8/Int16/Int32
+    return values.astype(dtype)
+
+
+def _bool(series):
+    if series.dtype == bool:
+        return series
+    values = series.map({True: True, False: False, "True": True, "False": False, "true": True, "false": False})
+    return values.astype("boolean") if values.isna().any() else values.astype(bool)
+
+
+def apply_schema(df: pd.DataFrame, categories: dict = None) -> pd.DataFrame:
+    """A typed copy of `df` (see the module docstring); works on text or already-typed columns."""
+    categories = categories or {}
+    df = df.copy()
+    for column in df.columns:
+        if column in INT_COLUMNS:
+            df[column] = _int(df[column], INT_COLUMNS[column])
+        elif column in BOOL_COLUMNS:
+            df[column] = _bool(df[column])
+        elif column in TIMESTAMP_COLUMNS:
+            df[column] = pd.to_datetime(df[column].replace("", None), errors="coerce")
+        elif column in categories:
+            values = df[column].astype(object).where(df[column].notna(), None)
+            df[column] = pd.Categorical(values, categories=categories[column])
+    return df
+
+###############################################################################
+# WRITERS
+###############################################################################
+def table_path(stem: str, fmt: str) -> str:
+    return f"{stem}-00000.npz" if fmt == "npz" else f"{stem}.{fmt}"
+
+
+class TableWriter:
+    """Appends DataFrame chunks to one output table; use open_table() to get one."""
+
+    def __init__(self, stem: str, categories: dict = None):
+        self.stem = stem
+        self.categories = categories
+        self.rows = 0
+        self.chunks = 0
+
+    def write(self, df: pd.DataFrame):
+        self._write(df)
+        self.rows += len(df)
+        self.chunks += 1
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class CsvWriter(TableWriter):
+    """Text, exactly like DataFrame.to_csv(index=False); the header is written once."""
+
+    def _write(self, df):
+        df.to_csv(f"{self.stem}.csv", mode="a" if self.chunks else "w", header=not self.chunks, index=False)
+
+
+class _ArrowWriter(TableWriter):
+    def __init__(self, stem, categories=None):
+        super().__init__(stem, categories)
+        self._writer = None
+        self._schema = None
+
+    def _table(self, df):
+        table = pa.Table.from_pandas(apply_schema(df, self.categories), preserve_index=False)
+        if self._schema is None:
+            # A column that is all-null in the first chunk would otherwise be typed "null" for good
+            self._schema = pa.schema([
+                field.with_type(pa.string()) if pa.types.is_null(field.type) else field for field in table.schema
+            ], metadata=table.schema.metadata)
+        return table.cast(self._schema)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+class ParquetWriter(_ArrowWriter):
+    def _write(self, df):
+        table = self._table(df)
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(f"{self.stem}.parquet", self._schema)
+        self._writer.write_table(table)
+
+
+class FeatherWriter(_ArrowWriter):
+    def _write(self, df):
+        table = self._table(df)
+        if self._writer is None:
+            options = pa.ipc.IpcWriteOptions(compression="lz4" if pa.Codec.is_available("lz4") else None)
+            self._writer = pa.ipc.new_file(f"{self.stem}.feather", self._schema, options=options)
+        self._writer.write_table(table)
+
+
+class NpzWriter(TableWriter):
+    def __init__(self, stem, categories=None):
+        super().__init__(stem, categories)
+        for stale in glob.glob(f"{glob.escape(stem)}-[0-9][0-9][0-9][0-9][0-9].npz"):
+            os.remove(stale)
+
+    def _write(self, df):
+        arrays = {}
+        for column, series in apply_schema(df, self.categories).items():
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                arrays[column] = series.cat.codes.to_numpy(np.int16)
+                arrays[column + CATEGORY_SUFFIX] = np.asarray(series.cat.categories, dtype=str)
+            elif isinstance(series.dtype, pd.BooleanDtype) or (
+                    pd.api.types.is_extension_array_dtype(series.dtype) and pd.api.types.is_integer_dtype(series.dtype)):
+                # 0/False alone would be indistinguishable from a real value
+                arrays[column] = series.to_numpy(series.dtype.numpy_dtype, na_value=0)
+                arrays[column + MASK_SUFFIX] = series.isna().to_numpy()
+            elif pd.api.types.is_numeric_dtype(series.dtype) or pd.api.types.is_datetime64_any_dtype(series.dtype):
+                arrays[column] = series.to_numpy()
+            else:
+                arrays[column] = series.fillna("").astype(str).to_numpy(dtype=str)
+        np.savez(f"{self.stem}-{self.chunks:05d}.npz", **arrays)
+
+
+_WRITERS = {"csv": CsvWriter, "parquet": ParquetWriter, "feather": FeatherWriter, "npz": NpzWriter}
+
+
+def open_table(stem: str, fmt: str = "csv", categories: dict = None) -> TableWriter:
+    """A chunk writer for `stem` (a path without extension) in `fmt`."""
+    check_format(fmt)
+    return _WRITERS[fmt](stem, categories)
+
+
+def write_table(df: pd.DataFrame, stem: str, fmt: str = "csv", categories: dict = None,
+                chunk_rows: int = DEFAULT_CHUNK_ROWS) -> str:
+    """Writes an in-memory frame in chunks of `chunk_rows`; returns the (first) file written."""
+    with open_table(stem, fmt, categories) as writer:
+        for start in range(0, max(len(df), 1), chunk_rows):
+            writer.write(df.iloc[start:start + chunk_rows])
+    return table_path(stem, fmt)
+
+###############################################################################
+# READERS
+###############################################################################
+def _npz_frame(path):
+    with np.load(path, allow_pickle=False) as archive:
+        columns = {}
+        for key in archive.files:
+            if key.endswith((CATEGORY_SUFFIX, MASK_SUFFIX)):
+                continue
+            values = archive[key]
+            if key + CATEGORY_SUFFIX in archive.files:
+                values = pd.Categorical.from_codes(values, archive[key + CATEGORY_SUFFIX])
+            elif key + MASK_SUFFIX in archive.files:
+                mask = archive[key + MASK_SUFFIX]
+                values = (pd.arrays.BooleanArray(values, mask) if values.dtype == bool
+                          else pd.arrays.IntegerArray(values, mask))
+            columns[key] = values
+        return pd.DataFrame(columns)
+
+
+def _nullable(df):
+    """
+    Arrow keeps the pandas dtype of the first chunk, so an int or bool column that only has
+    gaps in later chunks would come back as float/object; give it the nullable dtype instead.
+    """
+    for column in df.columns:
+        if column in INT_COLUMNS and not pd.api.types.is_integer_dtype(df[column].dtype):
+            df[column] = _int(df[column], INT_COLUMNS[column])
+        elif column in BOOL_COLUMNS and not pd.api.types.is_bool_dtype(df[column].dtype):
+            df[column] = _bool(df[column])
+    return df
+
+
+def iter_table(stem: str, fmt: str = "csv", chunk_rows: int = DEFAULT_CHUNK_ROWS):
+    """
+    Yields a table back chunk by chunk. csv chunks are plain text (every column str,
+    nothing parsed as NA) so they can be rewritten unchanged; other formats come back typed.
+    """
+    check_format(fmt)
+    if fmt == "csv":
+        yield from pd.read_csv(f"{stem}.csv", chunksize=chunk_rows, dtype=str, keep_default_na=False)
+    elif fmt == "parquet":
+        for batch in pq.ParquetFile(f"{stem}.parquet").iter_batches(batch_size=chunk_rows):
+            yield _nullable(batch.to_pandas())
+    elif fmt == "feather":
+        with pa.memory_map(f"{stem}.feather") as source:
+            reader = pa.ipc.open_file(source)
+            for i in range(reader.num_record_batches):
+                yield _nullable(reader.get_batch(i).to_pandas())
+    else:
+        for path in sorted(glob.glob(f"{glob.escape(stem)}-[0-9][0-9][0-9][0-9][0-9].npz")):
+            yield _npz_frame(path)
+
+
+def read_table(stem: str, fmt: str = "csv") -> pd.DataFrame:
+    """A whole table as one DataFrame (csv goes through pd.read_csv's usual type inference)."""
+    check_format(fmt)
+    if fmt == "csv":
+        return pd.read_csv(f"{stem}.csv")
+    if fmt == "parquet":
+        return _nullable(pd.read_parquet(f"{stem}.parquet"))
+    if fmt == "feather":
+        return _nullable(pd.read_feather(f"{stem}.feather"))
+    return pd.concat(list(iter_table(stem, fmt)), ignore_index=True)
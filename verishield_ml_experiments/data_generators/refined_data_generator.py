@@ -8,7 +8,7 @@ Changes in this version:
 ------------------------
 1. A new command-line argument: --output-dir (default: "./data")
    - This sets a parent directory where subfolders for each scenario are created.
-2. All CSV outputs go to:  {output_dir}/{scenario}/
+2. All outputs (CSV unless --output-format says otherwise) go to:  {output_dir}/{scenario}/
    e.g., ./data/high_fraud/synthetic_users.csv
 3. If the subfolder doesn't exist, it's created automatically.
 """
@@ -17,9 +17,13 @@ import os
 import random
 import argparse
 import pandas as pd
-from faker import Faker
+import numpy as np
 from datetime import timedelta, datetime
 
+from bulk_identities import IdentitySynth, RANDOM_PREFIX, ipv4_public
+from output_formats import FORMATS, check_format, run_categories, write_table
+from synergy_labeling import SynergyLabeler
+
 ###############################################################################
 # GLOBAL DEFAULTS & CONFIG
 ###############################################################################
@@ -28,8 +32,6 @@ DEFAULT_NUM_BUSINESSES = 10_000
 DEFAULT_OUTPUT_DIR = "./data"
 MISSING_FIELD_PROB = 0.02  # 2% chance to null out certain fields
 
-fake = Faker()
-
 # Adjust to your liking for advanced distribution
 USER_SEGMENTS = {
     "casual":     (0.70, 0.0),   # 70% of users, normal base
@@ -63,121 +65,55 @@ SUSPICIOUS_EMAIL_DOMAINS = [
 # STEP 1: GENERATE UNLABELED USERS & BUSINESSES
 ###############################################################################
 
-def pick_user_segment() -> str:
-    r = random.random()
-    cumulative = 0.0
-    for seg, (prob, _) in USER_SEGMENTS.items():
-        cumulative += prob
-        if r < cumulative:
-            return seg
-    return "casual"  # fallback
+def pick_user_segments(num_users: int) -> np.ndarray:
+    names = list(USER_SEGMENTS)
+    probs = [prob for prob, _ in USER_SEGMENTS.values()]
+    return np.random.choice(names, size=num_users, p=probs)
 
 def generate_unlabeled_users(num_users: int):
-    users = []
-    collision_map = _build_ip_collision_map(num_users, ratio=0.20)
     base_start = datetime.now() - timedelta(days=90)
+    identities = IdentitySynth().users(
+        num_users, COUNTRY_PHONE_PREFIXES, ["+999", "+000", "555-", RANDOM_PREFIX], MISSING_FIELD_PROB
+    )
 
-    for i in range(num_users):
-        user_id = i + 1
-        user = _create_base_user_record(user_id, collision_map, base_start)
-        users.append(user)
-
-    return pd.DataFrame(users)
-
-def _build_ip_collision_map(total_users: int, ratio: float = 0.20):
-    num_colliding = int(total_users * ratio)
-    # Limit distinct IPs to reduce collisions
-    repeated_ips = [fake.ipv4_public() for _ in range(500)]
-    mapping = {}
-    for i in range(num_colliding):
-        ip_choice = random.choice(repeated_ips)
-        mapping[i+1] = {
-            "ip": ip_choice,
-            "device_id": fake.lexify(text="device_????????")
-        }
-    return mapping
-
-def _create_base_user_record(user_id: int, collision_map: dict, base_start: datetime):
-    profile = fake.simple_profile()
-    collision_entry = collision_map.get(user_id)
-
-    if collision_entry:
-        signup_ip = collision_entry["ip"]
-        device_id = collision_entry["device_id"]
-    else:
-        signup_ip = fake.ipv4_public()
-        device_id = fake.lexify(text="device_????????")
-
-    cc = fake.country_code()
-    prefix_list = COUNTRY_PHONE_PREFIXES.get(cc, [])
-    if not prefix_list:
-        prefix_list = ["+999", "+000", "555-", fake.msisdn()[:3]]
-    prefix = random.choice(prefix_list)
-    phone_val = prefix + str(random.randint(1000000, 9999999))
-
-    days_offset = random.randint(0, 90)
-    suspicious_burst = False
-    if random.random() < 0.05:
-        suspicious_burst = True
-        created_dt = base_start + timedelta(days=days_offset, seconds=random.randint(0, 60))
-    else:
-        created_dt = base_start + timedelta(days=days_offset, seconds=random.randint(0, 86400))
-
-    seg = pick_user_segment()
-
-    user_dict = {
-        "user_id": user_id,
-        "segment": seg,
-        "name": profile["name"],
-        "email": profile["mail"],
-        "username": profile["username"],
-        "birthdate": profile["birthdate"].isoformat() if profile["birthdate"] else None,
-        "gender": profile["sex"],
-        "signup_ip": signup_ip,
-        "device_id": device_id,
-        "phone": phone_val,
-        "country_code": cc,
-        "created_at": created_dt,
+    days_offset = np.random.randint(0, 91, size=num_users)
+    suspicious_burst = np.random.random(num_users) < 0.05
+    seconds = np.where(suspicious_burst, np.random.randint(0, 61, size=num_users),
+                       np.random.randint(0, 86401, size=num_users))
+    created_at = (pd.Timestamp(base_start) + pd.to_timedelta(days_offset, unit="D")
+                  + pd.to_timedelta(seconds, unit="s"))
+
+    return pd.DataFrame({
+        "user_id": np.arange(1, num_users + 1),
+        "segment": pick_user_segments(num_users),
+        "name": identities["name"],
+        "email": identities["email"],
+        "username": identities["username"],
+        "birthdate": identities["birthdate"],
+        "gender": identities["gender"],
+        "signup_ip": _signup_ips(num_users, ratio=0.20),
+        "device_id": identities["device_id"],
+        "phone": identities["phone"],
+        "country_code": identities["country_code"],
+        "created_at": created_at,
         "burst_signup": suspicious_burst,
         "fraud_label": None,
-    }
+    })
 
-    # Random missing fields
-    for f in ["name", "email", "phone", "country_code"]:
-        if random.random() < MISSING_FIELD_PROB:
-            user_dict[f] = None
-
-    return user_dict
+def _signup_ips(total_users: int, ratio: float = 0.20) -> np.ndarray:
+    """The first `ratio` of users share a pool of 500 IPs; everyone else gets their own."""
+    num_colliding = int(total_users * ratio)
+    # Limit distinct IPs to reduce collisions
+    repeated_ips = ipv4_public(500)
+    ips = ipv4_public(total_users)
+    ips[:num_colliding] = repeated_ips[np.random.randint(0, len(repeated_ips), size=num_colliding)]
+    return ips
 
 def generate_unlabeled_businesses(num_businesses: int):
-    biz_list = []
-    for i in range(num_businesses):
-        biz_id = i + 1
-        biz_name = random.choice([
-            fake.company(),
-            fake.company_suffix(),
-            "FakeCo " + fake.word(),
-            fake.bs(),
-            "Phantom Inc " + fake.color_name()
-        ])
-        reg_ctry = fake.country_code()
-        biz_dict = {
-            "business_id": biz_id,
-            "business_name": biz_name,
-            "registration_country": reg_ctry,
-            "incorporation_date": fake.date_between(start_date="-15y", end_date="today"),
-            "owner_name": fake.name(),
-            "fraud_label": None,
-        }
-
-        if random.random() < MISSING_FIELD_PROB:
-            biz_dict["registration_country"] = None
-        if random.random() < MISSING_FIELD_PROB:
-            biz_dict["owner_name"] = None
-
-        biz_list.append(biz_dict)
-
-    return pd.DataFrame(biz_list)
+    df = IdentitySynth().businesses(num_businesses, MISSING_FIELD_PROB)
+    df.insert(0, "business_id", np.arange(1, num_businesses + 1))
+    df["fraud_label"] = None
+    return df
 
 ###############################################################################
 # STEP 2: USER-USER RELATIONSHIPS
@@ -227,103 +163,7 @@ def link_users_to_businesses(df_users: pd.DataFrame, df_biz: pd.DataFrame,
     return pd.DataFrame(relationships)
 
 ###############################################################################
-# STEP 4: MULTI-PASS LABEL ASSIGNMENT
-###############################################################################
-
-def assign_fraud_labels_users(df_users: pd.DataFrame, df_biz: pd.DataFrame,
-                              df_user_biz: pd.DataFrame, df_user_user: pd.DataFrame,
-                              scenario_params: dict, iteration=1):
-    user_base_fraud = scenario_params["user_base_fraud"]
-    # business label map
-    biz_fraud_map = dict(zip(df_biz["business_id"], df_biz["fraud_label"]))
-    # coalesce None => 0
-    for k, v in biz_fraud_map.items():
-        if v is None:
-            biz_fraud_map[k] = 0
-
-    user_to_biz = df_user_biz.groupby("user_id")["business_id"].apply(list).to_dict()
-
-    new_labels = []
-    for idx, row in df_users.iterrows():
-        p = user_base_fraud
-        seg = row.get("segment", "casual")
-        _, seg_fraud_mod = USER_SEGMENTS.get(seg, (1.0, 0.0))
-        p += seg_fraud_mod
-
-        email = (row.get("email") or "").lower()
-        if any(d in email for d in SUSPICIOUS_EMAIL_DOMAINS):
-            p += 0.20
-        phone = str(row.get("phone") or "")
-        if len(phone) < 7:
-            p += 0.10
-        elif any(x in phone for x in ["+999", "666-666"]):
-            p += 0.15
-        if row.get("burst_signup"):
-            p += 0.15
-
-        if row.get("is_ring_leader", False):
-            p += 0.30
-
-        owned_biz_ids = user_to_biz.get(row["user_id"], [])
-        known_fraud_biz_count = sum(biz_fraud_map.get(bid, 0) for bid in owned_biz_ids)
-        p += 0.05 * known_fraud_biz_count
-
-        label = 1 if random.random() < max(0, p) else 0
-
-        # forced overrides
-        if label == 0 and p < 0.2 and random.random() < 0.02:
-            label = 1
-        if label == 1 and p > 0.4 and random.random() < 0.02:
-            label = 0
-
-        new_labels.append(label)
-
-    df_users["fraud_label"] = new_labels
-    return df_users
-
-
-def assign_fraud_labels_businesses(df_users: pd.DataFrame, df_biz: pd.DataFrame,
-                                   df_user_biz: pd.DataFrame, scenario_params: dict, iteration=1):
-    biz_base_fraud = scenario_params["biz_base_fraud"]
-    user_fraud_map = dict(zip(df_users["user_id"], df_users["fraud_label"]))
-    # coalesce None => 0
-    for k, v in user_fraud_map.items():
-        if v is None:
-            user_fraud_map[k] = 0
-
-    biz_to_users = df_user_biz.groupby("business_id")["user_id"].apply(list).to_dict()
-
-    new_labels = []
-    for idx, row in df_biz.iterrows():
-        p = biz_base_fraud
-        bname = (row.get("business_name") or "").lower()
-        if any(k in bname for k in ["test", "fake", "shell", "phantom", "bogus", "shady"]):
-            p += 0.15
-        reg_ctry = (row.get("registration_country") or "").upper()
-        if reg_ctry in WATCHLIST_COUNTRIES:
-            p += 0.20
-
-        if random.random() < 0.03:
-            p += 0.10
-
-        owners = biz_to_users.get(row["business_id"], [])
-        num_fraud_owners = sum(user_fraud_map.get(uid, 0) for uid in owners)
-        p += 0.10 * num_fraud_owners
-
-        label = 1 if random.random() < max(0, p) else 0
-
-        if label == 0 and p < 0.2 and random.random() < 0.02:
-            label = 1
-        if label == 1 and p > 0.4 and random.random() < 0.02:
-            label = 0
-
-        new_labels.append(label)
-
-    df_biz["fraud_label"] = new_labels
-    return df_biz
-
-###############################################################################
-# STEP 5: FEATURE ENRICHMENT
+# STEP 4: FEATURE ENRICHMENT
 ###############################################################################
 
 def enrich_user_features(df_users, df_user_biz, df_biz):
@@ -357,12 +197,18 @@ def main():
     parser.add_argument("--iterations", type=int, default=1)
     parser.add_argument("--output-dir", type=str, default=DEFAULT_OUTPUT_DIR,
                         help="Parent directory to store scenario subfolders. Default=./data")
+    parser.add_argument("--output-format", type=str, default="csv", choices=FORMATS,
+                        help="csv (default), or typed parquet, feather (both need pyarrow) or npz.")
     args = parser.parse_args()
+    try:
+        check_format(args.output_format)
+    except ValueError as e:
+        parser.error(str(e))
 
     # Set seeds
     if args.seed is not None:
         random.seed(args.seed)
-        Faker.seed(args.seed)
+        np.random.seed(args.seed)
         print(f"[INFO] Seed set to {args.seed}")
 
     scenario_params = SCENARIO_CONFIG.get(args.scenario, SCENARIO_CONFIG["default"])
@@ -389,15 +235,16 @@ def main():
                                            max_biz_per_user=10)
     print(f"[INFO] Created {len(df_user_biz)} user-business relationships.")
 
-    # 4) Multi-pass labeling
+    # 4) Multi-pass labeling (owned-business synergy only; ring leaders via their own flag)
+    labeler = SynergyLabeler(df_users, df_biz, df_user_biz=df_user_biz,
+                             segments=USER_SEGMENTS, email_domains=SUSPICIOUS_EMAIL_DOMAINS,
+                             watchlist=WATCHLIST_COUNTRIES)
     for i in range(args.iterations):
         print(f"-> Labeling pass {i+1} of {args.iterations}...")
-        df_users = assign_fraud_labels_users(
-            df_users, df_biz, df_user_biz, df_user_user, scenario_params, iteration=i+1
-        )
-        df_biz = assign_fraud_labels_businesses(
-            df_users, df_biz, df_user_biz, scenario_params, iteration=i+1
-        )
+        labeler.label_users(scenario_params["user_base_fraud"], ring_weight=0, ip_weight=0, overrides=True)
+        labeler.label_businesses(scenario_params["biz_base_fraud"], overrides=True)
+    df_users["fraud_label"] = labeler.user_labels
+    df_biz["fraud_label"] = labeler.biz_labels
 
     # 5) Enrichment
     df_users = enrich_user_features(df_users, df_user_biz, df_biz)
@@ -405,18 +252,13 @@ def main():
     # Prepare output directory
     scenario_dir = os.path.join(args.output_dir, scenario_name)
     os.makedirs(scenario_dir, exist_ok=True)
-    print(f"-> CSV outputs will be saved to: {scenario_dir}")
-
-    # Write CSVs
-    users_csv = os.path.join(scenario_dir, "synthetic_users.csv")
-    biz_csv = os.path.join(scenario_dir, "synthetic_businesses.csv")
-    rel_user_biz_csv = os.path.join(scenario_dir, "user_business_relationships.csv")
-    rel_user_user_csv = os.path.join(scenario_dir, "user_user_relationships.csv")
-
-    df_users.to_csv(users_csv, index=False)
-    df_biz.to_csv(biz_csv, index=False)
-    df_user_biz.to_csv(rel_user_biz_csv, index=False)
-    df_user_user.to_csv(rel_user_user_csv, index=False)
+    print(f"-> {args.output_format} outputs will be saved to: {scenario_dir}")
+
+    # Write outputs
+    categories = run_categories(USER_SEGMENTS) if args.output_format != "csv" else None
+    for name, df in (("synthetic_users", df_users), ("synthetic_businesses", df_biz),
+                     ("user_business_relationships", df_user_biz), ("user_user_relationships", df_user_user)):
+        write_table(df, os.path.join(scenario_dir, name), args.output_format, categories)
 
     # Summaries
     u_fraud_rate = df_users["fraud_label"].mean() if "fraud_label" in df_users.columns else 0
@@ -17,10 +17,13 @@ import os
 import random
 import argparse
 import pandas as pd
-from faker import Faker
 from datetime import timedelta, datetime
 import numpy as np
 
+from bulk_identities import IdentitySynth, RANDOM_PREFIX, ipv4_public
+from output_formats import FORMATS, check_format, run_categories, write_table
+from synergy_labeling import SynergyLabeler, flip
+
 ###############################################################################
 # GLOBAL DEFAULTS & CONFIG
 ###############################################################################
@@ -32,8 +35,6 @@ MISSING_FIELD_PROB = 0.02         # 2% chance to null out certain fields
 RANDOM_LABEL_FLIP_PROB = 0.01     # ~1% chance to flip a label after final pass
 NUM_WAVES = 3                     # number of "fraud waves" for user signups
 
-fake = Faker()
-
 # user segments as before
 USER_SEGMENTS = {
     "casual":     (0.70, 0.0),
@@ -85,15 +86,11 @@ def get_scenario_params(scenario_name: str):
 ###############################################################################
 # PICK SEGMENT FOR USERS
 ###############################################################################
-def pick_user_segment() -> str:
-    """Randomly selects a user segment (casual, smb_owner, enterprise, money_mule)."""
-    r = random.random()
-    cumulative = 0.0
-    for seg, (prob, _) in USER_SEGMENTS.items():
-        cumulative += prob
-        if r < cumulative:
-            return seg
-    return "casual"  # fallback
+def pick_user_segments(num_users: int) -> np.ndarray:
+    """Draws a user segment (casual, smb_owner, enterprise, money_mule) for every user."""
+    names = list(USER_SEGMENTS)
+    probs = [prob for prob, _ in USER_SEGMENTS.values()]
+    return np.random.choice(names, size=num_users, p=probs)
 
 ###############################################################################
 # 2) WAVES FOR USER SIGNUPS
@@ -102,22 +99,16 @@ def create_time_waves(num_users: int, wave_count=3):
     """
     Assign each user to a "wave," giving them a day offset + second offset,
     plus a wave_fraud_boost factor to amplify base fraud in that wave.
+    Returns (day_offset, seconds_in_day, wave_fraud_boost) arrays.
     """
-    waves = []
-    for _ in range(wave_count):
-        start_day = random.randint(0, 60)            # wave starts within first 60 days
-        length    = random.randint(5, 15)           # wave length 5..15 days
-        end_day   = start_day + length
-        fraud_boost = random.uniform(0.1, 0.3)      # each wave adds +0.1..0.3 to user fraud
-        waves.append((start_day, end_day, fraud_boost))
-
-    assignments = []
-    for _ in range(num_users):
-        wave = random.choice(waves)
-        day_offset = random.randint(wave[0], wave[1])
-        seconds_in_day = random.randint(0, 86400)
-        assignments.append((day_offset, seconds_in_day, wave[2]))
-    return assignments
+    start_day = np.random.randint(0, 61, size=wave_count)                # wave starts within first 60 days
+    end_day = start_day + np.random.randint(5, 16, size=wave_count)      # wave length 5..15 days
+    fraud_boost = np.random.uniform(0.1, 0.3, size=wave_count)           # each wave adds +0.1..0.3 to user fraud
+
+    wave = np.random.randint(0, wave_count, size=num_users)
+    day_offset = np.random.randint(start_day[wave], end_day[wave] + 1)
+    seconds_in_day = np.random.randint(0, 86401, size=num_users)
+    return day_offset, seconds_in_day, fraud_boost[wave]
 
 ###############################################################################
 # 3) IP NODE GENERATION
@@ -126,10 +117,9 @@ def generate_ip_nodes(total_ips=5000):
     """
     Create a DF of IP nodes. We'll store: ip_id, ip_addr.
     """
-    ip_list = [fake.ipv4_public() for _ in range(total_ips)]
     ip_nodes = pd.DataFrame({
         "ip_id": range(1, total_ips+1),
-        "ip_addr": ip_list
+        "ip_addr": ipv4_public(total_ips)
     })
     return ip_nodes
 
@@ -170,94 +160,44 @@ def generate_unlabeled_users(num_users: int):
     Now we incorporate 'wave_fraud_boost' from time waves, storing them in user records.
     """
     base_start = datetime.now() - timedelta(days=90)
-    wave_info = create_time_waves(num_users, wave_count=NUM_WAVES)
-
-    users = []
-    for i in range(num_users):
-        user_id = i + 1
-        day_offset, seconds_in_day, wave_boost = wave_info[i]
-        user_dict = _create_base_user_record(user_id, base_start, day_offset, seconds_in_day, wave_boost)
-        users.append(user_dict)
-
-    return pd.DataFrame(users)
-
-def _create_base_user_record(user_id: int, base_start: datetime, day_offset: int, seconds_in_day: int, wave_boost: float):
-    profile = fake.simple_profile()
-
-    # phone logic
-    cc = fake.country_code()
-    prefix_list = COUNTRY_PHONE_PREFIXES.get(cc, [])
-    if not prefix_list:
-        prefix_list = ["+999", "+000", "555-", fake.msisdn()[:3]]
-    prefix = random.choice(prefix_list)
-    phone_val = prefix + str(random.randint(1000000, 9999999))
-
-    # decide if user is part of a "suspicious_burst"
-    suspicious_burst = False
+    day_offset, seconds_in_day, wave_boost = create_time_waves(num_users, wave_count=NUM_WAVES)
+    identities = IdentitySynth().users(
+        num_users, COUNTRY_PHONE_PREFIXES, ["+999", "+000", "555-", RANDOM_PREFIX], MISSING_FIELD_PROB
+    )
+
+    # decide which users are part of a "suspicious_burst":
     # 5% chance we shorten the daily second range
-    if random.random() < 0.05:
-        suspicious_burst = True
-        seconds_in_day = random.randint(0, 60)
-
-    created_dt = base_start + timedelta(days=day_offset, seconds=seconds_in_day)
-
-    seg = pick_user_segment()
-    user_dict = {
-        "user_id": user_id,
-        "segment": seg,
-        "name": profile["name"],
-        "email": profile["mail"],
-        "username": profile["username"],
-        "birthdate": profile["birthdate"].isoformat() if profile["birthdate"] else None,
-        "gender": profile["sex"],
+    suspicious_burst = np.random.random(num_users) < 0.05
+    seconds_in_day = np.where(suspicious_burst, np.random.randint(0, 61, size=num_users), seconds_in_day)
+    created_at = (pd.Timestamp(base_start) + pd.to_timedelta(day_offset, unit="D")
+                  + pd.to_timedelta(seconds_in_day, unit="s"))
+
+    return pd.DataFrame({
+        "user_id": np.arange(1, num_users + 1),
+        "segment": pick_user_segments(num_users),
+        "name": identities["name"],
+        "email": identities["email"],
+        "username": identities["username"],
+        "birthdate": identities["birthdate"],
+        "gender": identities["gender"],
         # store wave_boost so labeling can incorporate it
         "wave_fraud_boost": wave_boost,
-        "device_id": fake.lexify(text="device_????????"),
-        "phone": phone_val,
-        "country_code": cc,
-        "created_at": created_dt,
+        "device_id": identities["device_id"],
+        "phone": identities["phone"],
+        "country_code": identities["country_code"],
+        "created_at": created_at,
         "burst_signup": suspicious_burst,
         "fraud_label": None,
-    }
-
-    # random missing fields
-    for f in ["name", "email", "phone", "country_code"]:
-        if random.random() < MISSING_FIELD_PROB:
-            user_dict[f] = None
-
-    return user_dict
+    })
 
 ###############################################################################
 # (B) GENERATE UNLABELED BUSINESSES
 ###############################################################################
 def generate_unlabeled_businesses(num_businesses: int):
-    biz_list = []
-    for i in range(num_businesses):
-        biz_id = i + 1
-        biz_name = random.choice([
-            fake.company(),
-            fake.company_suffix(),
-            "FakeCo " + fake.word(),
-            fake.bs(),
-            "Phantom Inc " + fake.color_name()
-        ])
-        reg_ctry = fake.country_code()
-        biz_dict = {
-            "business_id": biz_id,
-            "business_name": biz_name,
-            "registration_country": reg_ctry,
-            "incorporation_date": fake.date_between(start_date="-15y", end_date="today"),
-            "owner_name": fake.name(),
-            "fraud_label": None,
-        }
-
-        if random.random() < MISSING_FIELD_PROB:
-            biz_dict["registration_country"] = None
-        if random.random() < MISSING_FIELD_PROB:
-            biz_dict["owner_name"] = None
-
-        biz_list.append(biz_dict)
-    return pd.DataFrame(biz_list)
+    df = IdentitySynth().businesses(num_businesses, MISSING_FIELD_PROB)
+    df.insert(0, "business_id", np.arange(1, num_businesses + 1))
+    df["fraud_label"] = None
+    return df
 
 ###############################################################################
 # USER-USER RELATIONSHIPS
@@ -305,158 +245,6 @@ def link_users_to_businesses(df_users: pd.DataFrame, df_biz: pd.DataFrame,
 
     return pd.DataFrame(relationships)
 
-###############################################################################
-# HELPER: SAFE FRAUD LABEL FETCH
-###############################################################################
-def safe_fraud_label(df_users, user_id_val: int) -> int:
-    """
-    Retrieves the 'fraud_label' for a given user_id from df_users, 
-    returning 0 if not found or if it is None/NaN.
-    """
-    subset = df_users.loc[df_users["user_id"] == user_id_val, "fraud_label"]
-    if len(subset) < 1:
-        return 0
-    val = subset.values[0]
-    if val is None or pd.isna(val):
-        return 0
-    return int(val)
-
-###############################################################################
-# MULTI-PASS LABEL ASSIGNMENT (UPDATED FOR 2ND-DEGREE SYNERGY)
-###############################################################################
-def assign_fraud_labels_users(
-    df_users: pd.DataFrame,
-    df_biz: pd.DataFrame,
-    df_user_biz: pd.DataFrame,
-    df_user_user: pd.DataFrame,
-    scenario_params: dict,
-    iteration=1,
-    user_ip_map=None,
-    ip_user_map=None
-):
-    user_base_fraud = scenario_params["user_base_fraud"]
-    biz_fraud_map = dict(zip(df_biz["business_id"], df_biz["fraud_label"]))
-    # fill None with 0
-    for k, v in biz_fraud_map.items():
-        if v is None:
-            biz_fraud_map[k] = 0
-
-    # user->biz adjacency
-    user_to_biz = df_user_biz.groupby("user_id")["business_id"].apply(list).to_dict()
-
-    # user->user adjacency
-    user_graph = {}
-    for idx, row in df_user_user.iterrows():
-        f_u = row["from_user_id"]
-        t_u = row["to_user_id"]
-        user_graph.setdefault(f_u, []).append(t_u)
-
-    new_labels = []
-    for idx, row in df_users.iterrows():
-        # base + wave
-        p = user_base_fraud
-        p += row.get("wave_fraud_boost", 0.0)
-
-        seg = row.get("segment", "casual")
-        _, seg_fraud_mod = USER_SEGMENTS.get(seg, (1.0, 0.0))
-        p += seg_fraud_mod
-
-        # suspicious signals
-        email = (row.get("email") or "").lower()
-        if any(d in email for d in SUSPICIOUS_EMAIL_DOMAINS):
-            p += 0.20
-        phone = str(row.get("phone") or "")
-        if len(phone) < 7:
-            p += 0.10
-        elif any(x in phone for x in ["+999", "666-666"]):
-            p += 0.15
-        if row.get("burst_signup"):
-            p += 0.15
-        if row.get("is_ring_leader", False):
-            p += 0.30
-
-        # direct owned businesses
-        owned_biz_ids = user_to_biz.get(row["user_id"], [])
-        known_fraud_biz_count = sum(biz_fraud_map.get(bid, 0) for bid in owned_biz_ids)
-        p += 0.05 * known_fraud_biz_count
-
-        # ring-based second-degree synergy
-        neighbors = user_graph.get(row["user_id"], [])
-        neighbor_fraud_count = 0
-        for nb in neighbors:
-            neighbor_fraud_count += safe_fraud_label(df_users, nb)
-        p += 0.03 * neighbor_fraud_count
-
-        # IP-based synergy
-        if user_ip_map:
-            ip_id = user_ip_map.get(row["user_id"], None)
-            if ip_id and ip_user_map:
-                co_users = ip_user_map.get(ip_id, [])
-                co_fraud_count = 0
-                for cu in co_users:
-                    if cu != row["user_id"]:
-                        co_fraud_count += safe_fraud_label(df_users, cu)
-                p += 0.025 * co_fraud_count
-
-        label = 1 if random.random() < max(0, p) else 0
-
-        # forced overrides
-        if label == 0 and p < 0.2 and random.random() < 0.02:
-            label = 1
-        if label == 1 and p > 0.4 and random.random() < 0.02:
-            label = 0
-
-        new_labels.append(label)
-
-    df_users["fraud_label"] = new_labels
-    return df_users
-
-def assign_fraud_labels_businesses(
-    df_users: pd.DataFrame,
-    df_biz: pd.DataFrame,
-    df_user_biz: pd.DataFrame,
-    scenario_params: dict,
-    iteration=1
-):
-    biz_base_fraud = scenario_params["biz_base_fraud"]
-    user_fraud_map = dict(zip(df_users["user_id"], df_users["fraud_label"]))
-    for k, v in user_fraud_map.items():
-        if v is None:
-            user_fraud_map[k] = 0
-
-    biz_to_users = df_user_biz.groupby("business_id")["user_id"].apply(list).to_dict()
-
-    new_labels = []
-    for idx, row in df_biz.iterrows():
-        p = biz_base_fraud
-        bname = (row.get("business_name") or "").lower()
-        if any(k in bname for k in ["test", "fake", "shell", "phantom", "bogus", "shady"]):
-            p += 0.15
-        reg_ctry = (row.get("registration_country") or "").upper()
-        if reg_ctry in WATCHLIST_COUNTRIES:
-            p += 0.20
-
-        # random offset
-        if random.random() < 0.03:
-            p += 0.10
-
-        owners = biz_to_users.get(row["business_id"], [])
-        num_fraud_owners = sum(user_fraud_map.get(uid, 0) for uid in owners)
-        p += 0.10 * num_fraud_owners
-
-        label = 1 if random.random() < max(0, p) else 0
-
-        # forced overrides
-        if label == 0 and p < 0.2 and random.random() < 0.02:
-            label = 1
-        if label == 1 and p > 0.4 and random.random() < 0.02:
-            label = 0
-
-        new_labels.append(label)
-
-    df_biz["fraud_label"] = new_labels
-    return df_biz
-
 ###############################################################################
 # FEATURE ENRICHMENT
 ###############################################################################
@@ -497,12 +285,18 @@ def main():
     parser.add_argument("--iterations", type=int, default=1)
     parser.add_argument("--output-dir", type=str, default=DEFAULT_OUTPUT_DIR,
                         help="Parent directory to store scenario subfolders. Default=./data")
+    parser.add_argument("--output-format", type=str, default="csv", choices=FORMATS,
+                        help="csv (default), or typed parquet, feather (both need pyarrow) or npz.")
     args = parser.parse_args()
+    try:
+        check_format(args.output_format)
+    except ValueError as e:
+        parser.error(str(e))
 
     # Optional: set random seed
     if args.seed is not None:
         random.seed(args.seed)
-        Faker.seed(args.seed)
+        np.random.seed(args.seed)
         print(f"[INFO] Seed set to {args.seed}")
 
     # scenario param with small random jitter
@@ -536,44 +330,22 @@ def main():
                                            max_biz_per_user=10)
     print(f"[INFO] Created {len(df_user_biz)} user-business relationships.")
 
-    # Build easy in-memory maps for second-degree synergy
-    ip_user_map = df_user_ip.groupby("ip_id")["user_id"].apply(list).to_dict()
-    user_ip_map = dict(zip(df_user_ip["user_id"], df_user_ip["ip_id"]))
+    # Sparse adjacency + static signals, built once for all passes
+    labeler = SynergyLabeler(df_users, df_biz, df_ip, df_user_biz, df_user_user, df_user_ip,
+                             segments=USER_SEGMENTS, email_domains=SUSPICIOUS_EMAIL_DOMAINS,
+                             watchlist=WATCHLIST_COUNTRIES)
 
-    # 5) Multi-pass labeling
+    # 5) Multi-pass labeling (ring + IP second-degree synergy, forced overrides)
     for i in range(args.iterations):
         print(f"-> Labeling pass {i+1} of {args.iterations}...")
-        # users
-        df_users = assign_fraud_labels_users(
-            df_users=df_users,
-            df_biz=df_biz,
-            df_user_biz=df_user_biz,
-            df_user_user=df_user_user,
-            scenario_params=scenario_params,
-            iteration=i+1,
-            user_ip_map=user_ip_map,
-            ip_user_map=ip_user_map
-        )
-        # businesses
-        df_biz = assign_fraud_labels_businesses(
-            df_users=df_users,
-            df_biz=df_biz,
-            df_user_biz=df_user_biz,
-            scenario_params=scenario_params,
-            iteration=i+1
-        )
+        labeler.label_users(scenario_params["user_base_fraud"], overrides=True)
+        labeler.label_businesses(scenario_params["biz_base_fraud"], overrides=True)
 
     # 6) Anomaly injection / label flips
-    flips_u = 0
-    for i, row in df_users.iterrows():
-        if random.random() < RANDOM_LABEL_FLIP_PROB:
-            df_users.at[i, "fraud_label"] = 1 - (row["fraud_label"] or 0)
-            flips_u += 1
-    flips_b = 0
-    for i, row in df_biz.iterrows():
-        if random.random() < RANDOM_LABEL_FLIP_PROB:
-            df_biz.at[i, "fraud_label"] = 1 - (row["fraud_label"] or 0)
-            flips_b += 1
+    flips_u = flip(labeler.user_labels, RANDOM_LABEL_FLIP_PROB)
+    flips_b = flip(labeler.biz_labels, RANDOM_LABEL_FLIP_PROB)
+    df_users["fraud_label"] = labeler.user_labels
+    df_biz["fraud_label"] = labeler.biz_labels
 
     if flips_u or flips_b:
         print(f"[INFO] Performed {flips_u} user-label flips and {flips_b} biz-label flips for noise injection.")
@@ -583,22 +355,14 @@ def main():
 
     scenario_dir = os.path.join(args.output_dir, scenario_name)
     os.makedirs(scenario_dir, exist_ok=True)
-    print(f"-> CSV outputs will be saved to: {scenario_dir}")
-
-    # Write CSV files
-    users_csv   = os.path.join(scenario_dir, "synthetic_users.csv")
-    biz_csv     = os.path.join(scenario_dir, "synthetic_businesses.csv")
-    ip_csv      = os.path.join(scenario_dir, "ip_nodes.csv")
-    rel_ui_csv  = os.path.join(scenario_dir, "user_ip_relationships.csv")
-    rel_ub_csv  = os.path.join(scenario_dir, "user_business_relationships.csv")
-    rel_uu_csv  = os.path.join(scenario_dir, "user_user_relationships.csv")
-
-    df_users.to_csv(users_csv, index=False)
-    df_biz.to_csv(biz_csv, index=False)
-    df_ip.to_csv(ip_csv, index=False)
-    df_user_ip.to_csv(rel_ui_csv, index=False)
-    df_user_biz.to_csv(rel_ub_csv, index=False)
-    df_user_user.to_csv(rel_uu_csv, index=False)
+    print(f"-> {args.output_format} outputs will be saved to: {scenario_dir}")
+
+    # Write output files
+    categories = run_categories(USER_SEGMENTS) if args.output_format != "csv" else None
+    for name, df in (("synthetic_users", df_users), ("synthetic_businesses", df_biz), ("ip_nodes", df_ip),
+                     ("user_ip_relationships", df_user_ip), ("user_business_relationships", df_user_biz),
+                     ("user_user_relationships", df_user_user)):
+        write_table(df, os.path.join(scenario_dir, name), args.output_format, categories)
 
     # Summaries
     u_fraud_rate = df_users["fraud_label"].mean() if "fraud_label" in df_users.columns else 0
@@ -0,0 +1,62 @@
+# verishield_ml_experiments/data_generators/sharding.py
+"""
+sharding.py
+
+Deterministic sharded generation for the generator scripts.
+
+The id space 1..N is split into contiguous shards. Every shard gets its own NumPy
+Generator, spawned from a single SeedSequence, so the rows of a shard depend only on
+(--seed, shard count, shard index). They never depend on the worker that ran the
+shard or on the order in which shards finished. Shards run in a process pool and
+come back in shard order.
+
+The same --seed and --shards therefore give bit-identical output for any --workers.
+A different shard count gives different (equally distributed) rows.
+"""
+
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+
+def shard_ranges(total: int, shards: int):
+    """[(first_id, count), ...] covering ids 1..total in `shards` near-equal contiguous blocks."""
+    shards = max(1, min(shards, total)) if total else 1
+    bounds = np.linspace(0, total, shards + 1).astype(np.int64)
+    return [(int(lo) + 1, int(hi - lo)) for lo, hi in zip(bounds[:-1], bounds[1:])]
+
+
+def root_seed(seed=None) -> np.random.SeedSequence:
+    """The run's SeedSequence. Without a seed the drawn entropy is printed so the run can be repeated."""
+    seq = np.random.SeedSequence(seed)
+    if seed is None:
+        print(f"[INFO] No seed given; reproduce this run with --seed {seq.entropy}")
+    return seq
+
+
+def default_workers(shards: int) -> int:
+    return max(1, min(shards, os.cpu_count() or 1))
+
+
+def iter_shards(fn, tasks, workers: int = None):
+    """
+    Yields fn(task) for every task, in task order. With workers > 1 the tasks run in a
+    process pool, and at most `workers` results are pending at any time, so memory holds
+    a bounded number of shards even when the consumer (e.g. a CSV writer) is slower.
+    """
+    workers = default_workers(len(tasks)) if workers is None else workers
+    if workers <= 1 or len(tasks) <= 1:
+        for task in tasks:
+            yield fn(task)
+        return
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+        pending = deque()
+        for task in tasks:
+            pending.append(pool.submit(fn, task))
+            if len(pending) >= workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
@@ -0,0 +1,64 @@
+# verishield_ml_experiments/data_generators/streaming.py
+"""
+streaming.py
+
+Helpers for generating large scenarios chunk by chunk with bounded memory.
+
+  - workers_for_budget() picks how many worker processes fit a --memory-budget-mb,
+    given the chunk size and the compact per-node state the parent keeps. Memory is
+    bounded by running fewer chunks at once, never by resizing them, so the output of
+    a seeded run does not depend on the budget.
+  - peak_rss_mb() reports the high-water mark of this process and of its largest
+    worker, so a run can be checked against its budget.
+
+The per-row figures are measured on full_data_generator user rows, including their
+business links. A chunk peaks at ~1.4 KB per row while it is generated (strings,
+labeling temporaries). A finished chunk held and written by the parent takes ~0.8 KB
+per row. A Python process with NumPy, pandas and the Faker vocabulary loaded takes
+~90 MB. Measured peaks were within 5% of the estimate at 1-1.5M users and 14% above
+it at 10M users (np.unique temporaries), so leave some headroom in the budget.
+"""
+
+import os
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+CHUNK_ROW_BYTES = 1400       # a chunk being generated
+RESULT_ROW_BYTES = 800       # a finished chunk waiting in (or being written by) the parent
+PROCESS_BASELINE_MB = 100
+
+
+def estimate_mb(workers: int, chunk_rows: int, state_bytes: int = 0) -> float:
+    """Expected peak RSS (parent + workers) in MB for `workers` processes on `chunk_rows`-row chunks."""
+    if workers <= 1:
+        total = PROCESS_BASELINE_MB * 2**20 + chunk_rows * (CHUNK_ROW_BYTES + RESULT_ROW_BYTES)
+    else:
+        # every worker generates a chunk; the parent holds up to `workers` finished ones plus the one it writes
+        total = ((workers + 1) * PROCESS_BASELINE_MB * 2**20 + workers * chunk_rows * CHUNK_ROW_BYTES
+                 + (workers + 1) * chunk_rows * RESULT_ROW_BYTES)
+    return (total + state_bytes) / 2**20
+
+
+def workers_for_budget(budget_mb: float, chunk_rows: int, state_bytes: int = 0, workers: int = 1) -> int:
+    """
+    The most workers (up to `workers`) whose estimated peak fits in `budget_mb`.
+    Raises ValueError if not even a single process fits.
+    """
+    for w in range(max(workers, 1), 0, -1):
+        if estimate_mb(w, chunk_rows, state_bytes) <= budget_mb:
+            return w
+    raise ValueError(f"~{estimate_mb(1, chunk_rows, state_bytes):.0f} MB needed even with 1 worker "
+                     f"(budget {budget_mb:.0f} MB); lower --chunk-size or raise --memory-budget-mb")
+
+
+def peak_rss_mb():
+    """(peak RSS of this process, peak RSS of its largest finished child) in MB, or (None, None)."""
+    if resource is None:
+        return None, None
+    # ru_maxrss is KB on Linux, bytes on macOS
+    unit = 2**20 if os.uname().sysname == "Darwin" else 2**10
+    return (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / unit,
+            resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / unit)
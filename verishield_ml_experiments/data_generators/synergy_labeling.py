@@ -0,0 +1,275 @@
+# verishield_ml_experiments/data_generators/synergy_labeling.py
+"""
+synergy_labeling.py
+
+Vectorized fraud labeling shared by the generator scripts (data-gen-v1.py,
+refined_data_generator.py, refined_data_generator_extended.py, full_data_generator.py).
+
+The generators all score a node as "base rate + heuristic signals + synergy with
+fraudulent neighbours" and draw a Bernoulli label from it. Here that happens
+column-wise instead of row by row:
+  1) Static signals (segment, suspicious email domain, phone prefix, burst signup,
+     ring leader, business keywords, watchlist country) are computed once per run.
+  2) user->user, user->biz and user->IP adjacency is built once as scipy.sparse CSR
+     matrices over row positions; neighbour fraud counts are matrix-vector products.
+  3) Labels live in int8 NumPy arrays and each pass draws them in one call.
+
+The per-row probabilities are the ones the old loops computed for the same labels
+(user_probability() etc. expose them; tests/test_synergy_labeling.py checks them
+against reference loops for the v1, refined and extended settings), so output
+distributions match. The random streams differ (NumPy instead of `random`), so a
+given --seed produces different, equally distributed labels.
+
+The IP synergy assumes each user has one IP, as every generator here links them
+(the old loops looked up a single user -> IP mapping); SynergyGraph.co_ip_fraud
+raises if a user has more.
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+SUSPICIOUS_EMAIL_DOMAINS = [
+    "@tempmail.xyz", "@disposable.com", "@fakemail.com",
+    "@throwaway.io", "@spamgourmet.com", "@sharklasers.com",
+    "@guerrillamail.com", "@maildrop.cc"
+]
+SUSPICIOUS_PHONE_PATTERNS = ["+999", "666-666"]
+BIZ_NAME_KEYWORDS = ["test", "fake", "shell", "phantom", "bogus", "shady"]
+WATCHLIST_COUNTRIES = ["NK", "IR", "SY", "CU", "AF", "SO", "LY"]
+PRIVATE_IP_PREFIXES = ["192.168", "10."]
+
+###############################################################################
+# STATIC SIGNALS
+###############################################################################
+def _text(df, column):
+    """A string column with missing values as "" (or all "" if the column is absent)."""
+    if column not in df:
+        return pd.Series([""] * len(df), index=df.index)
+    return df[column].fillna("").astype(str)
+
+
+def _flag(df, column):
+    if column not in df:
+        return np.zeros(len(df), dtype=bool)
+    return df[column].fillna(False).astype(bool).to_numpy()
+
+
+def _contains_any(values, needles):
+    """Vectorized `any(n in v for n in needles)`."""
+    pattern = "|".join(re.escape(n) for n in needles)
+    return values.str.contains(pattern, regex=True).to_numpy()
+
+
+def user_signals(df_users, segments=None, email_domains=SUSPICIOUS_EMAIL_DOMAINS, private_ip=False):
+    """
+    Per-user sum of the static heuristics, before any synergy scaling:
+    segment modifier (if `segments` is given), suspicious email domain +0.20,
+    short/missing phone +0.10 or suspicious prefix +0.15, burst signup +0.15,
+    ring leader +0.30, and with `private_ip` a private signup_ip +0.10.
+    """
+    n = len(df_users)
+    signal = np.zeros(n)
+    if segments and "segment" in df_users:
+        mods = {seg: mod for seg, (_, mod) in segments.items()}
+        signal += df_users["segment"].map(mods).fillna(0.0).to_numpy(np.float64)
+
+    signal += 0.20 * _contains_any(_text(df_users, "email").str.lower(), email_domains)
+
+    phone = _text(df_users, "phone")
+    short = (phone.str.len() < 7).to_numpy()
+    signal += np.where(short, 0.10, np.where(_contains_any(phone, SUSPICIOUS_PHONE_PATTERNS), 0.15, 0.0))
+
+    if private_ip:
+        signup_ip = _text(df_users, "signup_ip")
+        signal += 0.10 * signup_ip.str.startswith(tuple(PRIVATE_IP_PREFIXES)).to_numpy()
+
+    signal += 0.15 * _flag(df_users, "burst_signup")
+    signal += 0.30 * _flag(df_users, "is_ring_leader")
+    return signal
+
+
+def business_signals(df_biz, watchlist=WATCHLIST_COUNTRIES, keywords=BIZ_NAME_KEYWORDS):
+    """Per-business static heuristics: suspicious name keyword +0.15, watchlist country +0.20."""
+    signal = 0.15 * _contains_any(_text(df_biz, "business_name").str.lower(), keywords)
+    signal += 0.20 * _text(df_biz, "registration_country").str.upper().isin(watchlist).to_numpy()
+    return signal
+
+
+def wave_boost(df_users):
+    """The signup-wave boost per user (0 where the generator has no waves)."""
+    if "wave_fraud_boost" not in df_users:
+        return np.zeros(len(df_users))
+    return pd.to_numeric(df_users["wave_fraud_boost"], errors="coerce").fillna(0.0).to_numpy(np.float64)
+
+###############################################################################
+# DRAWS
+###############################################################################
+def rare_bumps(n, bumps, rng=np.random):
+    """Sum of random additive bumps: `bumps` is [(probability, amount), ...]."""
+    total = np.zeros(n)
+    for prob, amount in bumps:
+        total += amount * (rng.random(n) < prob)
+    return total
+
+
+def bernoulli(p, rng=np.random, overrides=False):
+    """
+    One label per entry of `p`. With `overrides`, 2% of low-risk draws (p < 0.2) become
+    'sophisticated' fraud and 2% of high-risk fraud draws (p > 0.4) 'false flags'.
+    """
+    n = len(p)
+    labels = rng.random(n) < np.clip(p, 0.0, 1.0)
+    if overrides:
+        sophisticated = ~labels & (p < 0.2) & (rng.random(n) < 0.02)
+        false_flag = labels & (p > 0.4) & (rng.random(n) < 0.02)
+        labels = (labels | sophisticated) & ~false_flag
+    return labels.astype(np.int8)
+
+
+def flip(labels, prob, rng=np.random):
+    """Flips ~prob of the labels in place (label noise); returns the number flipped."""
+    mask = rng.random(len(labels)) < prob
+    labels[mask] = 1 - labels[mask]
+    return int(mask.sum())
+
+###############################################################################
+# SPARSE ADJACENCY
+###############################################################################
+def _positions(index, ids):
+    """Row positions of `ids` in `index`, or -1 for ids that aren't there."""
+    return index.get_indexer(pd.Index(ids))
+
+
+def _adjacency(rows, cols, shape):
+    """0/1 CSR matrix; a repeated edge counts twice, like the per-row loops did."""
+    keep = (rows >= 0) & (cols >= 0)
+    data = np.ones(int(keep.sum()), dtype=np.float64)
+    return sp.csr_matrix((data, (rows[keep], cols[keep])), shape=shape)
+
+
+def _edges(df, index_a, col_a, index_b, col_b):
+    if df is None or len(df) == 0 or col_a not in df:
+        return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp)
+    return _positions(index_a, df[col_a]), _positions(index_b, df[col_b])
+
+
+class SynergyGraph:
+    """
+    user->user (ring), user->biz (ownership) and user->IP adjacency as CSR matrices
+    over row positions of the node frames, built once per run. Edges to unknown ids
+    are dropped (the per-row lookups counted them as 0).
+    """
+
+    def __init__(self, df_users, df_biz=None, df_ip=None, df_user_biz=None, df_user_user=None, df_user_ip=None):
+        users = pd.Index(df_users["user_id"])
+        biz = pd.Index(df_biz["business_id"] if df_biz is not None else [])
+        ips = pd.Index(df_ip["ip_id"] if df_ip is not None else [])
+
+        self.ring = _adjacency(*_edges(df_user_user, users, "from_user_id", users, "to_user_id"),
+                               (len(users), len(users)))
+        self.owns = _adjacency(*_edges(df_user_biz, users, "user_id", biz, "business_id"), (len(users), len(biz)))
+        self.uses_ip = _adjacency(*_edges(df_user_ip, users, "user_id", ips, "ip_id"), (len(users), len(ips)))
+        self.owned_by = self.owns.T.tocsr()
+        self.ip_users = self.uses_ip.T.tocsr()
+        self.ip_degree = np.asarray(self.ip_users.sum(axis=1)).ravel()
+        self.user_ip_degree = np.asarray(self.uses_ip.sum(axis=1)).ravel()
+        # Distinct IPs per user; co_ip_fraud is only defined for at most one
+        self.user_ip_count = np.diff(self.uses_ip.indptr)
+
+    def fraud_biz_owned(self, biz_labels):
+        return self.owns @ biz_labels.astype(np.float64)
+
+    def ring_fraud(self, user_labels):
+        """Fraudulent users each user links to (outgoing ring edges)."""
+        return self.ring @ user_labels.astype(np.float64)
+
+    def co_ip_fraud(self, user_labels):
+        """
+        Fraudulent users sharing an IP with each user, not counting the user itself.
+        Assumes one IP per user: with several, a co-user on two of them would count twice
+        where the per-row loops only ever looked at one IP.
+        """
+        if self.user_ip_count.size and self.user_ip_count.max() > 1:
+            raise ValueError("co_ip_fraud assumes one IP per user; "
+                             f"{int((self.user_ip_count > 1).sum())} users have several")
+        y = user_labels.astype(np.float64)
+        return self.uses_ip @ (self.ip_users @ y) - self.user_ip_degree * y
+
+    def owner_fraud(self, user_labels):
+        return self.owned_by @ user_labels.astype(np.float64)
+
+    def ip_fraud_ratio(self, user_labels):
+        """(fraction of fraudulent users per IP, mask of IPs with any users)."""
+        fraud = self.ip_users @ user_labels.astype(np.float64)
+        connected = self.ip_degree > 0
+        return np.divide(fraud, self.ip_degree, out=np.zeros_like(fraud), where=connected), connected
+
+###############################################################################
+# MULTI-PASS LABELER
+###############################################################################
+class SynergyLabeler:
+    """
+    Graph, static signals and current labels for one run. Every pass reads the
+    labels of the previous one (users read last pass's businesses; businesses and
+    IPs read this pass's users), as the per-row generators did.
+    """
+
+    def __init__(self, df_users, df_biz, df_ip=None, df_user_biz=None, df_user_user=None, df_user_ip=None,
+                 segments=None, email_domains=SUSPICIOUS_EMAIL_DOMAINS, watchlist=WATCHLIST_COUNTRIES,
+                 rng=np.random):
+        self.graph = SynergyGraph(df_users, df_biz, df_ip, df_user_biz, df_user_user, df_user_ip)
+        self.rng = rng
+        self.user_wave = wave_boost(df_users)
+        self.user_signal = user_signals(df_users, segments, email_domains)
+        self.biz_signal = business_signals(df_biz, watchlist)
+
+        self.user_labels = np.zeros(len(df_users), dtype=np.int8)
+        self.biz_labels = np.zeros(len(df_biz), dtype=np.int8)
+        self.ip_labels = np.zeros(0 if df_ip is None else len(df_ip), dtype=np.int8)
+
+    def user_probability(self, base_fraud, synergy=1.0, ring_weight=0.03, ip_weight=0.025):
+        """
+        p = base + wave boost + synergy * (static signals + 0.05 per fraudulent owned business
+        + ring_weight per fraudulent ring neighbour + ip_weight per fraudulent co-IP user).
+        """
+        p = self.user_signal + 0.05 * self.graph.fraud_biz_owned(self.biz_labels)
+        if ring_weight:
+            p += ring_weight * self.graph.ring_fraud(self.user_labels)
+        if ip_weight:
+            p += ip_weight * self.graph.co_ip_fraud(self.user_labels)
+        return base_fraud + self.user_wave + synergy * p
+
+    def label_users(self, base_fraud, synergy=1.0, ring_weight=0.03, ip_weight=0.025, overrides=False):
+        p = self.user_probability(base_fraud, synergy, ring_weight, ip_weight)
+        self.user_labels = bernoulli(p, self.rng, overrides)
+        return self.user_labels
+
+    def business_probability(self, base_fraud, synergy=1.0, bump=None):
+        """
+        p = base + synergy * (static signals + `bump` + 0.10 per fraudulent owner), where
+        `bump` defaults to a random +0.10 for 3% of businesses.
+        """
+        if bump is None:
+            bump = rare_bumps(len(self.biz_labels), [(0.03, 0.10)], self.rng)
+        return base_fraud + synergy * (self.biz_signal + bump + 0.10 * self.graph.owner_fraud(self.user_labels))
+
+    def label_businesses(self, base_fraud, synergy=1.0, overrides=False):
+        p = self.business_probability(base_fraud, synergy)
+        self.biz_labels = bernoulli(p, self.rng, overrides)
+        return self.biz_labels
+
+    def ip_probability(self, base_fraud, synergy=1.0):
+        """p = base + synergy * fraction of fraudulent users on the IP (+0.01 if it has none)."""
+        ratio, connected = self.graph.ip_fraud_ratio(self.user_labels)
+        return base_fraud + np.where(connected, ratio * synergy, 0.01)
+
+    def label_ips(self, base_fraud, synergy=1.0):
+        self.ip_labels = bernoulli(self.ip_probability(base_fraud, synergy), self.rng)
+        return self.ip_labels
+
+    def flip(self, prob):
+        """Label noise on every node type; returns (user, biz, ip) flip counts."""
+        return tuple(flip(labels, prob, self.rng) for labels in (self.user_labels, self.biz_labels, self.ip_labels))
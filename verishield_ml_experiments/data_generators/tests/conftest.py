@@ -0,0 +1,7 @@
+# verishield_ml_experiments/data_generators/tests/conftest.py
+
+import os
+import sys
+
+# The generator modules import each other as top-level modules (their directory is on sys.path)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
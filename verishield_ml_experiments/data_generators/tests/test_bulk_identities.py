@@ -0,0 +1,103 @@
+# verishield_ml_experiments/data_generators/tests/test_bulk_identities.py
+
+import ipaddress
+import re
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from bulk_identities import (
+    RANDOM_PREFIX, IdentitySynth, apply_missing, dates_between, device_ids, ipv4_public, ipv4_to_int, phones, years_ago,
+)
+
+VOCAB = {
+    "first_names_male": ["John", "Omar", "Li"],
+    "first_names_female": ["Anna", "Mei", "Zoe"],
+    "last_names": ["Smith", "Garcia", "O'Neil"],
+    "free_email_domains": ["gmail.com", "yahoo.com"],
+    "companies": ["Acme Inc", "Globex LLC"],
+    "company_suffixes": ["Ltd", "Group"],
+    "words": ["alpha", "beta"],
+    "bs": ["synergize web-enabled markets"],
+    "color_names": ["Teal", "Red"],
+    "country_codes": ["US", "GB", "NG", "IN"],
+}
+PREFIXES = {"US": ["+1-"], "GB": ["+44-"]}
+FALLBACK = [RANDOM_PREFIX, "+999"]
+
+
+@pytest.fixture
+def synth():
+    return IdentitySynth(VOCAB, np.random.default_rng(47))
+
+
+def test_user_columns(synth):
+    df = synth.users(2000, PREFIXES, FALLBACK, today=date(2025, 1, 1))
+    assert list(df.columns) == ["name", "email", "username", "birthdate", "gender", "device_id", "phone", "country_code"]
+    assert len(df) == 2000 and df.notna().all().all()
+
+    parts = df["name"].str.split(" ", n=1)
+    first, last = parts.str[0], parts.str[1]
+    female = df["gender"] == "F"
+    assert first[female].isin(VOCAB["first_names_female"]).all()
+    assert first[~female].isin(VOCAB["first_names_male"]).all()
+    assert last.isin(VOCAB["last_names"]).all()
+    assert df["email"].str.fullmatch(r"[a-z'.0-9]+@(gmail|yahoo)\.com").all()
+    assert df["device_id"].str.fullmatch(r"device_[A-Za-z]{8}").all()
+    assert df["country_code"].isin(VOCAB["country_codes"]).all()
+    birth = pd.to_datetime(df["birthdate"])
+    assert birth.min() >= pd.Timestamp("1910-01-01") and birth.max() <= pd.Timestamp("2025-01-01")
+
+
+def test_business_columns(synth):
+    df = synth.businesses(500, today=date(2025, 1, 1))
+    assert list(df.columns) == ["business_name", "registration_country", "incorporation_date", "owner_name"]
+    assert len(df) == 500
+    assert pd.to_datetime(df["incorporation_date"]).between("2010-01-01", "2025-01-01").all()
+    assert df["business_name"].str.startswith(("FakeCo ", "Phantom Inc ")).any()
+
+
+def test_same_seed_same_rows():
+    a = IdentitySynth(VOCAB, np.random.default_rng(1)).users(100, PREFIXES, FALLBACK, today=date(2025, 1, 1))
+    b = IdentitySynth(VOCAB, np.random.default_rng(1)).users(100, PREFIXES, FALLBACK, today=date(2025, 1, 1))
+    pd.testing.assert_frame_equal(a, b)
+
+
+def test_phones_follow_country_and_random_prefix():
+    rng = np.random.default_rng(3)
+    countries = np.array(["US"] * 500 + ["GB"] * 500 + ["NG"] * 2000)
+    numbers = phones(countries, PREFIXES, FALLBACK, rng)
+    assert all(re.fullmatch(r"\+1-\d{7}", p) for p in numbers[:500])
+    assert all(re.fullmatch(r"\+44-\d{7}", p) for p in numbers[500:1000])
+    other = numbers[1000:]
+    assert not any(RANDOM_PREFIX in p for p in other)
+    random_digits = [p for p in other if not p.startswith("+999")]
+    assert random_digits and all(re.fullmatch(r"\d{10}", p) for p in random_digits)
+    assert len({p[:3] for p in random_digits}) > 10  # a fresh 3-digit prefix per row
+
+
+def test_ipv4_public_avoids_reserved_ranges():
+    ips = ipv4_public(200_000, np.random.default_rng(5))
+    assert len(set(ips)) > 199_000
+    for ip in map(ipaddress.ip_address, set(ips)):
+        assert ip.is_global and not ip.is_multicast, ip
+    assert np.array_equal(ipv4_to_int(ips[:3]), [int(ipaddress.ip_address(ip)) for ip in ips[:3]])
+
+
+@pytest.mark.parametrize("prob", [0.0, 0.1, 0.5])
+def test_apply_missing_rate(prob):
+    n = 20_000
+    df = pd.DataFrame({"name": ["x"] * n, "phone": ["y"] * n, "kept": ["z"] * n})
+    apply_missing(df, ["name", "phone"], prob, np.random.default_rng(7))
+    for field in ("name", "phone"):
+        assert abs(df[field].isna().mean() - prob) < 0.015
+    assert df["kept"].notna().all()
+
+
+def test_dates_and_years_ago():
+    assert years_ago(1, date(2024, 2, 29)) == date(2023, 2, 28)
+    values = dates_between(1000, date(2024, 1, 1), date(2024, 1, 3), np.random.default_rng(0))
+    assert set(values) == {"2024-01-01", "2024-01-02", "2024-01-03"}
+    assert device_ids(3, np.random.default_rng(0)).dtype.kind == "U"
@@ -0,0 +1,40 @@
+# verishield_ml_experiments/data_generators/tests/test_data_gen_v1.py
+"""data-gen-v1 end to end on a small graph: labels are well-formed and follow --seed."""
+
+import os
+import subprocess
+import sys
+
+import pandas as pd
+import pytest
+
+GENERATOR = os.path.join(os.path.dirname(__file__), "..", "data-gen-v1.py")
+
+
+def _run(out_dir, seed):
+    subprocess.run([sys.executable, os.path.abspath(GENERATOR), "--num-users", "3000", "--num-businesses", "600",
+                    "--num-ips", "800", "--seed", str(seed), "--output-dir", str(out_dir)],
+                   check=True, stdout=subprocess.DEVNULL)
+    scenario = os.path.join(out_dir, "default")
+    return {name: pd.read_csv(os.path.join(scenario, f"{name}.csv"))
+            for name in ("synthetic_users", "synthetic_businesses", "ip_nodes")}
+
+
+@pytest.fixture(scope="module")
+def runs(tmp_path_factory):
+    base = tmp_path_factory.mktemp("v1")
+    return _run(base / "a", 45), _run(base / "b", 45), _run(base / "c", 46)
+
+
+def test_labels_are_binary_and_users_near_half(runs):
+    for name, df in runs[0].items():
+        assert set(df["fraud_label"].unique()) == {0, 1}, name
+    # With ~5 owners per business, business labels saturate on graphs this small; users converge
+    assert 0.4 < runs[0]["synthetic_users"]["fraud_label"].mean() < 0.6
+
+
+def test_same_seed_same_labels(runs):
+    first, again, other = runs
+    for name in first:
+        pd.testing.assert_series_equal(first[name]["fraud_label"], again[name]["fraud_label"], obj=name)
+    assert not first["synthetic_users"]["fraud_label"].equals(other["synthetic_users"]["fraud_label"])
@@ -0,0 +1,69 @@
+# verishield_ml_experiments/data_generators/tests/test_output_formats.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import output_formats
+from output_formats import apply_schema, iter_table, read_table, write_table
+
+CATEGORIES = {"gender": ["F", "M"], "country_code": ["DE", "GB", "US"]}
+TYPED_FORMATS = ["npz"] + (["parquet", "feather"] if output_formats.pa is not None else [])
+
+
+@pytest.fixture
+def users():
+    """Text, as the generators hand it to the writers, with a gap in every kind of column."""
+    return pd.DataFrame({
+        "user_id": ["1", "2", "3", "4", "5"],
+        "name": ["Ann", None, "Cid", "Dee", "Eve"],
+        "gender": ["F", "M", None, "F", "M"],
+        "country_code": ["US", "GB", "DE", None, "US"],
+        "created_at": ["2024-10-01 10:00:00", "", "2024-10-03 12:00:00", "2024-10-04 13:00:00", "2024-10-05 00:00:01"],
+        "burst_signup": ["False", "True", "", "False", "True"],
+        "fraud_label": ["0", "1", "0", "", "1"],
+    })
+
+
+def test_csv_round_trip(tmp_path, users):
+    stem = str(tmp_path / "users")
+    write_table(users, stem, "csv", chunk_rows=2)
+    chunks = list(iter_table(stem, "csv", chunk_rows=2))
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    # csv chunks come back as the text that went in (missing as "")
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), users.fillna(""))
+    assert read_table(stem, "csv")["fraud_label"].isna().tolist() == [False, False, False, True, False]
+
+
+@pytest.mark.parametrize("fmt", TYPED_FORMATS)
+def test_typed_round_trip(tmp_path, users, fmt):
+    stem = str(tmp_path / "users")
+    write_table(users, stem, fmt, CATEGORIES, chunk_rows=2)
+    expected = apply_schema(users, CATEGORIES)
+    if fmt == "npz":
+        expected["name"] = expected["name"].fillna("")  # documented: a missing string becomes ""
+
+    df = read_table(stem, fmt)
+    pd.testing.assert_frame_equal(df, expected, check_dtype=False, check_categorical=False)
+    assert df["fraud_label"].dtype == "Int8"
+    assert df["burst_signup"].dtype == "boolean"
+    assert isinstance(df["gender"].dtype, pd.CategoricalDtype)
+    assert len(list(iter_table(stem, fmt, chunk_rows=2))) == 3
+
+
+def test_npz_missing_is_not_false_or_zero(tmp_path, users):
+    stem = str(tmp_path / "users")
+    write_table(users, stem, "npz", CATEGORIES)
+    df = read_table(stem, "npz")
+    assert df["burst_signup"].tolist() == [False, True, pd.NA, False, True]
+    assert df["fraud_label"].tolist() == [0, 1, 0, pd.NA, 1]
+    with np.load(f"{stem}-00000.npz") as archive:
+        assert archive["fraud_label__mask"].tolist() == [False, False, False, True, False]
+
+
+def test_npz_columns_without_gaps_stay_plain(tmp_path):
+    stem = str(tmp_path / "labels")
+    write_table(pd.DataFrame({"user_id": ["1", "2"], "fraud_label": ["0", "1"]}), stem, "npz")
+    with np.load(f"{stem}-00000.npz") as archive:
+        assert sorted(archive.files) == ["fraud_label", "user_id"]
+    assert read_table(stem, "npz")["fraud_label"].dtype == np.int8
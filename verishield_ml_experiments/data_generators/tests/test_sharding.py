@@ -0,0 +1,59 @@
+# verishield_ml_experiments/data_generators/tests/test_sharding.py
+"""
+Sharded generation: the same --seed and --shards must give the same data for any
+--workers, and shard_ranges must cover the id space exactly.
+"""
+
+import os
+import subprocess
+import sys
+
+import pandas as pd
+import pytest
+
+from sharding import shard_ranges
+
+GENERATOR = os.path.join(os.path.dirname(__file__), "..", "full_data_generator.py")
+TABLES = ("synthetic_users", "synthetic_businesses", "user_business_relationships", "synthetic_users_enriched")
+
+
+def _run(out_dir, *args):
+    os.makedirs(out_dir)
+    subprocess.run([sys.executable, os.path.abspath(GENERATOR), "--num-users", "3000", "--num-businesses", "400",
+                    "--seed", "48", "--shards", "3", *args],
+                   cwd=out_dir, check=True, stdout=subprocess.DEVNULL)
+    return {name: pd.read_csv(os.path.join(out_dir, f"{name}.csv")) for name in TABLES}
+
+
+@pytest.mark.parametrize("total, shards, expected", [
+    (10, 3, [(1, 3), (4, 3), (7, 4)]),
+    (2, 5, [(1, 1), (2, 1)]),  # never more shards than ids
+    (0, 4, [(1, 0)]),  # one empty shard
+    (7, 0, [(1, 7)]),
+])
+def test_shard_ranges(total, shards, expected):
+    ranges = shard_ranges(total, shards)
+    assert ranges == expected
+    assert sum(count for _, count in ranges) == total
+
+
+def test_shard_ranges_are_contiguous():
+    ranges = shard_ranges(1_000_003, 8)
+    for (first, count), (next_first, _) in zip(ranges, ranges[1:]):
+        assert first + count == next_first
+
+
+def test_output_independent_of_workers(tmp_path):
+    serial = _run(tmp_path / "serial", "--workers", "1")
+    parallel = _run(tmp_path / "parallel", "--workers", "3")
+    for name in TABLES:
+        pd.testing.assert_frame_equal(serial[name], parallel[name], obj=name)
+    assert len(serial["synthetic_users"]) == 3000
+
+
+def test_seeded_dates_do_not_follow_the_clock(tmp_path):
+    default = _run(tmp_path / "default")
+    pinned = _run(tmp_path / "pinned", "--reference-date", "2025-01-01")
+    pd.testing.assert_frame_equal(default["synthetic_users"], pinned["synthetic_users"])
+    created = default["synthetic_users"]["created_at"]
+    assert created.min() >= "2024-10-03" and created.max() < "2025-01-03"  # 90 (+1) days up to 2025-01-01
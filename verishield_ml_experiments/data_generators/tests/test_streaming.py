@@ -0,0 +1,36 @@
+# verishield_ml_experiments/data_generators/tests/test_streaming.py
+
+import pytest
+
+from streaming import estimate_mb, peak_rss_mb, workers_for_budget
+
+CHUNK = 250_000
+
+
+def test_estimate_grows_with_workers_chunk_and_state():
+    assert estimate_mb(2, CHUNK) > estimate_mb(1, CHUNK)
+    assert estimate_mb(1, 2 * CHUNK) > estimate_mb(1, CHUNK)
+    assert estimate_mb(1, CHUNK, state_bytes=2**30) == pytest.approx(estimate_mb(1, CHUNK) + 1024)
+
+
+def test_keeps_requested_workers_when_they_fit():
+    assert workers_for_budget(estimate_mb(4, CHUNK), CHUNK, workers=4) == 4
+    assert workers_for_budget(10**6, CHUNK, workers=0) == 1
+
+
+def test_steps_down_to_the_most_workers_that_fit():
+    budget = estimate_mb(3, CHUNK) + 1
+    assert estimate_mb(4, CHUNK) > budget
+    assert workers_for_budget(budget, CHUNK, workers=8) == 3
+    # The parent's per-node state counts against the same budget
+    assert workers_for_budget(budget, CHUNK, state_bytes=200 * 2**20, workers=8) < 3
+
+
+def test_raises_when_one_worker_does_not_fit():
+    with pytest.raises(ValueError, match="lower --chunk-size"):
+        workers_for_budget(estimate_mb(1, CHUNK) - 1, CHUNK, workers=4)
+
+
+def test_peak_rss_reports_this_process():
+    main_mb, _ = peak_rss_mb()
+    assert main_mb is None or main_mb > 10
@@ -0,0 +1,190 @@
+# verishield_ml_experiments/data_generators/tests/test_synergy_labeling.py
+"""
+SynergyLabeler's per-row probabilities against reference loops ported from the
+per-row labelers it replaced (data-gen-v1.py, refined_data_generator.py and
+refined_data_generator_extended.py before the shared module), for the same
+previous-pass labels. Draws are left out: only the probabilities are compared.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from synergy_labeling import (
+    BIZ_NAME_KEYWORDS, SUSPICIOUS_EMAIL_DOMAINS, WATCHLIST_COUNTRIES, SynergyGraph, SynergyLabeler,
+)
+
+USER_SEGMENTS = {
+    "casual": (0.70, 0.0),
+    "smb_owner": (0.20, 0.05),
+    "enterprise": (0.09, -0.05),
+    "money_mule": (0.01, 0.40),
+}
+
+
+@pytest.fixture
+def scenario():
+    rng = np.random.default_rng(46)
+    n_users, n_biz, n_ips = 400, 80, 60
+    user_ids = np.arange(1, n_users + 1)
+    domains = np.array(["@example.com", "@gmail.com", "@tempmail.xyz", "@maildrop.cc"])
+    phones = np.array(["555-0100123", "+9991234567", "666-666-1234", "12345", ""])
+    df_users = pd.DataFrame({
+        "user_id": user_ids,
+        "segment": rng.choice(list(USER_SEGMENTS), n_users),
+        "email": [f"u{i}{d}" for i, d in zip(user_ids, rng.choice(domains, n_users))],
+        "phone": rng.choice(phones, n_users),
+        "burst_signup": rng.random(n_users) < 0.1,
+        "is_ring_leader": rng.random(n_users) < 0.05,
+        "wave_fraud_boost": rng.random(n_users) * 0.05,
+    })
+    names = np.array(["Acme", "Shell Holdings", "Bogus LLC", "Blue Sky", "Phantom Co"])
+    df_biz = pd.DataFrame({
+        "business_id": np.arange(1, n_biz + 1),
+        "business_name": [f"{n} {i}" for i, n in enumerate(rng.choice(names, n_biz))],
+        "registration_country": rng.choice(["US", "GB", "IR", "NK", "de"], n_biz),
+    })
+    df_ip = pd.DataFrame({"ip_id": np.arange(1, n_ips + 1)})
+    # Repeated edges, and edges to ids that don't exist, as the generators can produce
+    df_user_biz = pd.DataFrame({"user_id": rng.choice(user_ids, 300), "business_id": rng.integers(1, n_biz + 5, 300)})
+    df_user_user = pd.DataFrame({"from_user_id": rng.choice(user_ids, 200), "to_user_id": rng.integers(1, n_users + 5, 200)})
+    # One IP per user, with collisions (IPs 51-60 get no users)
+    df_user_ip = pd.DataFrame({"user_id": user_ids, "ip_id": rng.integers(1, 51, n_users)})
+    prev_user = (rng.random(n_users) < 0.3).astype(np.int8)
+    prev_biz = (rng.random(n_biz) < 0.3).astype(np.int8)
+    return df_users, df_biz, df_ip, df_user_biz, df_user_user, df_user_ip, prev_user, prev_biz
+
+
+def _labeler(scenario):
+    df_users, df_biz, df_ip, df_user_biz, df_user_user, df_user_ip, prev_user, prev_biz = scenario
+    labeler = SynergyLabeler(df_users, df_biz, df_ip, df_user_biz, df_user_user, df_user_ip,
+                             segments=USER_SEGMENTS, email_domains=SUSPICIOUS_EMAIL_DOMAINS,
+                             watchlist=WATCHLIST_COUNTRIES)
+    labeler.user_labels = prev_user.copy()
+    labeler.biz_labels = prev_biz.copy()
+    return labeler
+
+###############################################################################
+# REFERENCE LOOPS (the per-row code, minus the draws)
+###############################################################################
+def _reference_users(scenario, base, synergy=1.0, wave=True, ring=True, ip=True):
+    df_users, df_biz, _, df_user_biz, df_user_user, df_user_ip, prev_user, prev_biz = scenario
+    user_fraud = dict(zip(df_users["user_id"], prev_user))
+    biz_fraud = dict(zip(df_biz["business_id"], prev_biz))
+    user_to_biz = df_user_biz.groupby("user_id")["business_id"].apply(list).to_dict()
+    user_graph = {}
+    for _, row in df_user_user.iterrows():
+        user_graph.setdefault(row["from_user_id"], []).append(row["to_user_id"])
+    ip_user_map = df_user_ip.groupby("ip_id")["user_id"].apply(list).to_dict()
+    user_ip_map = dict(zip(df_user_ip["user_id"], df_user_ip["ip_id"]))
+
+    out = []
+    for _, row in df_users.iterrows():
+        p = base
+        if wave:
+            p += row.get("wave_fraud_boost", 0.0)
+        p += USER_SEGMENTS.get(row.get("segment", "casual"), (1.0, 0.0))[1] * synergy
+        email = (row.get("email") or "").lower()
+        if any(d in email for d in SUSPICIOUS_EMAIL_DOMAINS):
+            p += 0.20 * synergy
+        phone = str(row.get("phone") or "")
+        if len(phone) < 7:
+            p += 0.10 * synergy
+        elif any(x in phone for x in ["+999", "666-666"]):
+            p += 0.15 * synergy
+        if row.get("burst_signup"):
+            p += 0.15 * synergy
+        if row.get("is_ring_leader", False):
+            p += 0.30 * synergy
+        owned = user_to_biz.get(row["user_id"], [])
+        p += 0.05 * sum(biz_fraud.get(b, 0) for b in owned) * synergy
+        if ring:
+            neighbors = user_graph.get(row["user_id"], [])
+            p += 0.03 * sum(user_fraud.get(nb, 0) for nb in neighbors) * synergy
+        if ip:
+            ip_id = user_ip_map.get(row["user_id"], None)
+            if ip_id:
+                co_users = ip_user_map.get(ip_id, [])
+                p += 0.025 * sum(user_fraud.get(cu, 0) for cu in co_users if cu != row["user_id"]) * synergy
+        out.append(p)
+    return np.array(out)
+
+
+def _reference_businesses(scenario, base, bump, synergy=1.0):
+    df_users, df_biz, _, df_user_biz, _, _, prev_user, _ = scenario
+    user_fraud = dict(zip(df_users["user_id"], prev_user))
+    biz_to_users = df_user_biz.groupby("business_id")["user_id"].apply(list).to_dict()
+    out = []
+    for (_, row), bumped in zip(df_biz.iterrows(), bump > 0):
+        p = base
+        name = (row.get("business_name") or "").lower()
+        if any(k in name for k in BIZ_NAME_KEYWORDS):
+            p += 0.15 * synergy
+        if (row.get("registration_country") or "").upper() in WATCHLIST_COUNTRIES:
+            p += 0.20 * synergy
+        if bumped:
+            p += 0.10 * synergy
+        owners = biz_to_users.get(row["business_id"], [])
+        p += 0.10 * sum(user_fraud.get(u, 0) for u in owners) * synergy
+        out.append(p)
+    return np.array(out)
+
+
+def _reference_ips(scenario, base, synergy):
+    df_users, _, df_ip, _, _, df_user_ip, prev_user, _ = scenario
+    user_fraud = dict(zip(df_users["user_id"], prev_user))
+    ip_user_map = df_user_ip.groupby("ip_id")["user_id"].apply(list).to_dict()
+    out = []
+    for _, row in df_ip.iterrows():
+        connected = ip_user_map.get(row["ip_id"], [])
+        if connected:
+            out.append(base + sum(user_fraud.get(u, 0) == 1 for u in connected) / len(connected) * synergy)
+        else:
+            out.append(base + 0.01)
+    return np.array(out)
+
+###############################################################################
+# TESTS
+###############################################################################
+def test_v1_probabilities_match_reference(scenario):
+    labeler = _labeler(scenario)
+    for synergy in (1.0, 1.3):
+        np.testing.assert_allclose(labeler.user_probability(0.08, synergy),
+                                   _reference_users(scenario, 0.08, synergy))
+        bump = np.where(np.arange(len(labeler.biz_labels)) % 7 == 0, 0.10, 0.0)
+        np.testing.assert_allclose(labeler.business_probability(0.05, synergy, bump=bump),
+                                   _reference_businesses(scenario, 0.05, bump, synergy))
+        np.testing.assert_allclose(labeler.ip_probability(0.03, synergy), _reference_ips(scenario, 0.03, synergy))
+
+
+def test_refined_probabilities_match_reference(scenario):
+    df_users, df_biz, _, df_user_biz, _, _, prev_user, prev_biz = scenario
+    # The refined generator has no waves, rings or IPs in its labeling
+    labeler = SynergyLabeler(df_users.drop(columns="wave_fraud_boost"), df_biz, df_user_biz=df_user_biz,
+                             segments=USER_SEGMENTS, email_domains=SUSPICIOUS_EMAIL_DOMAINS,
+                             watchlist=WATCHLIST_COUNTRIES)
+    labeler.user_labels, labeler.biz_labels = prev_user.copy(), prev_biz.copy()
+    np.testing.assert_allclose(labeler.user_probability(0.10, ring_weight=0, ip_weight=0),
+                               _reference_users(scenario, 0.10, wave=False, ring=False, ip=False))
+    bump = np.where(np.arange(len(prev_biz)) % 5 == 0, 0.10, 0.0)
+    np.testing.assert_allclose(labeler.business_probability(0.10, bump=bump),
+                               _reference_businesses(scenario, 0.10, bump))
+
+
+def test_extended_probabilities_match_reference(scenario):
+    labeler = _labeler(scenario)
+    np.testing.assert_allclose(labeler.user_probability(0.15), _reference_users(scenario, 0.15))
+
+
+def test_co_ip_fraud_requires_one_ip_per_user(scenario):
+    df_users, df_biz, df_ip, _, _, df_user_ip, prev_user, _ = scenario
+    graph = SynergyGraph(df_users, df_biz, df_ip, df_user_ip=df_user_ip)
+    graph.co_ip_fraud(prev_user)  # one IP each: fine
+
+    # A repeated edge to the same IP is still one IP
+    repeated = pd.concat([df_user_ip, df_user_ip.head(5)])
+    SynergyGraph(df_users, df_biz, df_ip, df_user_ip=repeated).co_ip_fraud(prev_user)
+
+    second_ip = pd.concat([df_user_ip, pd.DataFrame({"user_id": [1], "ip_id": [60]})])
+    with pytest.raises(ValueError, match="one IP per user"):
+        SynergyGraph(df_users, df_biz, df_ip, df_user_ip=second_ip).co_ip_fraud(prev_user)